@@ -0,0 +1,157 @@
+"""
+Headless batch maze generation and a compact on-disk maze dataset.
+
+    python batch.py generate levels.mazes -n 10000 --width 31 --height 21 --seed 1
+    python batch.py show levels.mazes 42
+
+File layout (little endian):
+
+    file header   magic b"MAZE", version u16, reserved u16, count u32, record size u32
+    record * n    width u32, height u32, seed i64, algorithm u8, 3 pad bytes,
+                  then width * height bits, row-major, 1 = wall, padded to a byte
+
+Every record in a file has the same size, so maze #k starts at a fixed
+offset and can be read through mmap without loading the rest of the file.
+The exit is always the bottom-right cell, as in mazegen, and is not stored.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from mazegen import ALGORITHMS, EXIT, OPEN, WALL, MazeGrid, generate
+
+MAGIC = b"MAZE"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sHHII")
+RECORD_HEADER = struct.Struct("<IIqB3x")
+
+MazeRecord = namedtuple("MazeRecord", "width height seed algorithm")
+
+_TO_BITS = bytes.maketrans(bytes([OPEN, WALL, EXIT]), b"010")
+_FROM_BITS = bytes.maketrans(b"01", bytes([OPEN, WALL]))
+
+
+def record_size(width, height):
+    return RECORD_HEADER.size + (width * height + 7) // 8
+
+
+def pack(grid):
+    """Pack a MazeGrid into bits, one per cell."""
+    bits = bytes(grid.cells).translate(_TO_BITS)
+    nbytes = (len(bits) + 7) // 8
+    return int(bits.ljust(nbytes * 8, b"0"), 2).to_bytes(nbytes, "big")
+
+
+def unpack(data, width, height):
+    """Inverse of pack(); restores the exit in the bottom-right cell."""
+    n = width * height
+    bits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b")[:n]
+    grid = MazeGrid(width, height, bytearray(bits.encode().translate(_FROM_BITS)))
+    grid[2 * ((width - 1) // 2) - 1, 2 * ((height - 1) // 2) - 1] = EXIT
+    return grid
+
+
+def _build(task):
+    width, height, seed, algorithm = task
+    grid = generate(width, height, ALGORITHMS[algorithm], seed)
+    return RECORD_HEADER.pack(width, height, seed, algorithm) + pack(grid)
+
+
+def generate_batch(path, count, width, height, algorithm="backtracker", seed=0, workers=None):
+    """
+    Generate count mazes with seeds seed, seed + 1, ... across a process pool
+    and write them to path. Results are written in order as they arrive, so
+    only the mazes in flight are held in memory.
+    """
+    algorithm_id = ALGORITHMS.index(algorithm)
+    size = record_size(width, height)
+    tasks = ((width, height, seed + k, algorithm_id) for k in range(count))
+    chunksize = max(1, min(64, count // (4 * (workers or os.cpu_count() or 1))))
+    with open(path, "wb") as f, ProcessPoolExecutor(workers) as pool:
+        f.write(FILE_HEADER.pack(MAGIC, VERSION, 0, count, size))
+        for record in pool.map(_build, tasks, chunksize=chunksize):
+            f.write(record)
+
+
+class MazeFile:
+    """Random access to a maze dataset through mmap."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count, self.record_size = FILE_HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} maze file")
+
+    def __len__(self):
+        return self.count
+
+    def _offset(self, k):
+        if not 0 <= k < self.count:
+            raise IndexError(f"maze index {k} out of range")
+        return FILE_HEADER.size + k * self.record_size
+
+    def header(self, k):
+        width, height, seed, algorithm = RECORD_HEADER.unpack_from(self._map, self._offset(k))
+        return MazeRecord(width, height, seed, ALGORITHMS[algorithm])
+
+    def __getitem__(self, k):
+        offset = self._offset(k)
+        width, height, _, _ = RECORD_HEADER.unpack_from(self._map, offset)
+        start = offset + RECORD_HEADER.size
+        return unpack(self._map[start:offset + self.record_size], width, height)
+
+    def __iter__(self):
+        for k in range(self.count):
+            yield self[k]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch maze generation")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="generate a maze dataset")
+    gen.add_argument("path")
+    gen.add_argument("-n", "--count", type=int, default=1000)
+    gen.add_argument("--width", type=int, default=31)
+    gen.add_argument("--height", type=int, default=21)
+    gen.add_argument("--algorithm", choices=ALGORITHMS, default="backtracker")
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("--workers", type=int, default=None)
+
+    show = sub.add_parser("show", help="print maze #k from a dataset")
+    show.add_argument("path")
+    show.add_argument("index", type=int)
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        generate_batch(args.path, args.count, args.width, args.height,
+                       args.algorithm, args.seed, args.workers)
+        print(f"wrote {args.count} mazes to {args.path}")
+    else:
+        with MazeFile(args.path) as mazes:
+            record = mazes.header(args.index)
+            grid = mazes[args.index]
+            print(f"#{args.index}: {record.width}x{record.height} "
+                  f"seed={record.seed} algorithm={record.algorithm}")
+            for y in range(grid.height):
+                print(grid.row_str(y))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark the fog of war: field-of-view time per move by maze size,
+openness and view radius, the cells a move changes, and the explored
+map's memory.
+
+A player walks a random path through each maze (backtracking out of dead
+ends, as people do) and looks around after every step. "cold" recomputes
+every view; "cached" keeps the views of recent cells, as the game does.
+A perfect maze's corridors keep views short whatever the radius, so each
+size is also run with a share of its inner walls knocked down (--open): at
+0.3 the corridors loop like a braided maze, and at 0.9 the map is an open
+cave where the view, and its cost, grow with the square of the radius.
+
+    python bench_fov.py
+    python bench_fov.py --open 0 0.1 0.5
+    python bench_fov.py --sizes 101 2001 --radii 8 32 --moves 5000
+"""
+
+import argparse
+import random
+import time
+from itertools import product
+
+from fov import FieldOfView
+from mazegen import OPEN, WALL, generate
+
+
+def random_walk(grid, moves, rng):
+    """moves cells of a walk from (1, 1) along the maze's corridors."""
+    x, y = 1, 1
+    path = []
+    came_from = None
+    for _ in range(moves):
+        options = [(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                   if grid[x + dx, y + dy] != WALL]
+        forward = [cell for cell in options if cell != came_from]
+        came_from = (x, y)
+        x, y = rng.choice(forward or options)
+        path.append((x, y))
+    return path
+
+
+def knock_down(grid, share, rng):
+    """Open share of the walls inside the outer ring."""
+    for y in range(1, grid.height - 1):
+        for x in range(1, grid.width - 1):
+            if grid[x, y] == WALL and rng.random() < share:
+                grid[x, y] = OPEN
+
+
+def measure(grid, path, radius, cache_size):
+    fov = FieldOfView(grid, radius, cache_size)
+    fov.move(1, 1)
+    times, visible, changed = [], 0, 0
+    for x, y in path:
+        start = time.perf_counter()
+        appeared, gone = fov.move(x, y)
+        times.append((time.perf_counter() - start) * 1e6)
+        visible += len(fov.visible)
+        changed += len(appeared) + len(gone)
+    times.sort()
+    return times, visible / len(path), changed / len(path), fov
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[101, 501, 2001])
+    parser.add_argument("--radii", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--moves", type=int, default=2000)
+    parser.add_argument("--open", type=float, nargs="+", default=[0.0, 0.3, 0.9],
+                        help="shares of inner walls to knock down, one map each")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>6}{'open':>6}{'radius':>8}{'visible':>9}{'changed':>9}{'cold p50':>11}{'p99':>9}"
+          f"{'cached p50':>12}{'p99':>9}{'hits':>7}{'explored KiB':>14}")
+    for size, share in product(args.sizes, args.open):
+        grid = generate(size, size, "backtracker", args.seed)
+        knock_down(grid, share, random.Random(args.seed))
+        path = random_walk(grid, args.moves, random.Random(args.seed))
+        for radius in args.radii:
+            cold, visible, changed, fov = measure(grid, path, radius, 0)
+            cached, _, _, cached_fov = measure(grid, path, radius, 256)
+            pick = lambda values, p: values[min(len(values) - 1, int(p * len(values)))]
+            print(f"{size:>6}{share:>6.0%}{radius:>8}{visible:>9.1f}{changed:>9.1f}"
+                  f"{pick(cold, 0.5):>9.1f}µs{pick(cold, 0.99):>7.1f}µs"
+                  f"{pick(cached, 0.5):>10.1f}µs{pick(cached, 0.99):>7.1f}µs"
+                  f"{cached_fov.hits / len(path):>7.0%}{len(fov.explored) / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
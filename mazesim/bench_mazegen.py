@@ -0,0 +1,53 @@
+"""
+Benchmark the maze generators: cells/second and peak memory by maze size.
+
+    python bench_mazegen.py
+    python bench_mazegen.py --sizes 1001 4001 --algorithms backtracker eller-stream
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from mazegen import ALGORITHMS, generate, stream_rows
+
+
+def run(algorithm, size, seed):
+    if algorithm == "eller-stream":
+        # consume rows without keeping them, as a writer would
+        for _ in stream_rows(size, size, "eller", seed):
+            pass
+    else:
+        generate(size, size, algorithm, seed)
+
+
+def measure(algorithm, size, seed):
+    start = time.perf_counter()
+    run(algorithm, size, seed)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    run(algorithm, size, seed)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[101, 501, 1001, 2001])
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS) + ["eller-stream"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'algorithm':<14}{'size':>8}{'cells':>12}{'seconds':>10}{'cells/s':>12}{'peak MiB':>10}")
+    for algorithm in args.algorithms:
+        for size in args.sizes:
+            elapsed, peak = measure(algorithm, size, args.seed)
+            cells = ((size - 1) // 2) ** 2
+            print(f"{algorithm:<14}{size:>8}{cells:>12}{elapsed:>10.3f}"
+                  f"{cells / elapsed:>12.0f}{peak / 2**20:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark the endless maze: chunk generation latency, cache hit rate and
+the time a step spends waiting for chunks, with and without prefetching.
+
+A camera walks through the world one cell per step, turning at random,
+and reads its whole view each step as WorldView does when it scrolls. The
+pause between steps stands in for the player and is when the prefetch
+thread gets to work.
+
+    python bench_world.py
+    python bench_world.py --steps 2000 --step-ms 10 --caches 16 64
+"""
+
+import argparse
+import random
+import time
+
+from world import MazeWorld
+
+DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def walk(world, steps, step_ms, view_h, view_w, seed):
+    rng = random.Random(seed)
+    x = y = 1
+    dx, dy = DIRECTIONS[0]
+    stalls = []
+    for i in range(steps):
+        if i % 40 == 0:
+            dx, dy = rng.choice(DIRECTIONS)
+        x, y = x + dx, y + dy
+        top, left = y - view_h // 2, x - view_w // 2
+        start = time.perf_counter()
+        world.prefetch(top, left, view_h, view_w)
+        for row in range(view_h):
+            world.text(top + row, left, view_w)
+        stalls.append((time.perf_counter() - start) * 1000)
+        time.sleep(step_ms / 1000)
+    return sorted(stalls[1:])  # the first step finds an empty cache either way
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--step-ms", type=float, default=20.0, help="pause between steps")
+    parser.add_argument("--caches", type=int, nargs="+", default=[16, 64], help="cache sizes in chunks")
+    parser.add_argument("--view", type=int, nargs=2, default=[23, 79], metavar=("ROWS", "COLS"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'prefetch':<10}{'cache':>6}{'hits':>8}{'waits':>7}{'misses':>8}{'gen p50':>10}{'gen p99':>9}"
+          f"{'step p50':>10}{'p99':>8}{'max':>8}")
+    for cache in args.caches:
+        for prefetch in (False, True):
+            world = MazeWorld(args.seed, cache, prefetch)
+            stalls = walk(world, args.steps, args.step_ms, *args.view, args.seed)
+            world.close()
+            stats = world.stats()
+            p99 = stalls[min(len(stalls) - 1, int(0.99 * len(stalls)))]
+            print(f"{'on' if prefetch else 'off':<10}{cache:>6}{stats['hit_rate']:>8.1%}{stats['waits']:>7}"
+                  f"{stats['misses']:>8}{stats['gen_p50_ms']:>8.2f}ms{stats['gen_p99_ms']:>7.2f}ms"
+                  f"{stalls[len(stalls) // 2]:>8.2f}ms{p99:>6.2f}ms{stalls[-1]:>6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Field of view and fog of war for mazes.
+
+visible_cells() is symmetric shadowcasting (Albert Ford's version): each of
+the four quadrants around the player is scanned row by row, narrowing the
+slopes of the light as walls cast shadows, and a cell is seen exactly when
+it could see the player back. Slopes are kept as integer fractions so ties
+round the same way on every run; the scan uses an explicit stack.
+
+FieldOfView follows a player around a MazeGrid. Each move yields only the
+cells whose visibility changed, so the view redraws those and nothing else.
+The visible set of recently visited cells is cached, which makes walking
+back along a corridor free, and the explored map is one bit per maze cell.
+"""
+
+from collections import OrderedDict
+
+from mazegen import WALL
+
+# (dx, dy) of a quadrant's depth and column axes: north, east, south, west
+QUADRANTS = (((0, -1), (1, 0)), ((1, 0), (0, 1)), ((0, 1), (1, 0)), ((-1, 0), (0, 1)))
+
+
+def visible_cells(grid, x, y, radius):
+    """Flat indices (y * width + x) of the cells of grid seen from (x, y) within radius."""
+    width, height, cells = grid.width, grid.height, grid.cells
+    seen = {y * width + x}
+    limit = radius * radius + radius  # a rounder circle than radius ** 2
+    for (ddx, ddy), (cdx, cdy) in QUADRANTS:
+        # rows still to scan: depth and the start and end slopes as (numerator, denominator)
+        stack = [(1, -1, 1, 1, 1)]
+        while stack:
+            depth, start_num, start_den, end_num, end_den = stack.pop()
+            if depth > radius:
+                continue
+            # columns of this row inside the slopes, rounding ties towards the middle
+            first = (2 * depth * start_num + start_den) // (2 * start_den)
+            last = -((end_den - 2 * depth * end_num) // (2 * end_den))
+            prev = None  # whether the previous cell was a wall
+            for col in range(first, last + 1):
+                cx, cy = x + ddx * depth + cdx * col, y + ddy * depth + cdy * col
+                inside = 0 <= cx < width and 0 <= cy < height
+                is_wall = not inside or cells[cy * width + cx] == WALL
+                # walls are seen if lit at all, floor only if its centre is lit (symmetry)
+                if inside and col * col + depth * depth <= limit and (
+                        is_wall or (col * start_den >= depth * start_num and col * end_den <= depth * end_num)):
+                    seen.add(cy * width + cx)
+                if prev and not is_wall:
+                    start_num, start_den = 2 * col - 1, 2 * depth
+                if prev is False and is_wall:
+                    stack.append((depth + 1, start_num, start_den, 2 * col - 1, 2 * depth))
+                prev = is_wall
+            if prev is False:
+                stack.append((depth + 1, start_num, start_den, end_num, end_den))
+    return seen
+
+
+class FieldOfView:
+    def __init__(self, grid, radius=8, cache_size=256):
+        self.grid = grid
+        self.radius = radius
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # flat index of the player -> frozenset of visible indices
+        self.visible = frozenset()
+        self.explored = bytearray((grid.width * grid.height + 7) >> 3)
+        self.computed = self.hits = 0
+
+    def cells_from(self, x, y):
+        """The visible set from (x, y), from the cache if it is there."""
+        key = y * self.grid.width + x
+        seen = self.cache.get(key)
+        if seen is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return seen
+        self.computed += 1
+        seen = frozenset(visible_cells(self.grid, x, y, self.radius))
+        if self.cache_size:
+            self.cache[key] = seen
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return seen
+
+    def move(self, x, y):
+        """Look from (x, y); returns (cells now in sight, cells gone out of sight)."""
+        seen = self.cells_from(x, y)
+        appeared, gone = seen - self.visible, self.visible - seen
+        explored = self.explored
+        for i in appeared:
+            explored[i >> 3] |= 1 << (i & 7)
+        self.visible = seen
+        return appeared, gone
+
+    def is_explored(self, i):
+        return self.explored[i >> 3] >> (i & 7) & 1
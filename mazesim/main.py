@@ -1,62 +1,228 @@
+import argparse
 import curses
+import os
 import random
+import sys
 import time
 
+from fov import FieldOfView
+from mazegen import MazeGrid, generate
+from solver import DistanceField
+from world import MazeWorld
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from terminalgames import instrument, replay, runtime
+from terminalgames.instrument import profiler
+from terminalgames.render import Canvas, Screen, text_width
+
 
 def generate_maze(width, height):
-    """Random maze generator using recursive backtracking."""
-    maze = [["█" for _ in range(width)] for _ in range(height)]
+    """Random maze generator using an iterative (explicit-stack) backtracker."""
+    return generate(width, height, "backtracker", rng=random).to_rows()
+
+
+class MazeView:
+    """
+    Draws the part of the maze that fits on screen. The walls are a static
+    layer of the shared Screen, so a move only rewrites the cells that
+    changed. Mazes larger than the terminal scroll with the player.
+    """
+
+    def __init__(self, stdscr, maze):
+        self.screen = Screen(stdscr)
+        self.maze = maze
+        self.top = self.left = 0
+        self.resize()
+
+    def resize(self):
+        rows, cols = self.screen.win.getmaxyx()
+        # keep the last row for the status line and the last column free,
+        # since curses refuses to write the bottom-right character
+        self.view_h = max(1, min(len(self.maze), rows - 1))
+        self.view_w = max(1, min(len(self.maze[0]), cols - 1))
+
+    def follow(self, y, x):
+        """Scroll so that (y, x) is visible. Returns True if the view moved."""
+        top, left = self.top, self.left
+        margin_y, margin_x = self.view_h // 4, self.view_w // 4
+        if not top + margin_y <= y < top + self.view_h - margin_y:
+            top = y - self.view_h // 2
+        if not left + margin_x <= x < left + self.view_w - margin_x:
+            left = x - self.view_w // 2
+        top, left = self.clamp(top, left)
+        moved = (top, left) != (self.top, self.left)
+        self.top, self.left = top, left
+        return moved
+
+    def clamp(self, top, left):
+        return (max(0, min(top, len(self.maze) - self.view_h)),
+                max(0, min(left, len(self.maze[0]) - self.view_w)))
+
+    def paint_walls(self, canvas):
+        for sy in range(self.view_h):
+            row = self.maze[self.top + sy]
+            canvas.put(sy, 0, "".join(row[self.left:self.left + self.view_w]))
+
+    def walls_key(self):
+        return self.top, self.left, self.view_h, self.view_w
+
+    def draw(self, player_y, player_x, status):
+        screen = self.screen
+        screen.layer("walls", self.paint_walls, key=self.walls_key())
+        screen.begin()
+        screen.put(player_y - self.top, player_x - self.left, "@", curses.color_pair(1))
+        screen.put(self.view_h, 0, status[:self.view_w], curses.color_pair(2))
+        profiler.draw(screen)
+        screen.present()
+
+    def draw_message(self, lines):
+        """Replace the maze with centred (text, attr) lines."""
+        screen = self.screen
+        screen.drop_layer("walls")
+        screen.begin()
+        for row, (text, attr) in enumerate(lines, start=self.view_h // 2):
+            screen.put(row, max(0, (self.view_w - text_width(text)) // 2), text, attr)
+        screen.present()
+
+
+class WorldView(MazeView):
+    """MazeView of an endless MazeWorld: it scrolls without limits and prefetches the chunks around it."""
 
-    def carve(x, y):
-        directions = [(2, 0), (-2, 0), (0, 2), (0, -2)]
-        random.shuffle(directions)
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 1 <= nx < width - 1 and 1 <= ny < height - 1 and maze[ny][nx] == "█":
-                maze[ny][nx] = " "
-                maze[y + dy // 2][x + dx // 2] = " "
-                carve(nx, ny)
+    def resize(self):
+        rows, cols = self.screen.win.getmaxyx()
+        self.view_h, self.view_w = max(1, rows - 1), max(1, cols - 1)
 
-    # Start carving
-    maze[1][1] = " "
-    carve(1, 1)
+    def clamp(self, top, left):
+        return top, left
 
-    # Mark exit
-    maze[height - 2][width - 2] = "E"
-    return maze
+    def follow(self, y, x):
+        moved = super().follow(y, x)
+        self.maze.prefetch(self.top, self.left, self.view_h, self.view_w)
+        return moved
 
+    def paint_walls(self, canvas):
+        for sy in range(self.view_h):
+            canvas.put(sy, 0, self.maze.text(self.top + sy, self.left, self.view_w))
 
-def main(stdscr):
+
+class FogView(MazeView):
+    """
+    MazeView under fog of war: only cells the player has seen are drawn,
+    dimmed once out of sight. The view keeps its own copy of the wall layer
+    and on a move rewrites just the cells whose visibility changed; only
+    scrolling and resizing paint it all again.
+    """
+
+    def __init__(self, stdscr, maze, fov):
+        self.fov = fov
+        self.memory = None
+        self.painted = None  # walls_key() of the view when memory was last painted in full
+        self.version = 0
+        super().__init__(stdscr, maze)
+
+    def walls_key(self):
+        return super().walls_key() + (self.version,)
+
+    def cell(self, i):
+        """The character and attribute that maze cell i shows now."""
+        y, x = divmod(i, self.fov.grid.width)
+        if i in self.fov.visible:
+            return self.maze[y][x], 0
+        if self.fov.is_explored(i):
+            return self.maze[y][x], curses.A_DIM
+        return " ", 0
+
+    def see(self, x, y):
+        """Look from (x, y) and update the fog; returns the number of cells redrawn."""
+        appeared, gone = self.fov.move(x, y)
+        self.version += 1
+        width = self.fov.grid.width
+        if self.painted != super().walls_key():
+            self.painted = super().walls_key()
+            self.memory = Canvas(self.view_h, self.view_w)
+            for sy in range(self.view_h):
+                start = (self.top + sy) * width + self.left
+                for sx in range(self.view_w):
+                    self.memory.put(sy, sx, *self.cell(start + sx))
+            return self.view_h * self.view_w
+        for i in appeared | gone:
+            y, x = divmod(i, width)
+            y -= self.top
+            x -= self.left
+            if 0 <= y < self.view_h and 0 <= x < self.view_w:
+                self.memory.put(y, x, *self.cell(i))
+        return len(appeared) + len(gone)
+
+    def paint_walls(self, canvas):
+        for sy in range(min(self.view_h, canvas.height)):
+            canvas.chars[sy][:self.view_w] = self.memory.chars[sy]
+            canvas.attrs[sy][:self.view_w] = self.memory.attrs[sy]
+
+
+def main(stdscr, width=31, height=21, world=None, fog_radius=None):
+    return runtime.run(stdscr, play, width, height, world, fog_radius)
+
+
+async def play(rt, width=31, height=21, world=None, fog_radius=None):
+    stdscr = rt.win
     curses.curs_set(0)
-    stdscr.nodelay(True)
     stdscr.keypad(True)
     curses.start_color()
     curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)
 
-    width, height = 31, 21
-    maze = generate_maze(width, height)
+    if world:
+        # endless: no exit to find, so no distances either
+        is_open = world.is_open
+        field = None
+    else:
+        maze = generate_maze(width, height)
+        is_open = lambda x, y: maze[y][x] in (" ", "E")
+        field = DistanceField(maze)
+        optimal = field.distance(1, 1)
+    show_hint = False
+    moves = 0
 
     player_y, player_x = 1, 1
-    start_time = time.time()
+    start_time = time.monotonic()
 
-    while True:
-        stdscr.clear()
+    # The walls are drawn once; each frame only writes what changed
+    if world:
+        view = WorldView(stdscr, world)
+    elif fog_radius is not None:
+        view = FogView(stdscr, maze, FieldOfView(MazeGrid.from_rows(maze), fog_radius))
+    else:
+        view = MazeView(stdscr, maze)
 
-        # Draw maze
-        for y, row in enumerate(maze):
-            stdscr.addstr(y, 0, "".join(row))
+    def look():
+        view.follow(player_y, player_x)
+        if fog_radius is not None:
+            with profiler.span("fov"):
+                profiler.count("fog cells", view.see(player_x, player_y))
 
-        # Draw player
-        stdscr.addstr(player_y, player_x, "@", curses.color_pair(1))
+    look()
+    profiler.watch("addstr", lambda: view.screen.calls)
 
+    while True:
         # Timer
-        elapsed = int(time.time() - start_time)
-        stdscr.addstr(height, 0, f"Time: {elapsed}s  |  Press Q to quit", curses.color_pair(2))
-
-        stdscr.refresh()
+        now = time.monotonic()
+        elapsed = int(now - start_time)
+        status = f"Time: {elapsed}s  |  Moves: {moves}"
+        if world:
+            stats = world.stats()
+            status += (f"  |  ({player_x}, {player_y})  |  Chunks: {stats['hit_rate']:.0%} hits, "
+                       f"{stats['gen_p50_ms']:.2f} ms p50  |  Q: quit")
+        else:
+            if show_hint:
+                status += f"  |  Exit: {field.distance(player_x, player_y)} steps"
+            status += "  |  H: hint  Q: quit"
+        with profiler.span("render"):
+            view.draw(player_y, player_x, status)
 
-        key = stdscr.getch()
+        # Sleep until a key arrives or the timer is due to tick over
+        with profiler.span("input"):
+            key = await rt.key(1 - (now - start_time) % 1)
+        profiler.frame()
         new_y, new_x = player_y, player_x
 
         if key == curses.KEY_UP:
@@ -67,24 +233,59 @@ def main(stdscr):
             new_x -= 1
         elif key == curses.KEY_RIGHT:
             new_x += 1
+        elif key in [ord('h'), ord('H')] and field:
+            show_hint = not show_hint
+        elif key in [ord('p'), ord('P')]:
+            profiler.toggle()
         elif key in [ord('q'), ord('Q')]:
             break
+        elif key == curses.KEY_RESIZE:
+            view.resize()
+            look()
 
         # Check for collision
-        if maze[new_y][new_x] == " " or maze[new_y][new_x] == "E":
+        if (new_y, new_x) != (player_y, player_x) and is_open(new_x, new_y):
             player_y, player_x = new_y, new_x
+            moves += 1
+            look()
 
         # Check for win
-        if maze[player_y][player_x] == "E":
-            stdscr.clear()
-            total_time = int(time.time() - start_time)
-            msg = f"🎉 You escaped in {total_time} seconds! Press any key to exit."
-            stdscr.addstr(height // 2, (width - len(msg)) // 2, msg, curses.color_pair(1))
-            stdscr.refresh()
-            stdscr.nodelay(False)
-            stdscr.getch()
+        if not world and maze[player_y][player_x] == "E":
+            total_time = int(time.monotonic() - start_time)
+            view.draw_message([
+                (f"🎉 You escaped in {total_time} seconds! Press any key to exit.", curses.color_pair(1)),
+                (f"Moves: {moves} (shortest route: {optimal})", curses.color_pair(2)),
+            ])
+            while await rt.key() == -1:
+                pass
             break
 
+    return {"player": [player_y, player_x], "moves": moves,
+            "escaped": not world and maze[player_y][player_x] == "E"}
+
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    parser = argparse.ArgumentParser(description="Maze Escape")
+    parser.add_argument("--width", type=int, default=31)
+    parser.add_argument("--height", type=int, default=21)
+    parser.add_argument("--endless", action="store_true", help="explore a maze without end or exit")
+    parser.add_argument("--cache", type=int, default=64, help="chunks kept in memory in endless mode")
+    parser.add_argument("--fog", action="store_true", help="show only what the player can see or has seen")
+    parser.add_argument("--radius", type=int, default=8, help="how far the player sees in the fog")
+    instrument.add_arguments(parser)
+    args = replay.parse_args(parser)
+    if args.fog and args.endless:
+        parser.error("--fog needs a maze of fixed size, not --endless")
+    if args.fog and args.radius < 1:
+        parser.error("--radius must be at least 1")
+    profiler.configure(args)
+    world = MazeWorld(args.seed, args.cache) if args.endless else None
+    try:
+        replay.run(main, args, args.width, args.height, world, args.radius if args.fog else None)
+    finally:
+        if world:
+            world.close()
+            stats = world.stats()
+            print(f"chunks: {stats['lookups']} lookups, {stats['hit_rate']:.1%} hits, {stats['waits']} waited on "
+                  f"the prefetch, {stats['misses']} misses; {stats['generated']} generated, "
+                  f"p50 {stats['gen_p50_ms']:.2f} ms, p99 {stats['gen_p99_ms']:.2f} ms")
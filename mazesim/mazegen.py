@@ -0,0 +1,270 @@
+"""
+Iterative maze generators for large mazes.
+
+The maze is kept as a flat bytearray (one byte per grid cell) instead of a
+list of lists of strings, and no generator recurses, so sizes are limited by
+memory rather than by Python's recursion limit.
+
+Grid layout matches generate_maze() in main.py: cells sit on odd coordinates,
+walls on even ones, the start is (1, 1) and the exit is the bottom-right cell.
+"""
+
+import random
+from array import array
+
+OPEN = 0
+WALL = 1
+EXIT = 2
+
+CHARS = {OPEN: " ", WALL: "█", EXIT: "E"}
+
+ALGORITHMS = ("backtracker", "prim", "kruskal", "eller")
+
+
+class MazeGrid:
+    """A maze stored as a flat bytearray of OPEN / WALL / EXIT values."""
+
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width, height, cells=None):
+        self.width = width
+        self.height = height
+        self.cells = cells if cells is not None else bytearray([WALL]) * (width * height)
+
+    def __getitem__(self, pos):
+        x, y = pos
+        return self.cells[y * self.width + x]
+
+    def __setitem__(self, pos, value):
+        x, y = pos
+        self.cells[y * self.width + x] = value
+
+    def is_open(self, x, y):
+        return self.cells[y * self.width + x] != WALL
+
+    def row(self, y):
+        start = y * self.width
+        return self.cells[start:start + self.width]
+
+    def row_str(self, y):
+        return row_to_str(self.row(y))
+
+    def rows(self):
+        for y in range(self.height):
+            yield self.row(y)
+
+    def to_rows(self):
+        """Convert to the list-of-lists-of-characters form used by main.py."""
+        return [list(self.row_str(y)) for y in range(self.height)]
+
+    @classmethod
+    def from_rows(cls, rows):
+        height, width = len(rows), len(rows[0])
+        grid = cls(width, height)
+        for y, row in enumerate(rows):
+            for x, ch in enumerate(row):
+                if ch == " ":
+                    grid[x, y] = OPEN
+                elif ch == "E":
+                    grid[x, y] = EXIT
+        return grid
+
+
+def row_to_str(row):
+    return "".join(CHARS[v] for v in row)
+
+
+def _cell_dims(width, height):
+    cols, rows = (width - 1) // 2, (height - 1) // 2
+    if cols < 1 or rows < 1:
+        raise ValueError(f"maze too small: {width}x{height}")
+    return cols, rows
+
+
+def _mark_exit(grid, cols, rows):
+    grid[2 * cols - 1, 2 * rows - 1] = EXIT
+
+
+def _backtracker(grid, cols, rows, rng):
+    w = grid.width
+    cells = grid.cells
+    cells[w + 1] = OPEN
+    stack = [(1, 1)]
+    max_x, max_y = 2 * cols - 1, 2 * rows - 1
+    while stack:
+        x, y = stack[-1]
+        options = []
+        if x > 1 and cells[y * w + x - 2] == WALL:
+            options.append((-2, 0))
+        if x < max_x and cells[y * w + x + 2] == WALL:
+            options.append((2, 0))
+        if y > 1 and cells[(y - 2) * w + x] == WALL:
+            options.append((0, -2))
+        if y < max_y and cells[(y + 2) * w + x] == WALL:
+            options.append((0, 2))
+        if not options:
+            stack.pop()
+            continue
+        dx, dy = options[rng.randrange(len(options))] if len(options) > 1 else options[0]
+        cells[(y + dy // 2) * w + x + dx // 2] = OPEN
+        cells[(y + dy) * w + x + dx] = OPEN
+        stack.append((x + dx, y + dy))
+
+
+def _prim(grid, cols, rows, rng):
+    w = grid.width
+    cells = grid.cells
+    # Per-cell state: 0 = untouched, 1 = frontier, 2 = in maze
+    state = bytearray(cols * rows)
+    frontier = []
+
+    def add(cx, cy):
+        state[cy * cols + cx] = 2
+        cells[(2 * cy + 1) * w + 2 * cx + 1] = OPEN
+        for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+            if 0 <= nx < cols and 0 <= ny < rows and state[ny * cols + nx] == 0:
+                state[ny * cols + nx] = 1
+                frontier.append(ny * cols + nx)
+
+    add(0, 0)
+    while frontier:
+        # swap-remove a random frontier cell
+        i = rng.randrange(len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        idx = frontier.pop()
+        cx, cy = idx % cols, idx // cols
+        links = [(nx, ny) for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1))
+                 if 0 <= nx < cols and 0 <= ny < rows and state[ny * cols + nx] == 2]
+        nx, ny = links[rng.randrange(len(links))]
+        cells[(cy + ny + 1) * w + cx + nx + 1] = OPEN
+        add(cx, cy)
+
+
+def _kruskal(grid, cols, rows, rng):
+    w = grid.width
+    cells = grid.cells
+    parent = array("i", range(cols * rows))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Edge id: 2 * cell + 0 for the edge to the right, + 1 for the edge below
+    edges = array("i", (e for c in range(cols * rows) for e in (2 * c, 2 * c + 1)
+                        if (e & 1 and c // cols < rows - 1) or (not e & 1 and c % cols < cols - 1)))
+    rng.shuffle(edges)
+    for y in range(rows):
+        for x in range(cols):
+            cells[(2 * y + 1) * w + 2 * x + 1] = OPEN
+    for e in edges:
+        c = e >> 1
+        n = c + cols if e & 1 else c + 1
+        a, b = find(c), find(n)
+        if a == b:
+            continue
+        parent[a] = b
+        cx, cy = c % cols, c // cols
+        if e & 1:
+            cells[(2 * cy + 2) * w + 2 * cx + 1] = OPEN
+        else:
+            cells[(2 * cy + 1) * w + 2 * cx + 2] = OPEN
+
+
+def eller_rows(width, height, seed=None, rng=None):
+    """
+    Stream a maze row by row using Eller's algorithm.
+
+    Only O(width) state is kept, so arbitrarily tall mazes can be written out
+    without ever holding the whole grid. Yields bytearray rows of grid width.
+    """
+    cols, rows = _cell_dims(width, height)
+    rng = rng or random.Random(seed)
+    solid = bytearray([WALL]) * width
+    yield bytearray(solid)
+
+    sets = [0] * cols
+    members = {}
+    next_id = 1
+    for cy in range(rows):
+        last = cy == rows - 1
+        for cx in range(cols):
+            if not sets[cx]:
+                sets[cx] = next_id
+                members[next_id] = [cx]
+                next_id += 1
+
+        cell_row = bytearray(solid)
+        for cx in range(cols):
+            cell_row[2 * cx + 1] = OPEN
+        for cx in range(cols - 1):
+            a, b = sets[cx], sets[cx + 1]
+            if a != b and (last or rng.random() < 0.5):
+                cell_row[2 * cx + 2] = OPEN
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for m in members[b]:
+                    sets[m] = a
+                members[a].extend(members.pop(b))
+        if last:
+            cell_row[2 * cols - 1] = EXIT
+            yield cell_row
+            break
+        yield cell_row
+
+        below = bytearray(solid)
+        carried = [0] * cols
+        new_members = {}
+        for set_id, group in members.items():
+            rng.shuffle(group)
+            down = group[:1] + [m for m in group[1:] if rng.random() < 0.5]
+            for m in down:
+                below[2 * m + 1] = OPEN
+                carried[m] = set_id
+            new_members[set_id] = down
+        yield below
+        sets = carried
+        members = new_members
+
+    for _ in range(height - 2 * rows):
+        yield bytearray(solid)
+
+
+def _eller(grid, cols, rows, rng):
+    w = grid.width
+    for y, row in enumerate(eller_rows(grid.width, grid.height, rng=rng)):
+        grid.cells[y * w:(y + 1) * w] = row
+
+
+_GENERATORS = {
+    "backtracker": _backtracker,
+    "prim": _prim,
+    "kruskal": _kruskal,
+    "eller": _eller,
+}
+
+
+def generate(width, height, algorithm="backtracker", seed=None, rng=None):
+    """Generate a MazeGrid with the given algorithm, without recursion."""
+    if algorithm not in _GENERATORS:
+        raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+    cols, rows = _cell_dims(width, height)
+    rng = rng or random.Random(seed)
+    grid = MazeGrid(width, height)
+    _GENERATORS[algorithm](grid, cols, rows, rng)
+    _mark_exit(grid, cols, rows)
+    return grid
+
+
+def stream_rows(width, height, algorithm="eller", seed=None):
+    """
+    Yield maze rows one at a time.
+
+    Eller's algorithm streams in O(width) memory; the other algorithms need
+    the whole grid and generate it first.
+    """
+    if algorithm == "eller":
+        yield from eller_rows(width, height, seed)
+    else:
+        yield from generate(width, height, algorithm, seed).rows()
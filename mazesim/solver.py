@@ -0,0 +1,123 @@
+"""
+Shortest-path solving for mazesim mazes.
+
+Works on the list-of-lists maze returned by generate_maze() as well as on a
+MazeGrid from mazegen. Coordinates are (x, y), like in mazegen.
+"""
+
+import heapq
+from array import array
+from collections import deque
+
+from mazegen import EXIT, WALL, MazeGrid
+
+UNREACHABLE = -1
+
+
+def as_grid(maze):
+    if isinstance(maze, MazeGrid):
+        return maze
+    return MazeGrid.from_rows(maze)
+
+
+def find_exit(grid):
+    idx = grid.cells.find(EXIT)
+    if idx < 0:
+        raise ValueError("maze has no exit")
+    return idx % grid.width, idx // grid.width
+
+
+class DistanceField:
+    """
+    Distance to a target from every open cell, stored as a flat int array.
+
+    Built once with a BFS; afterwards distance() and next_step() are O(1).
+    """
+
+    __slots__ = ("width", "height", "target", "dist")
+
+    def __init__(self, maze, target=None):
+        grid = as_grid(maze)
+        self.width, self.height = grid.width, grid.height
+        self.target = target if target is not None else find_exit(grid)
+        self.dist = self._bfs(grid)
+
+    def _bfs(self, grid):
+        w, h = self.width, self.height
+        cells = grid.cells
+        dist = array("i", [UNREACHABLE]) * (w * h)
+        tx, ty = self.target
+        start = ty * w + tx
+        dist[start] = 0
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            d = dist[i] + 1
+            x = i % w
+            for n in (i - w, i + w, i - 1 if x > 0 else -1, i + 1 if x < w - 1 else -1):
+                if 0 <= n < w * h and dist[n] == UNREACHABLE and cells[n] != WALL:
+                    dist[n] = d
+                    queue.append(n)
+        return dist
+
+    def distance(self, x, y):
+        """Steps from (x, y) to the target, or UNREACHABLE."""
+        return self.dist[y * self.width + x]
+
+    def next_step(self, x, y):
+        """The neighbour of (x, y) one step closer to the target, or None."""
+        d = self.distance(x, y)
+        if d <= 0:
+            return None
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < self.width and 0 <= ny < self.height and self.distance(nx, ny) == d - 1:
+                return nx, ny
+        return None
+
+    def unreachable_cells(self, maze):
+        """Open cells of maze that cannot reach the target (0 for a valid maze)."""
+        cells = as_grid(maze).cells
+        return sum(1 for i, d in enumerate(self.dist) if d == UNREACHABLE and cells[i] != WALL)
+
+    def path_from(self, x, y):
+        """The shortest path from (x, y) to the target, both ends included."""
+        if self.distance(x, y) == UNREACHABLE:
+            return None
+        path = [(x, y)]
+        step = self.next_step(x, y)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(*step)
+        return path
+
+
+def shortest_path(maze, start=(1, 1), goal=None):
+    """A* search from start to goal (the exit by default), or None if unreachable."""
+    grid = as_grid(maze)
+    w = grid.width
+    cells = grid.cells
+    gx, gy = goal if goal is not None else find_exit(grid)
+    sx, sy = start
+    begin, end = sy * w + sx, gy * w + gx
+
+    came_from = {begin: None}
+    cost = {begin: 0}
+    heap = [(abs(sx - gx) + abs(sy - gy), 0, begin)]
+    while heap:
+        _, g, i = heapq.heappop(heap)
+        if i == end:
+            path = []
+            while i is not None:
+                path.append((i % w, i // w))
+                i = came_from[i]
+            return path[::-1]
+        if g > cost[i]:
+            continue
+        x = i % w
+        for n in (i - w, i + w, i - 1 if x > 0 else -1, i + 1 if x < w - 1 else -1):
+            if 0 <= n < len(cells) and cells[n] != WALL and g + 1 < cost.get(n, g + 2):
+                cost[n] = g + 1
+                came_from[n] = i
+                nx, ny = n % w, n // w
+                heapq.heappush(heap, (g + 1 + abs(nx - gx) + abs(ny - gy), g + 1, n))
+    return None
@@ -0,0 +1,159 @@
+"""
+An endless maze made of chunks, generated as the player reaches them.
+
+The world is cut into CHUNK x CHUNK squares of the grid. Each chunk is a
+perfect maze of its own, built by mazegen from a seed derived from (seed,
+chunk x, chunk y) alone, so a chunk can be thrown away and regenerated
+identically at any time. A chunk owns the wall along its top and left edge
+and opens DOORS gaps in each; as every chunk is connected inside and to all
+four neighbours, so is the whole world. Coordinates keep the mazegen grid
+layout, cells on odd (x, y) and walls between them, and may be negative.
+
+Chunks live in an LRU cache of cache_size chunks. prefetch() queues the
+chunks around the view on a background thread, so by the time the player
+walks into them they are usually ready; a chunk that is not is generated
+on the spot, which is counted as a miss. The prefetch window never holds
+more chunks than the cache, so a small cache prefetches a thinner margin.
+"""
+
+import random
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter  # not time.perf_counter: replays swap in a recorded clock for the game's time
+
+from mazegen import CHARS, OPEN, WALL, generate
+
+CHUNK = 32  # grid cells a side, even so that cells stay on odd coordinates
+DOORS = 2  # gaps in each chunk edge
+
+
+def make_chunk(seed, cx, cy, size=CHUNK, algorithm="backtracker"):
+    """The size x size cells of chunk (cx, cy) as a bytearray of OPEN / WALL."""
+    rng = random.Random(f"{seed}:{cx}:{cy}")
+    grid = generate(size + 1, size + 1, algorithm, rng=rng)
+    # keep the top and left walls; the bottom and right ones belong to the neighbours
+    cells = bytearray()
+    for y in range(size):
+        cells += grid.cells[y * grid.width:y * grid.width + size]
+    cells[(size - 1) * size + size - 1] = OPEN  # mazegen's exit
+    for i in rng.sample(range(1, size, 2), DOORS):
+        cells[i] = OPEN  # top edge
+    for i in rng.sample(range(1, size, 2), DOORS):
+        cells[i * size] = OPEN  # left edge
+    return cells
+
+
+class MazeWorld:
+    def __init__(self, seed=0, cache_size=64, prefetch=True, algorithm="backtracker", size=CHUNK):
+        self.seed = seed
+        self.size = size
+        self.algorithm = algorithm
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # (cx, cy) -> cells, least recently used first
+        self.pending = {}  # (cx, cy) -> future from the prefetch thread
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="chunks") if prefetch else None
+        self.hits = self.misses = self.waits = 0
+        self.gen_ms = []  # generation time of every chunk, foreground or not
+
+    def _generate(self, key):
+        start = perf_counter()
+        cells = make_chunk(self.seed, *key, self.size, self.algorithm)
+        self.gen_ms.append((perf_counter() - start) * 1000)
+        return cells
+
+    def _store(self, key, cells):
+        self.cache[key] = cells
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _collect(self):
+        """Move finished prefetches into the cache."""
+        for key in [key for key, future in self.pending.items() if future.done()]:
+            cells = self.pending.pop(key).result()
+            if key not in self.cache:
+                self._store(key, cells)
+
+    def chunk(self, cx, cy):
+        key = cx, cy
+        cells = self.cache.get(key)
+        if cells is None and self.pending:
+            self._collect()
+            cells = self.cache.get(key)
+        if cells is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return cells
+        future = self.pending.pop(key, None)
+        if future is not None:
+            self.waits += 1  # queued but not done yet
+            cells = future.result()
+        else:
+            self.misses += 1
+            cells = self._generate(key)
+        self._store(key, cells)
+        return cells
+
+    def __getitem__(self, pos):
+        x, y = pos
+        size = self.size
+        return self.chunk(x // size, y // size)[(y % size) * size + x % size]
+
+    def is_open(self, x, y):
+        return self[x, y] != WALL
+
+    def text(self, y, x, width):
+        """width characters of row y starting at column x, one chunk lookup per chunk crossed."""
+        size = self.size
+        cy, row = divmod(y, size)
+        parts = []
+        while width > 0:
+            cx, col = divmod(x, size)
+            n = min(width, size - col)
+            start = row * size + col
+            parts.append(self.chunk(cx, cy)[start:start + n].decode("latin-1"))
+            x += n
+            width -= n
+        return "".join(parts).translate(CHARS)
+
+    def _window(self, top, left, height, width, margin):
+        """range of chunk rows and range of chunk columns of a view and margin cells around it."""
+        size = self.size
+        return (range((top - margin) // size, (top + height + margin) // size + 1),
+                range((left - margin) // size, (left + width + margin) // size + 1))
+
+    def prefetch(self, top, left, height, width, margin=None):
+        """
+        Queue the chunks of a view, and margin cells around it, that are
+        neither cached nor queued. The margin shrinks until the whole window
+        fits in the cache, as chunks queued beyond that would only evict the
+        visible ones; queued chunks that fell out of the window are dropped.
+        """
+        if self.executor is None:
+            return
+        self._collect()
+        margin = self.size if margin is None else margin
+        rows, cols = self._window(top, left, height, width, margin)
+        while margin > 0 and len(rows) * len(cols) > self.cache_size:
+            margin -= 1
+            rows, cols = self._window(top, left, height, width, margin)
+        for key in [key for key in self.pending if key[1] not in rows or key[0] not in cols]:
+            if self.pending[key].cancel():
+                del self.pending[key]
+        for cy in rows:
+            for cx in cols:
+                key = cx, cy
+                if key not in self.cache and key not in self.pending:
+                    self.pending[key] = self.executor.submit(self._generate, key)
+
+    def stats(self):
+        lookups = self.hits + self.waits + self.misses
+        times = sorted(self.gen_ms) or [0.0]
+        return {"lookups": lookups, "hit_rate": self.hits / max(1, lookups), "waits": self.waits,
+                "misses": self.misses, "generated": len(self.gen_ms), "cached": len(self.cache),
+                "gen_p50_ms": times[len(times) // 2],
+                "gen_p99_ms": times[min(len(times) - 1, int(0.99 * len(times)))]}
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
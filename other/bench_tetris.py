@@ -0,0 +1,106 @@
+"""
+Benchmark Tetris placements per second: the original list-of-lists board
+(nested-loop collision, rebuilt board on line clears, zip() rotations)
+against the BitBoard engine. Both play the same seeded sequence of random
+placements and must end up clearing the same number of lines.
+
+    python bench_tetris.py --placements 100000
+"""
+
+import argparse
+import random
+import time
+
+from bitboard import PIECES, SHAPES, BitBoard
+
+
+class LegacyBoard:
+    """The board logic Tetris used before the bitboard engine, minus curses."""
+
+    def __init__(self, width=10, height=20):
+        self.width, self.height = width, height
+        self.board = [[0]*width for _ in range(height)]
+
+    def collision(self, shape, sx, sy):
+        for y,row in enumerate(shape):
+            for x,val in enumerate(row):
+                if val:
+                    nx, ny = sx + x, sy + y
+                    if nx < 0 or nx >= self.width or ny >= self.height:
+                        return True
+                    if ny >= 0 and self.board[ny][nx]:
+                        return True
+        return False
+
+    def place(self, shape, sx, sy, color):
+        for y,row in enumerate(shape):
+            for x,val in enumerate(row):
+                if val:
+                    self.board[sy+y][sx+x] = color
+        new_board = [row for row in self.board if any(cell==0 for cell in row)]
+        cleared = self.height - len(new_board)
+        for _ in range(cleared):
+            new_board.insert(0,[0]*self.width)
+        self.board = new_board
+        return cleared
+
+
+def moves(count, seed, width=10):
+    rng = random.Random(seed)
+    names = list(SHAPES)
+    for _ in range(count):
+        piece = PIECES[rng.choice(names)]
+        rotation = rng.randrange(4)
+        x = rng.randrange(width - piece.rotations[rotation].width + 1)
+        yield piece.name, rotation, x
+
+
+def run_legacy(plan):
+    board = LegacyBoard()
+    lines = 0
+    start = time.perf_counter()
+    for name, rotation, x in plan:
+        shape, color = SHAPES[name]
+        shape = [row[:] for row in shape]
+        for _ in range(rotation):
+            shape = [list(row) for row in zip(*shape[::-1])]
+        if board.collision(shape, x, 0):
+            board = LegacyBoard()
+        y = 0
+        while not board.collision(shape, x, y + 1):
+            y += 1
+        lines += board.place(shape, x, y, color)
+    return time.perf_counter() - start, lines
+
+
+def run_bitboard(plan):
+    board = BitBoard()
+    lines = 0
+    start = time.perf_counter()
+    for name, rotation, x in plan:
+        piece = PIECES[name]
+        rot = piece.rotations[rotation]
+        if board.collides(rot, x, 0):
+            board = BitBoard()
+        lines += board.place(rot, x, board.drop_y(rot, x), piece.color)
+    return time.perf_counter() - start, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--placements", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    plan = list(moves(args.placements, args.seed))
+    old, old_lines = run_legacy(plan)
+    new, new_lines = run_bitboard(plan)
+    if old_lines != new_lines:
+        raise SystemExit(f"engines disagree: {old_lines} vs {new_lines} lines cleared")
+    print(f"{args.placements} placements, {new_lines} lines cleared")
+    print(f"list board   {args.placements / old:>12,.0f} placements/s")
+    print(f"bitboard     {args.placements / new:>12,.0f} placements/s  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
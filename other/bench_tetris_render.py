@@ -0,0 +1,69 @@
+"""
+Measure what Tetris sends to the terminal with the full-redraw and the diff
+renderer. The bot plays the same seeded game in a pseudo-terminal for each
+renderer; this script counts the bytes written to the terminal and reports
+the game's own curses call counts. Unix only (uses pty).
+
+    python bench_tetris_render.py --seconds 10
+"""
+
+import argparse
+import os
+import pty
+import select
+import struct
+import sys
+import time
+
+try:
+    import fcntl
+    import termios
+except ImportError:  # Windows
+    fcntl = termios = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run(full_redraw, seconds, seed, rows=30, cols=80):
+    cmd = [sys.executable, os.path.join(HERE, "tetris.py"), "--ai", "--render-stats",
+           "--seconds", str(seconds), "--seed", str(seed)]
+    if full_redraw:
+        cmd.append("--full-redraw")
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.environ.setdefault("TERM", "xterm-256color")
+        os.execv(cmd[0], cmd)
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+    output = bytearray()
+    start = time.monotonic()
+    while True:
+        ready, _, _ = select.select([fd], [], [], 0.5)
+        if ready:
+            try:
+                data = os.read(fd, 65536)
+            except OSError:
+                break
+            if not data:
+                break
+            output += data
+    os.waitpid(pid, 0)
+    elapsed = time.monotonic() - start
+    stats = output.decode("utf-8", "replace").strip().splitlines()[-1]
+    return len(output) / elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if fcntl is None:
+        raise SystemExit("needs a Unix pseudo-terminal")
+
+    for full_redraw in (True, False):
+        bytes_per_s, stats = run(full_redraw, args.seconds, args.seed)
+        print(f"{bytes_per_s:>12,.0f} bytes/s to the terminal | {stats}")
+
+
+if __name__ == "__main__":
+    main()
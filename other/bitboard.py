@@ -0,0 +1,125 @@
+"""
+Bitboard Tetris engine.
+
+Each board row is an int whose bit x is set when column x is filled, so a
+collision test is one AND per piece row and a full line is a single integer
+compare. Pieces are precomputed once: four rotations each, stored as row
+bitmasks, with the kick offsets tried when a rotation collides.
+"""
+
+# Define Tetris shapes with color index
+SHAPES = {
+    'I': ([[1,1,1,1]], 1),
+    'O': ([[1,1],
+           [1,1]], 2),
+    'T': ([[0,1,0],
+           [1,1,1]], 3),
+    'S': ([[0,1,1],
+           [1,1,0]], 4),
+    'Z': ([[1,1,0],
+           [0,1,1]], 5),
+    'J': ([[1,0,0],
+           [1,1,1]], 6),
+    'L': ([[0,0,1],
+           [1,1,1]], 7)
+}
+
+# Horizontal offsets tried, in order, when a rotation collides
+KICKS = {'I': (0, -1, 1, -2, 2)}
+DEFAULT_KICKS = (0, -1, 1)
+
+
+class Rotation:
+    __slots__ = ("matrix", "masks", "width", "height", "cells")
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.masks = tuple(sum(1 << x for x, v in enumerate(row) if v) for row in matrix)
+        self.width = len(matrix[0])
+        self.height = len(matrix)
+        self.cells = tuple((y, x) for y, row in enumerate(matrix) for x, v in enumerate(row) if v)
+
+
+class Piece:
+    __slots__ = ("name", "color", "rotations", "unique", "kicks")
+
+    def __init__(self, name, matrix, color):
+        self.name = name
+        self.color = color
+        self.rotations = []
+        for _ in range(4):
+            self.rotations.append(Rotation(matrix))
+            # clockwise, as Tetris.rotate() always did
+            matrix = [list(row) for row in zip(*matrix[::-1])]
+        # rotation indices with distinct shapes (O has one, I/S/Z two)
+        seen = []
+        self.unique = []
+        for i, rot in enumerate(self.rotations):
+            if rot.masks not in seen:
+                seen.append(rot.masks)
+                self.unique.append(i)
+        self.kicks = KICKS.get(name, DEFAULT_KICKS)
+
+
+PIECES = {name: Piece(name, matrix, color) for name, (matrix, color) in SHAPES.items()}
+
+
+class BitBoard:
+    def __init__(self, width=10, height=20):
+        self.width = width
+        self.height = height
+        self.full = (1 << width) - 1
+        self.rows = [0] * height
+        # color index per cell, only needed for drawing
+        self.colors = [bytearray(width) for _ in range(height)]
+
+    def copy(self, colors=True):
+        """Copy the board; without colors the copy is cheap and only good for search."""
+        board = BitBoard.__new__(BitBoard)
+        board.width, board.height, board.full = self.width, self.height, self.full
+        board.rows = self.rows[:]
+        board.colors = [bytearray(row) for row in self.colors] if colors and self.colors else None
+        return board
+
+    def collides(self, rot, x, y):
+        if x < 0 or x + rot.width > self.width or y + rot.height > self.height:
+            return True
+        rows = self.rows
+        for i, mask in enumerate(rot.masks):
+            if y + i >= 0 and rows[y + i] & (mask << x):
+                return True
+        return False
+
+    def drop_y(self, rot, x, y=0):
+        """The lowest y the piece reaches when hard-dropped from (x, y)."""
+        while not self.collides(rot, x, y + 1):
+            y += 1
+        return y
+
+    def place(self, rot, x, y, color=1):
+        """Lock a piece into the board. Returns the number of lines cleared."""
+        rows, colors = self.rows, self.colors
+        for i, mask in enumerate(rot.masks):
+            if y + i >= 0:
+                rows[y + i] |= mask << x
+        if colors is not None:
+            for dy, dx in rot.cells:
+                if y + dy >= 0:
+                    colors[y + dy][x + dx] = color
+        return self.clear_lines(max(0, y), min(self.height, y + rot.height))
+
+    def clear_lines(self, top=0, bottom=None):
+        """Remove full rows between top and bottom (only a placed piece can fill one)."""
+        bottom = self.height if bottom is None else bottom
+        full = [y for y in range(top, bottom) if self.rows[y] == self.full]
+        if not full:
+            return 0
+        cleared = len(full)
+        for y in reversed(full):
+            del self.rows[y]
+        self.rows[:0] = [0] * cleared
+        if self.colors is not None:
+            for y in reversed(full):
+                del self.colors[y]
+            self.colors[:0] = [bytearray(self.width) for _ in range(cleared)]
+        return cleared
@@ -0,0 +1,124 @@
+"""
+Parallel Tetris soak runs.
+
+Plays many seeded games on TetrisCore across a process pool, driven either
+by the bot or by a scripted input source, and summarises the score, lines
+and pieces-per-second distributions. The same seeds always replay the same
+games.
+
+    python soak.py --games 1000 --input scripted --randomizer bag
+    python soak.py --games 64 --input ai --budget-ms 5 --json soak.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tetris_core import ACTIONS, RANDOMIZERS, TetrisCore
+
+INPUTS = ("scripted", "ai")
+
+
+def scripted_actions(seed):
+    """A seeded stream of random key presses, weighted towards sideways moves."""
+    rng = random.Random(seed)
+    weights = {"left": 3, "right": 3, "down": 1, "rotate": 2, "drop": 1}
+    actions = [a for a in ACTIONS for _ in range(weights[a])]
+    while True:
+        yield rng.choice(actions)
+
+
+def play(task):
+    """Play one game; runs in a worker process."""
+    seed, source, randomizer, max_pieces, budget_ms = task
+    start = time.perf_counter()
+    if source == "ai":
+        from tetris_ai import TetrisAI, play_headless
+
+        game = play_headless(TetrisAI(budget_ms), seed, max_pieces, randomizer)
+    else:
+        game = TetrisCore(seed=seed, randomizer=randomizer)
+        actions = scripted_actions(seed)
+        while not game.game_over and game.placed < max_pieces:
+            game.apply(next(actions))
+    elapsed = time.perf_counter() - start
+    return {
+        "seed": seed,
+        "score": game.score,
+        "lines": game.lines,
+        "pieces": game.placed,
+        "seconds": elapsed,
+        "pieces_per_s": game.placed / elapsed if elapsed else 0.0,
+        "topped_out": game.game_over,
+    }
+
+
+def distribution(values):
+    values = sorted(values)
+    quantiles = statistics.quantiles(values, n=100, method="inclusive") if len(values) > 1 else values * 99
+    return {
+        "mean": statistics.fmean(values),
+        "min": values[0],
+        "p50": quantiles[49],
+        "p90": quantiles[89],
+        "p99": quantiles[98],
+        "max": values[-1],
+    }
+
+
+def soak(games, source="scripted", randomizer="uniform", seed=0, max_pieces=1000,
+         budget_ms=10.0, workers=None):
+    """Run the games and return (per-game results, summary)."""
+    tasks = [(seed + k, source, randomizer, max_pieces, budget_ms) for k in range(games)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(pool.map(play, tasks, chunksize=max(1, games // (8 * (workers or os.cpu_count() or 1)))))
+    wall = time.perf_counter() - start
+    summary = {
+        "games": games,
+        "input": source,
+        "randomizer": randomizer,
+        "seed": seed,
+        "wall_seconds": wall,
+        "total_pieces_per_s": sum(r["pieces"] for r in results) / wall,
+        "topped_out": sum(r["topped_out"] for r in results),
+    }
+    for key in ("score", "lines", "pieces_per_s"):
+        summary[key] = distribution([r[key] for r in results])
+    return results, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel Tetris soak runs")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--input", choices=INPUTS, default="scripted")
+    parser.add_argument("--randomizer", choices=RANDOMIZERS, default="uniform")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-pieces", type=int, default=1000)
+    parser.add_argument("--budget-ms", type=float, default=10.0, help="bot time budget per piece")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", metavar="FILE", help="write per-game results and the summary")
+    args = parser.parse_args()
+
+    results, summary = soak(args.games, args.input, args.randomizer, args.seed,
+                            args.max_pieces, args.budget_ms, args.workers)
+
+    print(f"{summary['games']} games ({summary['input']} input, {summary['randomizer']} pieces) "
+          f"in {summary['wall_seconds']:.1f}s, {summary['total_pieces_per_s']:,.0f} pieces/s overall, "
+          f"{summary['topped_out']} topped out")
+    print(f"{'':<14}{'mean':>10}{'min':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for key in ("score", "lines", "pieces_per_s"):
+        d = summary[key]
+        print(f"{key:<14}" + "".join(f"{d[k]:>10.1f}" for k in ("mean", "min", "p50", "p90", "p99", "max")))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "games": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,33 @@
+import argparse
 import curses
-import random
+import os
+import sys
 import time
 
-# Define Tetris shapes with color index
-SHAPES = {
-    'I': ([[1,1,1,1]], 1),
-    'O': ([[1,1],
-           [1,1]], 2),
-    'T': ([[0,1,0],
-           [1,1,1]], 3),
-    'S': ([[0,1,1],
-           [1,1,0]], 4),
-    'Z': ([[1,1,0],
-           [0,1,1]], 5),
-    'J': ([[1,0,0],
-           [1,1,1]], 6),
-    'L': ([[0,0,1],
-           [1,1,1]], 7)
+from tetris_core import RANDOMIZERS, TetrisCore
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from terminalgames import instrument, replay, runtime
+from terminalgames.instrument import profiler
+from terminalgames.render import CallCounter, Screen
+
+KEY_ACTIONS = {
+    ord('a'): "left", curses.KEY_LEFT: "left",
+    ord('d'): "right", curses.KEY_RIGHT: "right",
+    ord('s'): "down", curses.KEY_DOWN: "down",
+    ord('w'): "rotate", curses.KEY_UP: "rotate",
+    ord(' '): "drop",
 }
+BOT_STEP = 0.01  # seconds between the bot's moves
 
-class Tetris:
-    def __init__(self, stdscr):
+class Tetris(TetrisCore):
+    def __init__(self, stdscr, ai=None, diff=True, seed=None, randomizer="uniform"):
         self.stdscr = stdscr
+        self.screen = Screen(stdscr, diff)
+        self.drawn_state = None
+        self.ai = ai
+        self.plan = []
+        self.plan_piece = 0
         curses.curs_set(0)
         curses.start_color()
         # Initialize 7 colors
@@ -33,144 +39,135 @@ class Tetris:
         curses.init_pair(6, curses.COLOR_BLUE, curses.COLOR_BLACK)
         curses.init_pair(7, curses.COLOR_WHITE, curses.COLOR_BLACK)
 
-        self.height, self.width = 20, 10
-        self.board = [[0]*self.width for _ in range(self.height)]
-        self.score = 0
         self.delay = 0.5
-        self.next_shape, self.next_color = self.new_shape()
-        self.shape, self.color = self.new_shape()
-        self.shape_x = self.width // 2 - len(self.shape[0])//2
-        self.shape_y = 0
-        self.game_over = False
-
-    def new_shape(self):
-        s, color = random.choice(list(SHAPES.values()))
-        return [row[:] for row in s], color
-
-    def rotate(self):
-        rotated = [list(row) for row in zip(*self.shape[::-1])]
-        old_x, old_y = self.shape_x, self.shape_y
-        if self.collision(rotated):
-            return
-        self.shape = rotated
+        super().__init__(seed=seed, randomizer=randomizer)
 
-    def collision(self, shape=None, dx=0, dy=0):
-        if shape is None:
-            shape = self.shape
-        for y,row in enumerate(shape):
-            for x,val in enumerate(row):
-                if val:
-                    nx = self.shape_x + x + dx
-                    ny = self.shape_y + y + dy
-                    if nx < 0 or nx >= self.width or ny >= self.height:
-                        return True
-                    if ny >= 0 and self.board[ny][nx]:
-                        return True
-        return False
-
-    def place_shape(self):
-        for y,row in enumerate(self.shape):
-            for x,val in enumerate(row):
-                if val:
-                    self.board[self.shape_y+y][self.shape_x+x] = self.color
-        self.clear_lines()
-        self.shape, self.color = self.next_shape, self.next_color
-        self.next_shape, self.next_color = self.new_shape()
-        self.shape_x = self.width // 2 - len(self.shape[0])//2
-        self.shape_y = 0
-        if self.collision():
-            self.game_over = True
-
-    def clear_lines(self):
-        new_board = [row for row in self.board if any(cell==0 for cell in row)]
-        cleared = self.height - len(new_board)
-        self.score += cleared * 100
-        for _ in range(cleared):
-            new_board.insert(0,[0]*self.width)
-        self.board = new_board
-
-    def drop(self):
-        if not self.collision(dy=1):
-            self.shape_y += 1
-        else:
-            self.place_shape()
-
-    def move(self, dx):
-        if not self.collision(dx=dx):
-            self.shape_x += dx
+    def paint_static(self, canvas):
+        """Border and labels: painted once into the screen's static layer."""
+        y_offset = 1
+        canvas.box(y_offset - 1, 0, self.height + 2, self.width*2 + 2)
+        canvas.put(y_offset + 1, self.width*2 + 5, "Next:")
 
     def draw(self):
-        self.stdscr.clear()
+        """Draw the frame into the screen buffer and show what changed."""
         y_offset = 1  # Shift everything down by 1 row
+        screen = self.screen
+        screen.layer("static", self.paint_static)
+        screen.begin()
 
-        # Draw border
-        for y in range(self.height):
-            self.stdscr.addstr(y + y_offset, 0, '│')
-            self.stdscr.addstr(y + y_offset, self.width*2 + 1, '│')
-        self.stdscr.addstr(y_offset - 1, 0, '┌' + '─'*(self.width*2) + '┐')
-        self.stdscr.addstr(self.height + y_offset, 0, '└' + '─'*(self.width*2) + '┘')
-
-        # Draw board
-        for y,row in enumerate(self.board):
+        # Board
+        for y,row in enumerate(self.board.colors):
             for x,val in enumerate(row):
                 if val:
-                    self.stdscr.addstr(y + y_offset, x*2 + 1, '██', curses.color_pair(val))
+                    screen.put(y + y_offset, x*2 + 1, '██', curses.color_pair(val))
 
-        # Draw current shape
+        # Current shape
         for y,row in enumerate(self.shape):
             for x,val in enumerate(row):
                 if val and self.shape_y+y >= 0:
-                    self.stdscr.addstr(self.shape_y + y + y_offset, (self.shape_x + x)*2 + 1, '██', curses.color_pair(self.color))
+                    screen.put(self.shape_y + y + y_offset, (self.shape_x + x)*2 + 1, '██', curses.color_pair(self.color))
 
-        # Draw next shape preview
-        self.stdscr.addstr(y_offset + 1, self.width*2 + 5, "Next:")
+        # Next shape preview
         for y,row in enumerate(self.next_shape):
             for x,val in enumerate(row):
                 if val:
-                    self.stdscr.addstr(y_offset + 2 + y, self.width*2 + 5 + x*2, '██', curses.color_pair(self.next_color))
+                    screen.put(y_offset + 2 + y, self.width*2 + 5 + x*2, '██', curses.color_pair(self.next_color))
+
+        # Score
+        screen.put(y_offset + 8, self.width*2 + 5, f"Score: {self.score}")
+        if self.ai:
+            screen.put(y_offset + 10, self.width*2 + 5, f"Bot: {self.ai.avg_latency_ms:.1f} ms/piece")
+        profiler.draw(screen)
+        screen.present()
+
+    @profiler.timed("render")
+    def render(self):
+        # Only the piece position and placed pieces change what is on screen;
+        # the full-redraw mode repaints every tick, as the game used to
+        state = (self.pieces, self.rotation, self.shape_x, self.shape_y, self.score)
+        if state == self.drawn_state and self.screen.diff and not profiler.hud:
+            return
+        self.drawn_state = state
+        self.draw()
+
+    def ai_action(self):
+        """The bot's next action, planning a placement for each new piece."""
+        if not self.plan or self.plan_piece != self.pieces:
+            move = self.ai.choose(self.board, self.piece, self.next_piece, self.shape_x)
+            self.plan = list(move.actions) if move else ["drop"]
+            self.plan_piece = self.pieces
+        return self.plan.pop(0)
 
-        # Draw score
-        self.stdscr.addstr(y_offset + 8, self.width*2 + 5, f"Score: {self.score}")
-        self.stdscr.refresh()
+    def run(self, seconds=None):
+        runtime.run(self.stdscr, self.play, seconds)
 
-    
-    
-    def run(self):
+    async def play(self, rt, seconds=None):
         last_time = time.time()
-        self.stdscr.nodelay(True)
+        end_time = last_time + seconds if seconds else None
+        profiler.watch("addstr", lambda: self.screen.calls)
         while not self.game_over:
+            # Sleep until a key arrives, the piece is due to fall or the bot's next move
             now = time.time()
-            if now - last_time > self.delay:
-                self.drop()
-                last_time = now
-
-            try:
-                key = self.stdscr.getkey()
-            except:
-                key = None
-
-            if key in ['a','KEY_LEFT']:
-                self.move(-1)
-            elif key in ['d','KEY_RIGHT']:
-                self.move(1)
-            elif key in ['s','KEY_DOWN']:
-                self.drop()
-            elif key in ['w','KEY_UP']:
-                self.rotate()
-            elif key in [' ']:
-                while not self.collision(dy=1):
-                    self.shape_y +=1
-                self.place_shape()
-
-            self.draw()
-            time.sleep(0.01)
-
-        self.stdscr.addstr(self.height//2, self.width, "GAME OVER!")
-        self.stdscr.refresh()
-        time.sleep(2)
-
-def main(stdscr):
-    game = Tetris(stdscr)
-    game.run()
-
-curses.wrapper(main)
+            if end_time and now > end_time:
+                return
+            timeout = last_time + self.delay - now
+            if self.ai:
+                timeout = min(timeout, BOT_STEP)
+            if end_time:
+                timeout = min(timeout, end_time - now)
+            with profiler.span("input"):
+                key = await rt.key(timeout)
+            if key in (ord('q'), ord('Q')):
+                return
+            if key in (ord('p'), ord('P')):
+                profiler.toggle()
+
+            with profiler.span("update"):
+                now = time.time()
+                if now - last_time > self.delay:
+                    self.drop()
+                    last_time = now
+                action = self.ai_action() if self.ai else KEY_ACTIONS.get(key)
+                if action:
+                    self.apply(action)
+
+            self.render()
+            profiler.frame()
+
+        self.screen.put(self.height//2, self.width, "GAME OVER!")
+        self.screen.present()
+        await rt.sleep(2)
+
+def main(stdscr, ai=None, diff=True, seconds=None, stats=None, seed=None, randomizer="uniform"):
+    if stats is not None:
+        stdscr = CallCounter(stdscr)
+        stats.append(stdscr)
+    game = Tetris(stdscr, ai, diff, seed, randomizer)
+    game.run(seconds)
+    return {"score": game.score, "lines": game.lines, "pieces": game.pieces, "game_over": game.game_over,
+            "board": [row.hex() for row in game.board.colors]}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tetris")
+    parser.add_argument("--ai", action="store_true", help="let the bot play")
+    parser.add_argument("--ai-budget-ms", type=float, default=50.0, help="bot time budget per piece")
+    parser.add_argument("--full-redraw", action="store_true",
+                        help="clear and redraw every frame instead of drawing only changes")
+    parser.add_argument("--seconds", type=float, help="stop after this many seconds")
+    parser.add_argument("--randomizer", choices=RANDOMIZERS, default="uniform",
+                        help="uniform random pieces or shuffled 7-piece bags")
+    parser.add_argument("--render-stats", action="store_true",
+                        help="print curses calls and characters per second on exit")
+    instrument.add_arguments(parser)
+    args = replay.parse_args(parser)
+    profiler.configure(args)
+    ai = None
+    if args.ai:
+        from tetris_ai import TetrisAI
+        ai = TetrisAI(args.ai_budget_ms)
+    stats = [] if args.render_stats else None
+    replay.run(main, args, ai, not args.full_redraw, args.seconds, stats, args.seed, args.randomizer)
+    if ai:
+        print(f"bot: {ai.placements} pieces, avg decision {ai.avg_latency_ms:.2f} ms")
+    if stats:
+        print(f"{'full redraw' if args.full_redraw else 'diff renderer'}: {stats[0].summary()}")
@@ -0,0 +1,192 @@
+"""
+Tetris bot: placement search over the current and next piece.
+
+For every reachable (rotation, column) of the current piece, and then of the
+next piece on the resulting board, the bot scores the final board with a
+feature heuristic (aggregate height, holes, bumpiness, lines cleared).
+Board scores are cached by the board's row bitmasks, so a board reached
+through different placement orders is only scored once. The search is
+anytime: one-ply results are always available and the lookahead stops when
+the per-piece time budget runs out.
+
+    python tetris_ai.py --games 20 --budget-ms 20
+"""
+
+import argparse
+import time
+from collections import namedtuple
+
+from tetris_core import RANDOMIZERS, TetrisCore
+
+Placement = namedtuple("Placement", "rotation x actions score")
+
+# Weights from the well-known genetic-algorithm tuned linear Tetris player
+WEIGHTS = {"height": -0.510066, "lines": 0.760666, "holes": -0.35663, "bumpiness": -0.184483}
+
+
+def spawn_x(width, piece):
+    return width // 2 - piece.rotations[0].width // 2
+
+
+def features(board):
+    """(aggregate height, holes, bumpiness) of a board."""
+    height = board.height
+    heights = [0] * board.width
+    seen = 0
+    holes = 0
+    for y, row in enumerate(board.rows):
+        new = row & ~seen
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = height - y
+            new ^= low
+        holes += bin(seen & ~row).count("1")
+        seen |= row
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    return sum(heights), holes, bumpiness
+
+
+def reachable(board, piece, x0=None):
+    """
+    Yield (rotation, x, actions) for every placement the piece can reach from
+    its spawn by rotating in place (with kicks) and then sliding sideways.
+    actions is a list of "rotate", "left", "right" ending with "drop".
+    """
+    x0 = spawn_x(board.width, piece) if x0 is None else x0
+    x, rotation = x0, 0
+    if board.collides(piece.rotations[0], x, 0):
+        return
+    turns = []
+    for r in range(4):
+        if r:
+            nxt = (rotation + 1) % 4
+            for dx in piece.kicks:
+                if not board.collides(piece.rotations[nxt], x + dx, 0):
+                    x += dx
+                    break
+            else:
+                return
+            rotation = nxt
+            turns.append("rotate")
+        if r not in piece.unique:
+            continue
+        rot = piece.rotations[r]
+        yield r, x, turns + ["drop"]
+        for step, name in ((-1, "left"), (1, "right")):
+            tx = x + step
+            while not board.collides(rot, tx, 0):
+                yield r, tx, turns + [name] * abs(tx - x) + ["drop"]
+                tx += step
+
+
+class TetrisAI:
+    def __init__(self, budget_ms=50.0, lookahead=True, weights=None, cache_size=200_000):
+        self.budget = budget_ms / 1000
+        self.lookahead = lookahead
+        self.weights = dict(WEIGHTS, **(weights or {}))
+        self.cache = {}
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.placements = 0
+        self.total_time = 0.0
+        self.timeouts = 0
+
+    @property
+    def avg_latency_ms(self):
+        return 1000 * self.total_time / self.placements if self.placements else 0.0
+
+    def board_score(self, board):
+        key = tuple(board.rows)
+        score = self.cache.get(key)
+        if score is not None:
+            self.cache_hits += 1
+            return score
+        self.cache_misses += 1
+        height, holes, bumpiness = features(board)
+        w = self.weights
+        score = w["height"] * height + w["holes"] * holes + w["bumpiness"] * bumpiness
+        if len(self.cache) >= self.cache_size:
+            self.cache.clear()
+        self.cache[key] = score
+        return score
+
+    def _after(self, board, piece, rotation, x):
+        rot = piece.rotations[rotation]
+        after = board.copy(colors=False)
+        lines = after.place(rot, x, after.drop_y(rot, x))
+        return after, lines
+
+    def choose(self, board, piece, next_piece=None, x0=None):
+        """Best placement for piece, or None if it cannot even spawn."""
+        start = time.perf_counter()
+        deadline = start + self.budget
+        lines_weight = self.weights["lines"]
+
+        first = []
+        for rotation, x, actions in reachable(board, piece, x0):
+            after, lines = self._after(board, piece, rotation, x)
+            first.append((lines_weight * lines + self.board_score(after), rotation, x, actions, after, lines))
+        if not first:
+            return None
+        first.sort(key=lambda c: c[0], reverse=True)
+        best = first[0]
+        best_score = best[0]
+
+        if self.lookahead and next_piece is not None:
+            best_score = None
+            for score, rotation, x, actions, after, lines in first:
+                if time.perf_counter() > deadline:
+                    self.timeouts += 1
+                    break
+                follow = [lines_weight * l2 + self.board_score(b2)
+                          for b2, l2 in (self._after(after, next_piece, r2, x2)
+                                         for r2, x2, _ in reachable(after, next_piece))]
+                total = lines_weight * lines + (max(follow) if follow else -1e9)
+                if best_score is None or total > best_score:
+                    best, best_score = (score, rotation, x, actions, after, lines), total
+            if best_score is None:
+                best_score = best[0]
+
+        self.placements += 1
+        self.total_time += time.perf_counter() - start
+        return Placement(best[1], best[2], best[3], best_score)
+
+
+def play_headless(ai, seed=None, max_pieces=None, randomizer="uniform"):
+    """Play one game on a TetrisCore without a terminal. Returns the finished core."""
+    game = TetrisCore(seed=seed, randomizer=randomizer)
+    while not game.game_over and (max_pieces is None or game.placed < max_pieces):
+        move = ai.choose(game.board, game.piece, game.next_piece, game.shape_x)
+        for action in (move.actions if move else ["drop"]):
+            game.apply(action)
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Tetris bot headless")
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--max-pieces", type=int, default=2000)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--no-lookahead", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--randomizer", choices=RANDOMIZERS, default="uniform")
+    args = parser.parse_args()
+
+    ai = TetrisAI(args.budget_ms, lookahead=not args.no_lookahead)
+    total_lines = total_pieces = 0
+    start = time.perf_counter()
+    for game in range(args.games):
+        result = play_headless(ai, args.seed + game, args.max_pieces, args.randomizer)
+        total_lines += result.lines
+        total_pieces += result.placed
+        print(f"game {game}: score {result.score}, lines {result.lines}, pieces {result.placed}")
+    elapsed = time.perf_counter() - start
+    lookups = ai.cache_hits + ai.cache_misses
+    print(f"{total_pieces / elapsed:,.1f} placements/s, {total_lines / args.games:.1f} lines per game, "
+          f"avg decision {ai.avg_latency_ms:.2f} ms, {ai.timeouts} over budget, "
+          f"cache hit rate {ai.cache_hits / max(1, lookups):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Headless Tetris rules.
+
+TetrisCore holds the game state and the moves (rotate, move, drop, hard
+drop) with no curses and no clock, so games can be replayed from a seed and
+run without a terminal. The curses Tetris class in tetris.py builds on it.
+
+Pieces come from a seedable generator: "uniform" draws every piece
+independently (what the game always did), "bag" deals shuffled bags of all
+seven pieces.
+"""
+
+import random
+
+from bitboard import PIECES, BitBoard
+
+RANDOMIZERS = ("uniform", "bag")
+ACTIONS = ("left", "right", "down", "rotate", "drop")
+
+
+class UniformGenerator:
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.pieces = list(PIECES.values())
+
+    def __next__(self):
+        return self.rng.choice(self.pieces)
+
+    def __iter__(self):
+        return self
+
+
+class BagGenerator(UniformGenerator):
+    """7-bag: every run of seven pieces contains each piece exactly once."""
+
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self.bag = []
+
+    def __next__(self):
+        if not self.bag:
+            self.bag = self.pieces[:]
+            self.rng.shuffle(self.bag)
+        return self.bag.pop()
+
+
+def make_generator(randomizer="uniform", seed=None):
+    if randomizer == "uniform":
+        return UniformGenerator(seed)
+    if randomizer == "bag":
+        return BagGenerator(seed)
+    raise ValueError(f"unknown randomizer {randomizer!r}, expected one of {', '.join(RANDOMIZERS)}")
+
+
+class TetrisCore:
+    def __init__(self, width=10, height=20, seed=None, randomizer="uniform"):
+        self.height, self.width = height, width
+        self.board = BitBoard(self.width, self.height)
+        self.generator = make_generator(randomizer, seed)
+        self.score = 0
+        self.lines = 0
+        self.pieces = 0  # pieces spawned so far
+        self.placed = 0
+        self.next_piece = self.new_shape()
+        self.spawn(self.new_shape())
+        self.game_over = False
+
+    def new_shape(self):
+        return next(self.generator)
+
+    def spawn(self, piece):
+        self.pieces += 1
+        self.piece = piece
+        self.rotation = 0
+        self.shape_x = self.width // 2 - piece.rotations[0].width // 2
+        self.shape_y = 0
+
+    @property
+    def shape(self):
+        return self.piece.rotations[self.rotation].matrix
+
+    @property
+    def color(self):
+        return self.piece.color
+
+    @property
+    def next_shape(self):
+        return self.next_piece.rotations[0].matrix
+
+    @property
+    def next_color(self):
+        return self.next_piece.color
+
+    def rotate(self):
+        rotation = (self.rotation + 1) % 4
+        for dx in self.piece.kicks:
+            if not self.collision(rotation, dx=dx):
+                self.rotation = rotation
+                self.shape_x += dx
+                return
+
+    def collision(self, rotation=None, dx=0, dy=0):
+        if rotation is None:
+            rotation = self.rotation
+        return self.board.collides(self.piece.rotations[rotation], self.shape_x + dx, self.shape_y + dy)
+
+    def place_shape(self):
+        rot = self.piece.rotations[self.rotation]
+        cleared = self.board.place(rot, self.shape_x, self.shape_y, self.color)
+        self.lines += cleared
+        self.placed += 1
+        self.score += cleared * 100
+        self.spawn(self.next_piece)
+        self.next_piece = self.new_shape()
+        if self.collision():
+            self.game_over = True
+
+    def drop(self):
+        if not self.collision(dy=1):
+            self.shape_y += 1
+        else:
+            self.place_shape()
+
+    def hard_drop(self):
+        self.shape_y = self.board.drop_y(self.piece.rotations[self.rotation], self.shape_x, self.shape_y)
+        self.place_shape()
+
+    def move(self, dx):
+        if not self.collision(dx=dx):
+            self.shape_x += dx
+
+    def apply(self, action):
+        """Apply one of ACTIONS."""
+        if action == "left":
+            self.move(-1)
+        elif action == "right":
+            self.move(1)
+        elif action == "down":
+            self.drop()
+        elif action == "rotate":
+            self.rotate()
+        elif action == "drop":
+            self.hard_drop()
@@ -0,0 +1,236 @@
+"""
+Several snakes on one field, for networked play.
+
+SnakeArena holds the rules. Like SnakeEnv it is headless and advances one
+tick per step(), but every snake moves at once. A snake dies when its head
+hits the wall, a body or another head, and comes back RESPAWN_TICKS later.
+step() returns the tick's events, which are all a client needs to follow the
+game: ArenaReplica applies them to its own copy. encode() and decode()
+pack them into bytes for the network, snapshot() the whole arena for a
+client that joins.
+
+Events are tuples:
+    (MOVED, id, y, x)   the snake's head moved to (y, x) and its tail followed
+    (GREW, id, y, x)    the head moved to (y, x) onto food, and the tail stayed
+    (DIED, id)          the snake is gone until it respawns
+    (SPAWNED, id, cells)
+    (FOOD, y, x)        new food
+    (GONE, id)          the player left
+"""
+
+import random
+import struct
+from collections import deque
+
+from snake_env import DELTAS, RIGHT
+
+MOVED, GREW, DIED, SPAWNED, FOOD, GONE = range(1, 7)
+RESPAWN_TICKS = 10
+START_LENGTH = 3
+SIZES = {MOVED: 4, GREW: 4, DIED: 2, FOOD: 3, GONE: 2}  # encoded bytes of the fixed-size events
+
+
+class Snake:
+    __slots__ = ("cells", "direction", "next_direction", "score", "respawn")
+
+    def __init__(self):
+        self.cells = deque()  # head first
+        self.direction = self.next_direction = RIGHT
+        self.score = 0
+        self.respawn = 0  # tick to respawn at while dead
+
+
+class SnakeArena:
+    def __init__(self, height=20, width=40, seed=None):
+        self.height, self.width = height, width
+        self.rng = random.Random(seed)
+        self.occupied = bytearray(height * width)  # snake cells, walls excluded
+        self.snakes = {}  # id -> Snake
+        self.food = set()
+        self.tick = 0
+        self.pending = []  # events from joins and leaves, sent with the next tick
+
+    def _wall(self, y, x):
+        return y <= 0 or y >= self.height - 1 or x <= 0 or x >= self.width - 1
+
+    def _free(self, y, x):
+        return not self._wall(y, x) and not self.occupied[y * self.width + x] and (y, x) not in self.food
+
+    def add(self, sid):
+        """Add a snake for player sid; it appears with the next tick."""
+        self.snakes[sid] = Snake()
+
+    def remove(self, sid):
+        snake = self.snakes.pop(sid)
+        self._clear(snake)
+        self.pending.append((GONE, sid))
+
+    def turn(self, sid, direction):
+        """Steer at the next tick, ignoring 180° turns."""
+        snake = self.snakes.get(sid)
+        if snake and direction != (snake.direction + 2) % 4:
+            snake.next_direction = direction
+
+    def _clear(self, snake):
+        for y, x in snake.cells:
+            self.occupied[y * self.width + x] = 0
+        snake.cells.clear()
+
+    def _spawn(self, snake):
+        """Place a snake on a free straight run of cells, heading right. False if none was found."""
+        for _ in range(50):
+            y = self.rng.randrange(1, self.height - 1)
+            x = self.rng.randrange(START_LENGTH, self.width - 2)
+            cells = [(y, x - i) for i in range(START_LENGTH)]
+            # keep the cell in front free too, so it does not die at once
+            if all(self._free(cy, cx) for cy, cx in cells + [(y, x + 1)]):
+                snake.cells.extend(cells)
+                for cy, cx in cells:
+                    self.occupied[cy * self.width + cx] = 1
+                snake.direction = snake.next_direction = RIGHT
+                return True
+        return False
+
+    def _place_food(self, events):
+        target = max(1, (len(self.snakes) + 1) // 2)
+        for _ in range(20 * target):
+            if len(self.food) >= target:
+                return
+            y, x = self.rng.randrange(1, self.height - 1), self.rng.randrange(1, self.width - 1)
+            if self._free(y, x):
+                self.food.add((y, x))
+                events.append((FOOD, y, x))
+
+    def snapshot(self):
+        """The field, food and snakes as bytes, for ArenaReplica.from_snapshot."""
+        out = bytearray(struct.pack(">BBIH", self.height, self.width, self.tick, len(self.food)))
+        for cell in self.food:
+            out += bytes(cell)
+        out.append(len(self.snakes))
+        for sid, snake in self.snakes.items():
+            out += struct.pack(">BH", sid, len(snake.cells))
+            for cell in snake.cells:
+                out += bytes(cell)
+        return bytes(out)
+
+    def step(self):
+        """Advance one tick and return its events."""
+        self.tick += 1
+        events, self.pending = self.pending, []
+        width, occupied = self.width, self.occupied
+
+        # where every live snake's head goes; tails that move on free their cell first
+        moves = []
+        heads = {}
+        for sid, snake in self.snakes.items():
+            if not snake.cells:
+                continue
+            snake.direction = snake.next_direction
+            dy, dx = DELTAS[snake.direction]
+            y, x = snake.cells[0]
+            head = (y + dy, x + dx)
+            grow = head in self.food
+            if not grow:
+                ty, tx = snake.cells.pop()
+                occupied[ty * width + tx] = 0
+            moves.append((sid, snake, head, grow))
+            heads[head] = heads.get(head, 0) + 1
+
+        dead = {sid for sid, _, (y, x), _ in moves
+                if self._wall(y, x) or occupied[y * width + x] or heads[y, x] > 1}
+        for sid, snake, (y, x), grow in moves:
+            if sid in dead:
+                snake.respawn = self.tick + RESPAWN_TICKS
+                self._clear(snake)
+                events.append((DIED, sid))
+                continue
+            snake.cells.appendleft((y, x))
+            occupied[y * width + x] = 1
+            if grow:
+                self.food.discard((y, x))
+                snake.score += 1
+            events.append((GREW if grow else MOVED, sid, y, x))
+
+        for sid, snake in self.snakes.items():
+            if not snake.cells and snake.respawn <= self.tick and self._spawn(snake):
+                events.append((SPAWNED, sid, list(snake.cells)))
+        self._place_food(events)
+        return events
+
+
+class ArenaReplica:
+    """A client's copy of an arena, kept up to date from the events."""
+
+    def __init__(self, height, width, snakes=None, food=()):
+        self.height, self.width = height, width
+        self.snakes = {sid: deque(cells) for sid, cells in (snakes or {}).items()}  # id -> cells, head first
+        self.food = set(food)
+        self.tick = 0
+
+    def apply(self, events):
+        for event in events:
+            kind = event[0]
+            if kind == MOVED or kind == GREW:
+                _, sid, y, x = event
+                cells = self.snakes.setdefault(sid, deque())
+                cells.appendleft((y, x))
+                if kind == MOVED:
+                    cells.pop()
+                else:
+                    self.food.discard((y, x))
+            elif kind == DIED:
+                self.snakes[event[1]] = deque()
+            elif kind == SPAWNED:
+                self.snakes[event[1]] = deque(event[2])
+            elif kind == FOOD:
+                self.food.add(event[1:])
+            elif kind == GONE:
+                self.snakes.pop(event[1], None)
+
+    @classmethod
+    def from_snapshot(cls, data):
+        height, width, tick, n = struct.unpack_from(">BBIH", data)
+        i = 8
+        food = _cells(data, i, n)
+        i += 2 * n
+        snakes = {}
+        for _ in range(data[i]):
+            sid, n = struct.unpack_from(">BH", data, i + 1)
+            snakes[sid] = _cells(data, i + 4, n)
+            i += 3 + 2 * n
+        replica = cls(height, width, snakes, food)
+        replica.tick = tick
+        return replica
+
+
+def _cells(data, start, n):
+    return [(data[j], data[j + 1]) for j in range(start, start + 2 * n, 2)]
+
+
+def encode(events):
+    """Pack events into bytes: a kind byte and one byte per number."""
+    out = bytearray()
+    for event in events:
+        if event[0] == SPAWNED:
+            _, sid, cells = event
+            out += bytes((SPAWNED, sid, len(cells)))
+            for cell in cells:
+                out += bytes(cell)
+        else:
+            out += bytes(event)
+    return bytes(out)
+
+
+def decode(data):
+    events = []
+    i = 0
+    while i < len(data):
+        kind = data[i]
+        if kind == SPAWNED:
+            n = data[i + 2]
+            events.append((SPAWNED, data[i + 1], _cells(data, i + 3, n)))
+            i += 3 + 2 * n
+        else:
+            events.append(tuple(data[i:i + SIZES[kind]]))
+            i += SIZES[kind]
+    return events
@@ -0,0 +1,340 @@
+"""
+Autopilot agents for snake.
+
+Every agent exposes act(env) -> direction for a SnakeEnv and keeps its own
+decision-latency statistics. Plans are reused between ticks: a path is only
+searched again when the food moves or the planned cell is no longer free,
+and the Hamiltonian cycle is built once per board size.
+
+    python autopilot.py --agent hamilton --games 20
+"""
+
+import argparse
+import heapq
+import random
+import time
+from collections import deque
+from functools import lru_cache
+
+from snake_env import DELTAS, SnakeEnv
+
+# How many node expansions between time-budget checks during a search
+_CHECK_EVERY = 256
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def _direction(a, b):
+    return DELTAS.index((b[0] - a[0], b[1] - a[1]))
+
+
+def _neighbours(cell):
+    y, x = cell
+    return [(y + dy, x + dx) for dy, dx in DELTAS]
+
+
+class Agent:
+    """Base class: times every decision and falls back to a safe move when over budget."""
+
+    name = "agent"
+
+    def __init__(self, budget_ms=5.0):
+        self.budget = budget_ms / 1000
+        self.decisions = 0
+        self.total_time = 0.0
+        self.timeouts = 0
+        self.reset()
+
+    @property
+    def avg_latency_ms(self):
+        return 1000 * self.total_time / self.decisions if self.decisions else 0.0
+
+    def reset(self):
+        """Forget cached plans; called when a new game starts."""
+
+    def act(self, env):
+        start = time.perf_counter()
+        self.deadline = start + self.budget
+        try:
+            direction = self.decide(env)
+        except SearchTimeout:
+            self.timeouts += 1
+            direction = self.fallback(env)
+        self.total_time += time.perf_counter() - start
+        self.decisions += 1
+        return direction
+
+    def check_time(self):
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+    def decide(self, env):
+        raise NotImplementedError
+
+    def fallback(self, env):
+        """Keep going straight if that is safe, else take any free neighbour."""
+        options = [env.direction] + [d for d in range(4) if d != env.direction]
+        for d in options:
+            if d != (env.direction + 2) % 4 and not env.is_blocked(env.next_head(d)):
+                return d
+        return env.direction
+
+    def bfs(self, env, start, goal, blocked):
+        """Shortest path from start to goal (start excluded), or None."""
+        prev = {start: None}
+        queue = deque([start])
+        expanded = 0
+        while queue:
+            cell = queue.popleft()
+            expanded += 1
+            if expanded % _CHECK_EVERY == 0:
+                self.check_time()
+            for n in _neighbours(cell):
+                if n in prev:
+                    continue
+                if n == goal:
+                    path = [n]
+                    while cell != start:
+                        path.append(cell)
+                        cell = prev[cell]
+                    return path[::-1]
+                if not blocked(n):
+                    prev[n] = cell
+                    queue.append(n)
+        return None
+
+
+class GreedyAgent(Agent):
+    """Shortest path to the food, replanned only when the plan goes stale."""
+
+    name = "greedy"
+
+    def reset(self):
+        self.path = []
+        self.target = None
+
+    def decide(self, env):
+        if self.target != env.food or not self.path or env.is_blocked(self.path[0]):
+            self.target = env.food
+            self.path = self.bfs(env, env.head, env.food, env.is_blocked) or []
+        if not self.path:
+            return self.fallback(env)
+        return _direction(env.head, self.path.pop(0))
+
+
+class AStarAgent(Agent):
+    """
+    A* to the food, taken only if the snake can still reach its tail after
+    eating; otherwise it chases its tail, and as a last resort moves to the
+    neighbour with the most reachable space.
+    """
+
+    name = "astar"
+
+    def reset(self):
+        self.path = []
+        self.target = None
+
+    def astar(self, env, start, goal, blocked):
+        gy, gx = goal
+        prev = {start: None}
+        cost = {start: 0}
+        heap = [(abs(start[0] - gy) + abs(start[1] - gx), 0, start)]
+        expanded = 0
+        while heap:
+            _, g, cell = heapq.heappop(heap)
+            if cell == goal:
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = prev[cell]
+                return path[::-1]
+            if g > cost[cell]:
+                continue
+            expanded += 1
+            if expanded % _CHECK_EVERY == 0:
+                self.check_time()
+            for n in _neighbours(cell):
+                if (n == goal or not blocked(n)) and g + 1 < cost.get(n, g + 2):
+                    cost[n] = g + 1
+                    prev[n] = cell
+                    heapq.heappush(heap, (g + 1 + abs(n[0] - gy) + abs(n[1] - gx), g + 1, n))
+        return None
+
+    def _walls(self, env):
+        h, w = env.height, env.width
+        return lambda c: c[0] <= 0 or c[0] >= h - 1 or c[1] <= 0 or c[1] >= w - 1
+
+    def _safe_after(self, env, path):
+        """Simulate following path to the food and check the tail is reachable."""
+        body = list(env.body)
+        virtual = (path[::-1] + body)[:len(body) + 1]
+        occupied = set(virtual)
+        wall = self._walls(env)
+        return self.bfs(env, virtual[0], virtual[-1],
+                        lambda c: wall(c) or c in occupied) is not None
+
+    def _space(self, env, start, limit):
+        seen = {start}
+        queue = deque([start])
+        while queue and len(seen) < limit:
+            self.check_time()
+            for n in _neighbours(queue.popleft()):
+                if n not in seen and not env.is_blocked(n):
+                    seen.add(n)
+                    queue.append(n)
+        return len(seen)
+
+    def decide(self, env):
+        if self.path and self.target == env.food and not env.is_blocked(self.path[0]):
+            return _direction(env.head, self.path.pop(0))
+
+        self.target = env.food
+        self.path = []
+        path = self.astar(env, env.head, env.food, env.is_blocked)
+        if path and self._safe_after(env, path):
+            self.path = path
+            return _direction(env.head, self.path.pop(0))
+
+        tail = env.body.tail
+        if len(env.body) > 1:
+            to_tail = self.bfs(env, env.head, tail, env.is_blocked)
+            if to_tail and len(to_tail) > 1:
+                return _direction(env.head, to_tail[0])
+
+        best, best_space = None, -1
+        for d in range(4):
+            cell = env.next_head(d)
+            if d == (env.direction + 2) % 4 or env.is_blocked(cell):
+                continue
+            space = self._space(env, cell, len(env.body) * 2)
+            if space > best_space:
+                best, best_space = d, space
+        return best if best is not None else self.fallback(env)
+
+
+@lru_cache(maxsize=None)
+def hamiltonian_cycle(height, width):
+    """
+    A cycle through every field cell of a height x width board, as a list of
+    (y, x). One of the field dimensions (height - 2, width - 2) must be even.
+    """
+    if (height - 2) % 2:
+        if (width - 2) % 2:
+            raise ValueError(f"no Hamiltonian cycle on a {height}x{width} board")
+        return [(y, x) for x, y in hamiltonian_cycle(width, height)]
+    path = [(1, x) for x in range(1, width - 1)]
+    for i, y in enumerate(range(2, height - 1)):
+        xs = range(width - 2, 1, -1) if i % 2 == 0 else range(2, width - 1)
+        path.extend((y, x) for x in xs)
+    path.extend((y, 1) for y in range(height - 2, 1, -1))
+    return path
+
+
+class HamiltonianAgent(AStarAgent):
+    """
+    Follows a precomputed Hamiltonian cycle, which can never trap the snake,
+    and takes shortcuts towards the food while the snake stays ahead of its
+    tail in cycle order. Plays as AStarAgent on a board without a cycle
+    (both field dimensions odd), such as a terminal of the wrong size.
+    """
+
+    name = "hamilton"
+
+    def __init__(self, budget_ms=5.0, shortcut_fill=0.5):
+        super().__init__(budget_ms)
+        self.shortcut_fill = shortcut_fill
+        self.board = None
+
+    def _prepare(self, env):
+        self.board = (env.height, env.width)
+        try:
+            cycle = hamiltonian_cycle(env.height, env.width)
+        except ValueError:
+            self.cycle = None
+            return
+        start = env.body.cells
+        # orient the cycle so the starting snake already runs along it
+        if len(start) > 1 and cycle.index(start[0]) != (cycle.index(start[1]) + 1) % len(cycle):
+            cycle = cycle[::-1]
+        self.cycle = cycle
+        self.order = {cell: i for i, cell in enumerate(cycle)}
+
+    def decide(self, env):
+        if self.board != (env.height, env.width):
+            self._prepare(env)
+        if self.cycle is None:
+            return super().decide(env)
+        n = len(self.cycle)
+        order = self.order
+        head = env.head
+        ahead = lambda cell: (order[cell] - order[head]) % n
+
+        step = self.cycle[(order[head] + 1) % n]
+        if len(env.body) < self.shortcut_fill * n and env.food is not None:
+            to_tail = ahead(env.body.tail)
+            to_food = ahead(env.food)
+            # leave room for the growth still to come
+            limit = to_tail - len(env.body) // 4 - 3
+            best = ahead(step)
+            for cell in _neighbours(head):
+                if cell in order and not env.is_blocked(cell):
+                    d = ahead(cell)
+                    if best < d <= min(to_food, limit):
+                        step, best = cell, d
+        return _direction(head, step)
+
+
+AGENTS = {cls.name: cls for cls in (GreedyAgent, AStarAgent, HamiltonianAgent)}
+
+
+def play(agent, env, seed=None, stall_limit=None):
+    """
+    Play one headless game and return the env in its final state. The game
+    is cut short if the agent goes stall_limit steps without eating.
+    """
+    env.reset(seed)
+    agent.reset()
+    stall_limit = stall_limit or 2 * env.height * env.width
+    last_meal = 0
+    while not env.done and env.steps - last_meal < stall_limit:
+        reward, _ = env.step(agent.act(env))
+        if reward > 0:
+            last_meal = env.steps
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a snake autopilot headless")
+    parser.add_argument("--agent", choices=AGENTS, default="astar")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--height", type=int, default=20)
+    parser.add_argument("--width", type=int, default=40)
+    parser.add_argument("--budget-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.agent == "hamilton" and (args.height - 2) % 2 and (args.width - 2) % 2:
+        parser.error("hamilton needs an even field dimension (--height or --width minus the 2 walls)")
+
+    agent = AGENTS[args.agent](args.budget_ms)
+    env = SnakeEnv(args.height, args.width)
+    rng = random.Random(args.seed)
+    scores, steps, wins = [], 0, 0
+    start = time.perf_counter()
+    for _ in range(args.games):
+        play(agent, env, rng.getrandbits(32))
+        scores.append(env.score)
+        steps += env.steps
+        wins += env.won
+    elapsed = time.perf_counter() - start
+
+    print(f"agent={agent.name} games={args.games} wins={wins} "
+          f"avg score={sum(scores) / len(scores):.1f} max score={max(scores)}")
+    print(f"{steps} steps in {elapsed:.2f}s ({steps / elapsed:,.0f} steps/s), "
+          f"avg decision {agent.avg_latency_ms:.3f} ms, {agent.timeouts} over budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,33 @@
+import argparse
 import curses
+import os
 import random
+import sys
 import time
 
+from entities import EntityStore
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from terminalgames import instrument, replay, runtime
+from terminalgames.instrument import profiler
+from terminalgames.render import Screen
+
 # Game config
 FPS = 20
 PLAYER_EMOJI = "🟦"
 APPLE_EMOJI = "🍎"
 ENEMY_EMOJI = "🍌"
 SPEED = 1  # lower is faster
+MAX_CATCH_UP = 5  # most game updates run in one frame after a stall
 COLORS = [curses.COLOR_BLACK, curses.COLOR_BLUE, curses.COLOR_GREEN,
           curses.COLOR_YELLOW, curses.COLOR_MAGENTA, curses.COLOR_RED, curses.COLOR_CYAN]
 
-def main(stdscr):
+def main(stdscr, stress=0):
+    return runtime.run(stdscr, play, stress)
+
+async def play(rt, stress=0):
+    stdscr = rt.win
     curses.curs_set(0)
-    stdscr.nodelay(True)
     stdscr.keypad(True)
     curses.start_color()
     
@@ -24,8 +38,8 @@ def main(stdscr):
     height, width = stdscr.getmaxyx()
     player_x, player_y = width // 2, height // 2
 
-    apples = []
-    enemies = []
+    apples = EntityStore(height, width)
+    enemies = EntityStore(height, width)
 
     score = 0
     level = 100
@@ -34,100 +48,137 @@ def main(stdscr):
 
     keys_down = set()
 
-    frame_delay = 1000 // FPS  # milliseconds per frame
+    frame_ms = 0.0  # how long the last frame took, for stress mode
+    screen = Screen(stdscr)
 
     def spawn_apple():
         if random.randint(1, 100) == 1:
-            apples.append([random.randint(1, height - 2), random.randint(1, width - 2)])
+            apples.add(random.randint(1, height - 2), random.randint(1, width - 2))
 
     def spawn_enemy():
         if random.randint(1, level) == 1:
-            enemies.append([0, random.randint(1, width - 2)])
+            enemies.add(0, random.randint(1, width - 2))
+        # stress mode: flood the screen with extra enemies
+        for _ in range(stress):
+            enemies.add(0, random.randint(1, width - 2))
 
+    @profiler.timed("render")
     def draw():
-        stdscr.clear()
-        stdscr.bkgd(' ', curses.color_pair(color_index))
+        attr = curses.color_pair(color_index)
+        # the background only changes colour with the level
+        screen.layer("background", lambda canvas: canvas.fill(0, 0, height, width, " ", attr), key=color_index)
+        screen.begin()
         # draw apples
         for ay, ax in apples:
-            stdscr.addstr(ay, ax, APPLE_EMOJI)
+            screen.put(ay, ax, APPLE_EMOJI, attr)
         # draw enemies
         for ey, ex in enemies:
-            stdscr.addstr(ey, ex, ENEMY_EMOJI)
+            screen.put(ey, ex, ENEMY_EMOJI, attr)
         # draw player
-        stdscr.addstr(player_y, player_x, PLAYER_EMOJI)
+        screen.put(player_y, player_x, PLAYER_EMOJI, attr)
         # score
-        stdscr.addstr(0, 2, f"Score: {score}  Level: {level}")
-        stdscr.refresh()
+        hud = f"Score: {score}  Level: {level}"
+        if stress:
+            hud += f"  Enemies: {len(enemies)}  Frame: {frame_ms:.1f} ms"
+        screen.put(0, 2, hud, attr)
+        profiler.draw(screen)
+        screen.present()
+
+    def state(over):
+        return {"score": score, "level": level, "player": [player_y, player_x],
+                "apples": sorted(apples), "enemies": sorted(enemies), "over": over}
+
+    profiler.watch("addstr", lambda: screen.calls)
+    step = 1 / FPS  # seconds per game update
+    previous = time.monotonic()
+    accumulator = 0.0
 
     while True:
-        start_time = time.time() * 1000  # milliseconds
+        frame_start = time.monotonic()
+        accumulator += frame_start - previous
+        previous = frame_start
 
-        # Input handling
-        try:
-            while True:  # read all keys pressed this frame
+        # Input handling: drain every key pressed since the last frame, once
+        with profiler.span("input"):
+            while True:
                 key = stdscr.getch()
                 if key == -1:
                     break
-                keys_down.add(key)
-        except:
-            pass
+                if key in [ord('q'), ord('Q')]:
+                    return state(False)
+                if key in [27, 10]:  # Esc or Enter
+                    loop_on = not loop_on
+                    if not loop_on:
+                        screen.put(height // 2, width // 2 - 3, "⏸ PAUSE ⏸", curses.color_pair(color_index))
+                        screen.present()
+                elif key in [ord('p'), ord('P')]:
+                    profiler.toggle()
+                else:
+                    keys_down.add(key)
 
+        updates = dropped = 0
         if loop_on:
-            # Player movement
-            if curses.KEY_UP in keys_down: player_y = max(1, player_y - 1)
-            if curses.KEY_DOWN in keys_down: player_y = min(height - 2, player_y + 1)
-            if curses.KEY_LEFT in keys_down: player_x = max(1, player_x - 1)
-            if curses.KEY_RIGHT in keys_down: player_x = min(width - 2, player_x + 1)
-            if ord('q') in keys_down or ord('Q') in keys_down:
-                break
-
-            keys_down.clear()
-
-            # Spawn apples and enemies
-            spawn_apple()
-            spawn_enemy()
-
-            # Move enemies
-            for e in enemies:
-                e[0] += 1
-
-            # Collision detection: apples
-            new_apples = []
-            for a in apples:
-                if [player_y, player_x] == a:
-                    score += 1
-                    if score % 10 == 0 and level > 10:
-                        level -= 1
-                        color_index = min(color_index + 1, len(COLORS))
-                else:
-                    new_apples.append(a)
-            apples = new_apples
+            # Fixed timestep: run as many updates as the clock asks for, up
+            # to MAX_CATCH_UP, and drop the rest of the backlog
+            with profiler.span("update"):
+                while accumulator >= step and updates < MAX_CATCH_UP:
+                    accumulator -= step
+                    updates += 1
+
+                    # Player movement
+                    if curses.KEY_UP in keys_down: player_y = max(1, player_y - 1)
+                    if curses.KEY_DOWN in keys_down: player_y = min(height - 2, player_y + 1)
+                    if curses.KEY_LEFT in keys_down: player_x = max(1, player_x - 1)
+                    if curses.KEY_RIGHT in keys_down: player_x = min(width - 2, player_x + 1)
+                    keys_down.clear()
+
+                    # Spawn apples and enemies
+                    spawn_apple()
+                    spawn_enemy()
+
+                    # Move enemies, removing those that leave the screen
+                    enemies.fall(1, height - 1)
+
+                    # Collision detection: apples
+                    for _ in range(apples.remove_at(player_y, player_x)):
+                        score += 1
+                        if score % 10 == 0 and level > 10:
+                            level -= 1
+                            color_index = min(color_index + 1, len(COLORS))
+
+                    # Collision detection: enemies (the player can't die in stress mode)
+                    if enemies.any_at(player_y, player_x) and not stress:
+                        screen.put(height // 2, width // 2 - 5, "💀 GAME OVER 💀", curses.color_pair(color_index))
+                        screen.present()
+                        await rt.sleep(2)
+                        return state(True)
+            if accumulator >= step:
+                dropped = int(accumulator // step)
+                accumulator -= dropped * step
 
-            # Collision detection: enemies
-            for e in enemies:
-                if [player_y, player_x] == e:
-                    stdscr.addstr(height // 2, width // 2 - 5, "💀 GAME OVER 💀")
-                    stdscr.refresh()
-                    time.sleep(2)
-                    return
+            # Draw everything
+            if updates:
+                draw()
+        else:
+            accumulator = 0.0
 
-            # Remove enemies off-screen
-            enemies = [e for e in enemies if e[0] < height - 1]
+        frame_ms = (time.monotonic() - frame_start) * 1000
+        profiler.count("updates", updates)
+        profiler.count("dropped", dropped)
+        profiler.frame()
 
-            # Draw everything
-            draw()
-
-        # Pause toggle
-        key = stdscr.getch()
-        if key in [27, 10]:  # Esc or Enter
-            loop_on = not loop_on
-            if not loop_on:
-                stdscr.addstr(height // 2, width // 2 - 3, "⏸ PAUSE ⏸")
-                stdscr.refresh()
-            time.sleep(0.1)
-
-        # Maintain fixed FPS
-        elapsed = time.time() * 1000 - start_time
-        curses.napms(max(0, frame_delay - int(elapsed)))
-
-curses.wrapper(main)
+        # Sleep until the next update is due or a key arrives; while paused, until a key arrives
+        if loop_on:
+            await rt.wait(max(0.0, step - accumulator - (time.monotonic() - previous)))
+        else:
+            await rt.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Emoji Collect Game")
+    parser.add_argument("--stress", type=int, default=0, metavar="N",
+                        help="spawn N extra enemies per frame and show frame time")
+    instrument.add_arguments(parser)
+    args = replay.parse_args(parser)
+    profiler.configure(args)
+    replay.run(main, args, args.stress)
@@ -0,0 +1,62 @@
+"""
+Benchmark snake movement and collision checks on large, nearly full boards.
+
+Compares the old list-of-lists body (linear `in` scan, insert(0, ...)) with
+SnakeBody. The snake walks a serpentine cycle that covers the whole field,
+so it never dies and its length stays fixed.
+
+    python bench_snake.py --sizes 40 100 200 --fill 0.9
+"""
+
+import argparse
+import time
+
+from autopilot import hamiltonian_cycle
+from body import SnakeBody
+
+
+def bench_list(cycle, length, ticks):
+    snake = [list(c) for c in cycle[:length]][::-1]
+    n = len(cycle)
+    start = time.perf_counter()
+    for t in range(ticks):
+        new_head = list(cycle[(length + t) % n])
+        if new_head in snake:
+            raise AssertionError("collision")
+        snake.insert(0, new_head)
+        snake.pop()
+    return time.perf_counter() - start
+
+
+def bench_body(cycle, length, ticks, height, width):
+    snake = SnakeBody(cycle[:length][::-1], height, width)
+    n = len(cycle)
+    start = time.perf_counter()
+    for t in range(ticks):
+        new_head = cycle[(length + t) % n]
+        if new_head in snake:
+            raise AssertionError("collision")
+        snake.move(new_head)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[40, 100, 200])
+    parser.add_argument("--fill", type=float, default=0.9, help="fraction of the field covered by the snake")
+    parser.add_argument("--ticks", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'board':>10}{'length':>9}{'list ticks/s':>15}{'deque ticks/s':>15}{'speedup':>9}")
+    for size in args.sizes:
+        height = width = size + (size % 2)
+        cycle = hamiltonian_cycle(height, width)
+        length = int(len(cycle) * args.fill)
+        old = bench_list(cycle, length, args.ticks)
+        new = bench_body(cycle, length, args.ticks, height, width)
+        print(f"{f'{height}x{width}':>10}{length:>9}{args.ticks / old:>15.0f}"
+              f"{args.ticks / new:>15.0f}{old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
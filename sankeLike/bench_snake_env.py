@@ -0,0 +1,52 @@
+"""
+Benchmark headless snake throughput: SnakeEnv one game at a time versus
+VecSnakeEnv advancing many games per call (needs NumPy).
+
+    python bench_snake_env.py --games 1024 4096 --steps 500
+"""
+
+import argparse
+import random
+import time
+
+from snake_env import SnakeEnv
+
+
+def bench_env(steps, seed):
+    env = SnakeEnv()
+    rng = random.Random(seed)
+    env.reset(seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, done = env.step(rng.randrange(4))
+        if done:
+            env.reset(rng.random())
+    return steps / (time.perf_counter() - start)
+
+
+def bench_vec(games, steps, seed):
+    import numpy as np
+    from vecsnake import VecSnakeEnv
+
+    env = VecSnakeEnv(games, seed=seed)
+    actions = np.random.default_rng(seed).integers(0, 4, (steps, games))
+    start = time.perf_counter()
+    for t in range(steps):
+        env.step(actions[t])
+    return games * steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, nargs="+", default=[1, 256, 4096])
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"SnakeEnv          {bench_env(args.steps * 100, args.seed):>14,.0f} steps/s")
+    for games in args.games:
+        print(f"VecSnakeEnv {games:>5} {bench_vec(games, args.steps, args.seed):>14,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Snake body model with O(1) movement, growth and collision checks.
+
+The body is a deque of (y, x) tuples, head first, backed by a bytearray
+occupancy grid. The free cells of the playing field are kept in a list with
+a reverse index, so food can be placed on a random free cell in O(1).
+"""
+
+import random
+from array import array
+from collections import deque
+
+
+class SnakeBody:
+    """The snake on a height x width window whose outer ring is the border."""
+
+    __slots__ = ("height", "width", "cells", "occupied", "_free", "_free_pos")
+
+    def __init__(self, cells, height, width):
+        self.height = height
+        self.width = width
+        self.cells = deque()
+        self.occupied = bytearray(height * width)
+        self._free = [y * width + x for y in range(1, height - 1) for x in range(1, width - 1)]
+        self._free_pos = array("i", [-1]) * (height * width)
+        for i, idx in enumerate(self._free):
+            self._free_pos[idx] = i
+        for y, x in cells:
+            self.cells.append((y, x))
+            self._take(y * width + x)
+
+    def _take(self, idx):
+        self.occupied[idx] = 1
+        i = self._free_pos[idx]
+        if i >= 0:
+            # swap-remove from the free list
+            last = self._free.pop()
+            if last != idx:
+                self._free[i] = last
+                self._free_pos[last] = i
+            self._free_pos[idx] = -1
+
+    def _release(self, idx):
+        self.occupied[idx] = 0
+        self._free_pos[idx] = len(self._free)
+        self._free.append(idx)
+
+    @property
+    def head(self):
+        return self.cells[0]
+
+    @property
+    def tail(self):
+        return self.cells[-1]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __contains__(self, cell):
+        y, x = cell
+        return 0 <= y < self.height and 0 <= x < self.width and self.occupied[y * self.width + x] == 1
+
+    def move(self, new_head, grow=False):
+        """Push new_head; drop the tail unless growing. Returns the dropped tail or None."""
+        tail = None
+        if not grow:
+            tail = self.cells.pop()
+            self._release(tail[0] * self.width + tail[1])
+        self.cells.appendleft(new_head)
+        self._take(new_head[0] * self.width + new_head[1])
+        return tail
+
+    def free_count(self):
+        return len(self._free)
+
+    def random_free_cell(self, rng=random):
+        """A random cell not covered by the snake, or None if the field is full."""
+        if not self._free:
+            return None
+        idx = self._free[rng.randrange(len(self._free))]
+        return idx // self.width, idx % self.width
@@ -0,0 +1,96 @@
+"""
+Compact entity storage with a per-cell spatial index.
+
+Positions live in parallel arrays and every cell of the screen heads an
+intrusive doubly linked list of the entities standing on it, so "is there
+anything at (y, x)" is a single array read, and adding, removing and moving
+entities are O(1) without allocating per frame.
+"""
+
+from array import array
+
+
+class EntityStore:
+    __slots__ = ("height", "width", "ys", "xs", "_head", "_next", "_prev")
+
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.ys = array("i")
+        self.xs = array("i")
+        self._head = array("i", [-1]) * (height * width)
+        self._next = array("i")
+        self._prev = array("i")
+
+    def __len__(self):
+        return len(self.ys)
+
+    def __iter__(self):
+        return zip(self.ys, self.xs)
+
+    def _link(self, i, cell):
+        first = self._head[cell]
+        self._next[i] = first
+        self._prev[i] = -1
+        if first >= 0:
+            self._prev[first] = i
+        self._head[cell] = i
+
+    def _unlink(self, i, cell):
+        p, n = self._prev[i], self._next[i]
+        if p >= 0:
+            self._next[p] = n
+        else:
+            self._head[cell] = n
+        if n >= 0:
+            self._prev[n] = p
+
+    def add(self, y, x):
+        i = len(self.ys)
+        self.ys.append(y)
+        self.xs.append(x)
+        self._next.append(-1)
+        self._prev.append(-1)
+        self._link(i, y * self.width + x)
+        return i
+
+    def remove(self, i):
+        """Remove entity i; the last entity takes its index."""
+        w = self.width
+        self._unlink(i, self.ys[i] * w + self.xs[i])
+        last = len(self.ys) - 1
+        if i != last:
+            y, x = self.ys[last], self.xs[last]
+            self._unlink(last, y * w + x)
+            self.ys[i], self.xs[i] = y, x
+            self._link(i, y * w + x)
+        self.ys.pop()
+        self.xs.pop()
+        self._next.pop()
+        self._prev.pop()
+
+    def any_at(self, y, x):
+        return self._head[y * self.width + x] >= 0
+
+    def remove_at(self, y, x):
+        """Remove every entity on (y, x) and return how many there were."""
+        cell = y * self.width + x
+        count = 0
+        while self._head[cell] >= 0:
+            self.remove(self._head[cell])
+            count += 1
+        return count
+
+    def fall(self, dy, limit):
+        """Move every entity dy rows down, dropping those that reach row limit."""
+        w = self.width
+        ys, xs = self.ys, self.xs
+        # walk backwards so swap-remove only moves already-visited entities
+        for i in range(len(ys) - 1, -1, -1):
+            y = ys[i]
+            if y + dy >= limit:
+                self.remove(i)
+                continue
+            self._unlink(i, y * w + xs[i])
+            ys[i] = y + dy
+            self._link(i, (y + dy) * w + xs[i])
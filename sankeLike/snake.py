@@ -1,10 +1,25 @@
+import argparse
+import asyncio
 import curses
-import random
+import os
+import sys
 import time
 
-def main(stdscr):
+import arena
+from autopilot import AGENTS
+from snake_env import DOWN, LEFT, RIGHT, UP, SnakeEnv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from terminalgames import instrument, protocol, replay, runtime
+from terminalgames.instrument import profiler
+from terminalgames.render import Screen, text_width
+
+def main(stdscr, agent=None, seed=None):
+    return runtime.run(stdscr, play, agent, seed)
+
+async def play(rt, agent=None, seed=None):
+    stdscr = rt.win
     curses.curs_set(0)
-    stdscr.nodelay(True)
     stdscr.keypad(True)
     curses.start_color()
     curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
@@ -12,76 +27,154 @@ def main(stdscr):
     curses.init_pair(3, curses.COLOR_YELLOW, curses.COLOR_BLACK)
 
     height, width = 20, 40
-    win = curses.newwin(height, width, 1, 1)
-    win.keypad(True)
-    win.timeout(150)
+    top, left = 1, 1  # where the board sits on the screen
+    screen = Screen(stdscr)
+    screen.layer("border", lambda canvas: canvas.box(top, left, height, width))
 
-    # initial snake and food
-    snake = [[height//2, width//4 + i] for i in range(3)][::-1]
-    direction = curses.KEY_RIGHT
-    food = [random.randint(1, height - 2), random.randint(1, width - 2)]
-    score = 0
+    env = SnakeEnv(height, width, seed)
+    key_actions = {curses.KEY_UP: UP, curses.KEY_DOWN: DOWN,
+                   curses.KEY_LEFT: LEFT, curses.KEY_RIGHT: RIGHT}
 
+    profiler.watch("addstr", lambda: screen.calls)
     while True:
-        win.clear()
-        win.border()
-
-        # Draw food
-        win.addstr(food[0], food[1], "🍎", curses.color_pair(2))
-
-        # Draw snake
-        for y, x in snake:
-            win.addstr(y, x, "█", curses.color_pair(1))
-
-        # Score
-        win.addstr(0, 2, f" Score: {score} ", curses.color_pair(3))
-
-        # Input
-        key = win.getch()
-        if key in [curses.KEY_UP, curses.KEY_DOWN, curses.KEY_LEFT, curses.KEY_RIGHT]:
-            # Prevent 180° turns
-            if (key == curses.KEY_UP and direction != curses.KEY_DOWN) or \
-               (key == curses.KEY_DOWN and direction != curses.KEY_UP) or \
-               (key == curses.KEY_LEFT and direction != curses.KEY_RIGHT) or \
-               (key == curses.KEY_RIGHT and direction != curses.KEY_LEFT):
-                direction = key
-        elif key in [ord('q'), ord('Q')]:
+        with profiler.span("render"):
+            screen.begin()
+
+            # Draw food
+            screen.put(top + env.food[0], left + env.food[1], "🍎", curses.color_pair(2))
+
+            # Draw snake
+            for y, x in env.body:
+                screen.put(top + y, left + x, "█", curses.color_pair(1))
+
+            # Score
+            status = f" Score: {env.score} "
+            if agent:
+                status += f"| {agent.name} {agent.avg_latency_ms:.2f} ms "
+            screen.put(top, left + 2, status, curses.color_pair(3))
+            profiler.draw(screen)
+            screen.present()
+
+        # Input; a key ends the tick early
+        with profiler.span("input"):
+            deadline = time.monotonic() + env.tick_ms / 1000
+            key = -1
+            while key == -1:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                key = await rt.key(remaining)
+        if key in [ord('q'), ord('Q')]:
             break
+        if key in [ord('p'), ord('P')]:
+            profiler.toggle()
 
-        # Next head position
-        head_y, head_x = snake[0]
-        if direction == curses.KEY_UP:
-            head_y -= 1
-        elif direction == curses.KEY_DOWN:
-            head_y += 1
-        elif direction == curses.KEY_LEFT:
-            head_x -= 1
-        elif direction == curses.KEY_RIGHT:
-            head_x += 1
-
-        new_head = [head_y, head_x]
-
-        # Collision check
-        if (new_head in snake or
-            head_y == 0 or head_y == height - 1 or
-            head_x == 0 or head_x == width - 1):
-            win.clear()
-            msg = f"💀 Game Over! Score: {score}"
-            win.addstr(height // 2, (width - len(msg)) // 2, msg, curses.color_pair(2))
-            win.refresh()
-            time.sleep(2)
+        # Advance the game; 180° turns are ignored by the env
+        with profiler.span("update"):
+            action = agent.act(env) if agent else key_actions.get(key)
+            reward, done = env.step(action)
+        profiler.frame()
+        if done:
+            screen.drop_layer("border")
+            screen.begin()
+            if env.won:
+                msg = f"🏆 You filled the board! Score: {env.score}"
+            else:
+                msg = f"💀 Game Over! Score: {env.score}"
+            screen.put(top + height // 2, left + (width - text_width(msg)) // 2, msg, curses.color_pair(2))
+            screen.present()
+            await rt.sleep(2)
             break
 
-        snake.insert(0, new_head)
+    return {"score": env.score, "steps": env.steps, "done": env.done, "won": env.won,
+            "body": list(env.body), "food": env.food}
+
+def main_online(stdscr, address, room):
+    return runtime.run(stdscr, play_online, *protocol.parse_address(address), room)
+
+async def play_online(rt, host, port, room):
+    """Play in a room on a game server (terminalgames/server.py) with everyone else in it."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(protocol.join(protocol.SNAKE, room))
+    kind, body = await protocol.read(reader)
+    if kind == protocol.ERROR:
+        raise SystemExit(f"server: {body.decode()}")
+    _, me, snapshot = protocol.parse_welcome(body)
+    field = arena.ArenaReplica.from_snapshot(snapshot)
+
+    stdscr = rt.win
+    curses.curs_set(0)
+    stdscr.keypad(True)
+    curses.start_color()
+    curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
+    curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)
+    curses.init_pair(3, curses.COLOR_YELLOW, curses.COLOR_BLACK)
+    curses.init_pair(4, curses.COLOR_CYAN, curses.COLOR_BLACK)
+
+    top, left = 1, 1
+    screen = Screen(stdscr)
+    screen.layer("border", lambda canvas: canvas.box(top, left, field.height, field.width))
+    key_actions = {curses.KEY_UP: UP, curses.KEY_DOWN: DOWN,
+                   curses.KEY_LEFT: LEFT, curses.KEY_RIGHT: RIGHT}
+
+    def render():
+        screen.begin()
+        for y, x in field.food:
+            screen.put(top + y, left + x, "🍎", curses.color_pair(2))
+        for sid, cells in field.snakes.items():
+            attr = curses.color_pair(1) if sid == me else curses.color_pair(4)
+            for y, x in cells:
+                screen.put(top + y, left + x, "█", attr)
+        mine = field.snakes.get(me)
+        status = f" Room {room} | {len(field.snakes)} players | "
+        status += f"Length: {len(mine)} " if mine else "Respawning… "
+        screen.put(top, left + 2, status, curses.color_pair(3))
+        screen.present()
+
+    async def receive():
+        while True:
+            try:
+                kind, body = await protocol.read(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return  # the server went away
+            if kind == protocol.TICK:
+                field.tick, _, events = protocol.parse_tick(body)
+                field.apply(arena.decode(events))
+                render()
+
+    async def keys():
+        while True:
+            key = await rt.key()
+            if key in [ord('q'), ord('Q')]:
+                return
+            if key in key_actions:
+                # the server turns the snake at its next tick
+                writer.write(protocol.frame(protocol.MOVE, bytes((key_actions[key],))))
 
-        # Eat food
-        if new_head == food:
-            score += 1
-            food = [random.randint(1, height - 2), random.randint(1, width - 2)]
-            # Increase speed slightly
-            win.timeout(max(50, 150 - score * 5))
-        else:
-            snake.pop()
+    render()
+    tasks = [asyncio.create_task(receive()), asyncio.create_task(keys())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        writer.close()
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    parser = argparse.ArgumentParser(description="Snake")
+    parser.add_argument("--autopilot", choices=AGENTS, help="let an agent play")
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="autopilot time budget per move")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="play on a game server")
+    parser.add_argument("--room", default="lobby", help="room to join on the server")
+    instrument.add_arguments(parser)
+    args = replay.parse_args(parser)
+    if args.connect:
+        if args.record or args.replay or args.autopilot:
+            parser.error("online games cannot be recorded or played by the autopilot")
+        curses.wrapper(main_online, args.connect, args.room)
+    else:
+        profiler.configure(args)
+        agent = AGENTS[args.autopilot](args.budget_ms) if args.autopilot else None
+        replay.run(main, args, agent, args.seed)
+        if agent:
+            print(f"{agent.name}: {agent.decisions} moves, avg decision {agent.avg_latency_ms:.3f} ms")
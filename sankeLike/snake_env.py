@@ -0,0 +1,82 @@
+"""
+Headless snake rules.
+
+SnakeEnv holds the whole game state and advances it one tick per step(); it
+knows nothing about curses or timing, so the same rules drive the terminal
+game, bots and experiments. Coordinates are (y, x) and the outer ring of the
+height x width field is the wall, as in snake.py.
+"""
+
+import random
+
+from body import SnakeBody
+
+UP, RIGHT, DOWN, LEFT = range(4)
+DELTAS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+
+class SnakeEnv:
+    def __init__(self, height=20, width=40, seed=None):
+        self.height = height
+        self.width = width
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        self.rng = random.Random(seed)
+        start = [(self.height // 2, self.width // 4 + i) for i in range(3)][::-1]
+        self.body = SnakeBody(start, self.height, self.width)
+        self.direction = RIGHT
+        self.food = self.body.random_free_cell(self.rng)
+        self.score = 0
+        self.steps = 0
+        self.done = False
+        self.won = False
+        return self
+
+    @property
+    def head(self):
+        return self.body.head
+
+    @property
+    def tick_ms(self):
+        """Milliseconds per tick in the terminal game; the snake speeds up as it eats."""
+        return max(50, 150 - self.score * 5)
+
+    def turn(self, action):
+        """Change direction, ignoring None and 180° turns."""
+        if action is not None and action != (self.direction + 2) % 4:
+            self.direction = action
+
+    def next_head(self, direction=None):
+        dy, dx = DELTAS[self.direction if direction is None else direction]
+        y, x = self.body.head
+        return y + dy, x + dx
+
+    def is_blocked(self, cell):
+        y, x = cell
+        return (y <= 0 or y >= self.height - 1 or x <= 0 or x >= self.width - 1
+                or cell in self.body)
+
+    def step(self, action=None):
+        """
+        Advance one tick. action is UP/RIGHT/DOWN/LEFT or None to keep going.
+        Returns (reward, done): 1 for eating, -1 for dying, 0 otherwise.
+        """
+        if self.done:
+            return 0, True
+        self.turn(action)
+        self.steps += 1
+        new_head = self.next_head()
+        if self.is_blocked(new_head):
+            self.done = True
+            return -1, True
+
+        ate = new_head == self.food
+        self.body.move(new_head, grow=ate)
+        if not ate:
+            return 0, False
+        self.score += 1
+        self.food = self.body.random_free_cell(self.rng)
+        if self.food is None:
+            self.done = self.won = True
+        return 1, self.done
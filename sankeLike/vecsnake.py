@@ -0,0 +1,120 @@
+"""
+Vectorized snake runner: thousands of independent games advanced per call.
+
+Requires NumPy. Follows the rules of SnakeEnv (same walls, 180° turns
+ignored, running into the tail is a collision) but keeps every game in
+arrays. Instead of a body list each game has a grid of entry ticks: a cell
+is part of the snake while entry > tick - length, so moving and growing are
+a single write per game and the tail expires on its own.
+"""
+
+import numpy as np
+
+from snake_env import DELTAS, RIGHT
+
+_EMPTY = np.iinfo(np.int32).min // 2
+
+
+class VecSnakeEnv:
+    def __init__(self, num_games, height=20, width=40, seed=None, autoreset=True):
+        self.n = num_games
+        self.height = height
+        self.width = width
+        self.autoreset = autoreset
+        self.rng = np.random.default_rng(seed)
+        self.deltas = np.array(DELTAS, dtype=np.int32)
+        self.tick = 0
+
+        self.entry = np.full((num_games, height, width), _EMPTY, dtype=np.int32)
+        self.heads = np.zeros((num_games, 2), dtype=np.int32)
+        self.food = np.zeros((num_games, 2), dtype=np.int32)
+        self.directions = np.zeros(num_games, dtype=np.int8)
+        self.lengths = np.zeros(num_games, dtype=np.int32)
+        self.scores = np.zeros(num_games, dtype=np.int32)
+        self.done = np.zeros(num_games, dtype=bool)
+        self.games_finished = 0
+        self._rows = np.arange(num_games)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Reset every game, or only the games selected by a boolean mask."""
+        idx = self._rows if mask is None else np.flatnonzero(mask)
+        if idx.size == 0:
+            return
+        y, x = self.height // 2, self.width // 4
+        self.entry[idx] = _EMPTY
+        for i in range(3):
+            self.entry[idx, y, x + i] = self.tick - 2 + i
+        self.heads[idx] = (y, x + 2)
+        self.directions[idx] = RIGHT
+        self.lengths[idx] = 3
+        self.scores[idx] = 0
+        self.done[idx] = False
+        self._place_food(idx)
+
+    def occupied(self):
+        """Boolean (n, height, width) array of snake cells."""
+        return self.entry > (self.tick - self.lengths)[:, None, None]
+
+    def _place_food(self, idx):
+        # Rejection sampling over the field, then an exact pick for the
+        # few games whose boards are too full to hit a free cell quickly
+        h, w = self.height - 2, self.width - 2
+        for _ in range(8):
+            if idx.size == 0:
+                return
+            ys = self.rng.integers(1, h + 1, idx.size, dtype=np.int32)
+            xs = self.rng.integers(1, w + 1, idx.size, dtype=np.int32)
+            busy = self.entry[idx, ys, xs] > self.tick - self.lengths[idx]
+            ok = ~busy
+            self.food[idx[ok]] = np.stack([ys[ok], xs[ok]], axis=1)
+            idx = idx[busy]
+        for g in idx:
+            free = np.flatnonzero(self.entry[g, 1:-1, 1:-1] <= self.tick - self.lengths[g])
+            if free.size == 0:
+                # board full: the game is won and there is nothing to eat
+                self.food[g] = (0, 0)
+                self.done[g] = True
+                continue
+            cell = free[self.rng.integers(free.size)]
+            self.food[g] = (cell // w + 1, cell % w + 1)
+
+    def step(self, actions=None):
+        """
+        Advance every game one tick. actions is an int array of UP/RIGHT/
+        DOWN/LEFT, with -1 meaning keep going. Returns (rewards, dones) with
+        rewards 1 for eating, -1 for dying and 0 otherwise. With autoreset,
+        finished games start over on the same call.
+        """
+        if actions is not None:
+            actions = np.asarray(actions)
+            turn = (actions >= 0) & (actions != (self.directions + 2) % 4)
+            self.directions = np.where(turn, actions, self.directions).astype(np.int8)
+
+        alive = ~self.done
+        new_heads = self.heads + self.deltas[self.directions]
+        ys, xs = new_heads[:, 0], new_heads[:, 1]
+        wall = (ys <= 0) | (ys >= self.height - 1) | (xs <= 0) | (xs >= self.width - 1)
+        cy = np.clip(ys, 0, self.height - 1)
+        cx = np.clip(xs, 0, self.width - 1)
+        self_hit = self.entry[self._rows, cy, cx] > self.tick - self.lengths
+        dead = alive & (wall | self_hit)
+        moving = alive & ~dead
+
+        self.tick += 1
+        mi = np.flatnonzero(moving)
+        self.entry[mi, ys[mi], xs[mi]] = self.tick
+        self.heads[mi] = new_heads[mi]
+        ate = moving & (ys == self.food[:, 0]) & (xs == self.food[:, 1])
+        self.lengths += ate
+        self.scores += ate
+
+        rewards = ate.astype(np.int8) - dead.astype(np.int8)
+        self.done |= dead
+        if ate.any():
+            self._place_food(np.flatnonzero(ate))
+        dones = self.done.copy()
+        if self.autoreset and dones.any():
+            self.games_finished += int(dones.sum())
+            self.reset(dones)
+        return rewards, dones
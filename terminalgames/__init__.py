@@ -0,0 +1 @@
+"""Shared modules for the terminal games."""
@@ -0,0 +1,160 @@
+"""
+Launcher for all the games.
+
+Shows a menu and imports a game only when it is picked, so starting up
+costs little more than importing curses. The curses games run inside the
+launcher's curses session and come back to the menu when they end; the Qt
+tic-tac-toe loads PyQt6 only when it is chosen.
+
+    python -m terminalgames            # menu
+    python -m terminalgames tetris     # straight into one game
+    python -m terminalgames --list
+"""
+
+import argparse
+import curses
+import importlib.util
+import os
+import sys
+
+from terminalgames.render import Screen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (title, directory, script, arguments after stdscr); games with no
+# arguments open their own window instead of using the terminal
+GAMES = {
+    "maze": ("Maze Escape", "mazesim", "main", ()),
+    "snake": ("Snake", "sankeLike", "snake", ()),
+    "banana": ("Emoji Collect", "sankeLike", "banana", ()),
+    "tetris": ("Tetris", "other", "tetris", ()),
+    "tictactoe": ("Tic-Tac-Toe", "ticTacToe", "terminal", ()),
+    "tictactoe-ai": ("Tic-Tac-Toe vs computer", "ticTacToe", "terminal", ("hard",)),
+    "tictactoe-qt": ("Tic-Tac-Toe (Qt window)", "ticTacToe", "main", None),
+}
+
+
+def load(directory, script):
+    """
+    Import a game script. Scripts in different directories share names
+    (main.py), so each is registered as directory_script; its directory goes
+    on sys.path for the sibling modules it imports.
+    """
+    name = f"{directory}_{script}"
+    module = sys.modules.get(name)
+    if module is None:
+        path = os.path.join(ROOT, directory)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+        spec = importlib.util.spec_from_file_location(name, os.path.join(path, script + ".py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return module
+
+
+def windowed(stdscr, module):
+    """Leave curses while a windowed game runs."""
+    if sys.platform.startswith("linux") and not any(
+            os.environ.get(var) for var in ("DISPLAY", "WAYLAND_DISPLAY", "QT_QPA_PLATFORM")):
+        return "no display to open a window on"
+    curses.endwin()
+    try:
+        module.main()
+    finally:
+        stdscr.refresh()
+    return ""
+
+
+def reset(stdscr):
+    """Undo the input modes a game may have left behind."""
+    stdscr.nodelay(False)
+    stdscr.timeout(-1)
+    stdscr.keypad(True)
+    curses.flushinp()
+    try:
+        curses.curs_set(0)
+    except curses.error:
+        pass
+
+
+def play(stdscr, name):
+    """Run one game; returns a message for the menu."""
+    title, directory, script, args = GAMES[name]
+    try:
+        module = load(directory, script)
+        if args is None:
+            return windowed(stdscr, module)
+        module.main(stdscr, *args)
+    except Exception as exc:
+        return f"{title} stopped: {type(exc).__name__}: {exc}"
+    finally:
+        reset(stdscr)
+    return ""
+
+
+def choose(stdscr, screen, selected, message):
+    """Menu of games; returns the index picked, or None to quit."""
+    names = list(GAMES)
+    while True:
+        screen.begin()
+        screen.put(1, 2, "Terminal Games", curses.A_BOLD)
+        for row, name in enumerate(names):
+            screen.put(3 + row, 2, f" {row + 1}. {GAMES[name][0]} ", curses.A_REVERSE if row == selected else 0)
+        screen.put(4 + len(names), 2, "↑/↓ choose  Enter play  Q quit")
+        screen.put(6 + len(names), 2, message)
+        screen.present()
+
+        key = stdscr.getch()
+        if key in (ord("q"), ord("Q")):
+            return None
+        elif key in (curses.KEY_UP, ord("k")):
+            selected = (selected - 1) % len(names)
+        elif key in (curses.KEY_DOWN, ord("j")):
+            selected = (selected + 1) % len(names)
+        elif key in (curses.KEY_ENTER, 10, 13, ord(" ")):
+            return selected
+        elif ord("1") <= key < ord("1") + len(names):
+            return key - ord("1")
+
+
+def launcher(stdscr, game=None):
+    reset(stdscr)
+    if game:
+        message = play(stdscr, game)
+        if message:
+            raise SystemExit(message)
+        return
+    screen = Screen(stdscr)
+    selected, message = 0, ""
+    while True:
+        selected = choose(stdscr, screen, selected, message)
+        if selected is None:
+            return
+        message = play(stdscr, list(GAMES)[selected])
+        # the game drew over the menu
+        screen.invalidate()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m terminalgames", description="Terminal games launcher")
+    parser.add_argument("game", nargs="?", choices=GAMES, help="start this game instead of showing the menu")
+    parser.add_argument("--list", action="store_true", help="list the games and exit")
+    args = parser.parse_args()
+    if args.list:
+        for name, (title, *_) in GAMES.items():
+            print(f"{name:<14}{title}")
+        return
+    if args.game and GAMES[args.game][3] is None:
+        _, directory, script, _ = GAMES[args.game]
+        load(directory, script).main()
+        return
+    curses.wrapper(launcher, args.game)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Curses calls and terminal bytes per frame for every game.
+
+Each game runs in a pseudo-terminal for a few seconds, driven by seeded key
+presses (or its bot), with its window wrapped in a CallCounter. Run with
+--full-redraw to make every Screen erase and repaint the whole frame, which
+is what the games did before they shared the render layer. Unix only
+(uses pty).
+
+    python bench_render.py --seconds 5
+    python bench_render.py --games tetris snake --full-redraw
+"""
+
+import argparse
+import importlib
+import json
+import os
+import pty
+import random
+import select
+import struct
+import sys
+import tempfile
+import time
+
+try:
+    import fcntl
+    import termios
+except ImportError:  # Windows
+    fcntl = termios = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARROWS = [b"\x1bOA", b"\x1bOB", b"\x1bOC", b"\x1bOD"]  # keypad mode arrow keys
+
+# name -> (directory, module, key presses to choose from, whether q quits)
+GAMES = {
+    "maze": ("mazesim", "main", ARROWS, True),
+    "snake": ("sankeLike", "snake", [], True),
+    "banana": ("sankeLike", "banana", ARROWS, True),
+    "tetris": ("other", "tetris", [], False),
+    "tictactoe": ("ticTacToe", "terminal", ARROWS * 2 + [b" ", b"r"], True),
+}
+
+
+def game_args(name, seconds, full_redraw):
+    """Arguments after stdscr for each game's main()."""
+    if name == "maze":
+        return (31, 21)
+    if name == "snake":
+        return (importlib.import_module("autopilot").AGENTS["hamilton"](5.0),)
+    if name == "banana":
+        return (1,)  # stress mode, so the player cannot die mid-run
+    if name == "tetris":
+        return (importlib.import_module("tetris_ai").TetrisAI(5.0), not full_redraw, seconds)
+    return ()
+
+
+def child(name, seconds, full_redraw, stats_path):
+    """Run one game inside the pseudo-terminal and dump its call counts."""
+    import curses
+
+    sys.path.insert(0, ROOT)
+    from terminalgames.render import CallCounter, Screen
+
+    directory, module_name, _, _ = GAMES[name]
+    sys.path.insert(0, os.path.join(ROOT, directory))
+    if full_redraw:
+        Screen.diff = False
+    random.seed(0)
+    module = importlib.import_module(module_name)
+    counters = []
+    newwin = curses.newwin
+
+    def run(stdscr):
+        counter = CallCounter(stdscr)
+        counters.append(counter)
+        # windows the game opens itself count towards the same totals
+        curses.newwin = lambda *args: counter.subwindow(newwin(*args))
+        module.main(counter, *game_args(name, seconds, full_redraw))
+
+    curses.wrapper(run)
+    counter = counters[0]
+    with open(stats_path, "w") as f:
+        json.dump({"calls": counter.calls, "chars": counter.chars, "frames": counter.refreshes}, f)
+
+
+def run(name, seconds, full_redraw, seed, rows=30, cols=80):
+    """Run a game in a pseudo-terminal; returns its stats plus the bytes it wrote."""
+    _, _, keys, quits = GAMES[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        stats_path = os.path.join(tmp, "stats.json")
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", name,
+               "--seconds", str(seconds), "--stats", stats_path]
+        if full_redraw:
+            cmd.append("--full-redraw")
+        pid, fd = pty.fork()
+        if pid == 0:
+            os.environ.setdefault("TERM", "xterm-256color")
+            os.execv(cmd[0], cmd)
+        fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+        rng = random.Random(seed)
+        written = 0
+        start = time.monotonic()
+        next_key = start + 0.5
+        quit_sent = False
+        while True:
+            now = time.monotonic()
+            if keys and now >= next_key and now - start < seconds:
+                os.write(fd, rng.choice(keys))
+                next_key = now + 0.1
+            if quits and not quit_sent and now - start >= seconds:
+                os.write(fd, b"q")
+                quit_sent = True
+            ready, _, _ = select.select([fd], [], [], 0.05)
+            if ready:
+                try:
+                    data = os.read(fd, 65536)
+                except OSError:
+                    break
+                if not data:
+                    break
+                written += len(data)
+        os.waitpid(pid, 0)
+        with open(stats_path) as f:
+            stats = json.load(f)
+    stats["bytes"] = written
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", nargs="+", choices=GAMES, default=list(GAMES))
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--full-redraw", action="store_true",
+                        help="erase and repaint every frame instead of writing only changes")
+    parser.add_argument("--child", choices=GAMES, help=argparse.SUPPRESS)
+    parser.add_argument("--stats", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.seconds, args.full_redraw, args.stats)
+        return
+    if fcntl is None:
+        raise SystemExit("needs a Unix pseudo-terminal")
+
+    print(f"{'game':<10}{'frames':>8}{'calls/frame':>13}{'chars/frame':>13}{'bytes/frame':>13}")
+    for name in args.games:
+        stats = run(name, args.seconds, args.full_redraw, args.seed)
+        frames = max(1, stats["frames"])
+        print(f"{name:<10}{stats['frames']:>8}{stats['calls'] / frames:>13.1f}"
+              f"{stats['chars'] / frames:>13.1f}{stats['bytes'] / frames:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
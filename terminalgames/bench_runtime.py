@@ -0,0 +1,167 @@
+"""
+Idle CPU use and input latency of the real-time games.
+
+Each game runs in a pseudo-terminal. With nobody pressing anything, the
+CPU time and wakeups (voluntary context switches) it uses over a few
+seconds are read from /proc; then keys are sent at random moments and the
+time until the terminal receives the next output is taken as the latency
+from input to render. --ref runs the games from another git revision as
+well, e.g. the polling loops before the asyncio runtime:
+
+    python bench_runtime.py --ref HEAD~1
+
+Linux only (pty and /proc). Output that a game writes on its own (a tick,
+a falling piece) can land before the key's response, so the latency is an
+upper bound on how soon a key shows up, not an exact figure.
+"""
+
+import argparse
+import os
+import pty
+import random
+import select
+import signal
+import statistics
+import struct
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+try:
+    import fcntl
+    import termios
+except ImportError:  # Windows
+    fcntl = termios = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARROWS = [b"\x1bOA", b"\x1bOD", b"\x1bOB", b"\x1bOC"]  # up, left, down, right: a small loop
+
+# name -> (script and arguments, keys sent in turn for the latency test). The
+# snake's autopilot keeps it alive; any key still ends its tick early.
+GAMES = {
+    "tetris": (["other/tetris.py"], [b"a", b"d"]),
+    "snake": (["sankeLike/snake.py", "--autopilot", "hamilton"], ARROWS),
+    "banana": (["sankeLike/banana.py"], ARROWS),
+    "maze": (["mazesim/main.py"], [b"h"]),
+}
+
+
+def cpu_stats(pid):
+    """(CPU seconds, voluntary context switches) used by pid so far."""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    with open(f"/proc/{pid}/status") as f:
+        switches = next(int(line.split()[1]) for line in f if line.startswith("voluntary_ctxt_switches"))
+    return cpu, switches
+
+
+class Terminal:
+    """A game running in a pseudo-terminal, with its output drained."""
+
+    def __init__(self, cmd, rows=30, cols=80):
+        self.pid, self.fd = pty.fork()
+        if self.pid == 0:
+            os.environ.setdefault("TERM", "xterm-256color")
+            os.execv(cmd[0], cmd)
+        fcntl.ioctl(self.fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+        self.alive = True
+
+    def read(self, timeout):
+        """Output that arrives within timeout seconds, as soon as any does."""
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not ready:
+            return b""
+        try:
+            data = os.read(self.fd, 65536)
+        except OSError:
+            data = b""
+        if not data:
+            self.alive = False
+        return data
+
+    def drain(self, seconds):
+        end = time.monotonic() + seconds
+        while self.alive and time.monotonic() < end:
+            self.read(end - time.monotonic())
+
+    def close(self):
+        if self.alive:
+            os.write(self.fd, b"q")
+            self.drain(3)
+        try:
+            os.kill(self.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        os.waitpid(self.pid, 0)
+        os.close(self.fd)
+
+
+def measure(tree, name, idle, presses, seed):
+    (script, *script_args), keys = GAMES[name]
+    term = Terminal([sys.executable, os.path.join(tree, script), *script_args])
+    try:
+        term.drain(1.0)  # start-up
+        cpu0, switches0 = cpu_stats(term.pid)
+        term.drain(idle)
+        cpu1, switches1 = cpu_stats(term.pid)
+
+        rng = random.Random(seed)
+        latencies = []
+        for i in range(presses):
+            term.drain(rng.uniform(0.1, 0.3))
+            if not term.alive:
+                break
+            sent = time.monotonic()
+            os.write(term.fd, keys[i % len(keys)])
+            while term.alive and time.monotonic() - sent < 1.0:
+                if term.read(1.0 - (time.monotonic() - sent)):
+                    break
+            latencies.append((time.monotonic() - sent) * 1000)
+    finally:
+        term.close()
+    return {"cpu": 100 * (cpu1 - cpu0) / idle, "wakeups": (switches1 - switches0) / idle,
+            "latencies": sorted(latencies)}
+
+
+def export(ref, directory):
+    """Extract the tree of git revision ref into directory."""
+    archive = subprocess.run(["git", "-C", ROOT, "archive", "--format=tar", ref],
+                             capture_output=True, check=True).stdout
+    with tempfile.TemporaryFile() as f:
+        f.write(archive)
+        f.seek(0)
+        with tarfile.open(fileobj=f) as tar:
+            tar.extractall(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", nargs="+", choices=GAMES, default=list(GAMES))
+    parser.add_argument("--ref", help="also measure this git revision")
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds measured without input")
+    parser.add_argument("--presses", type=int, default=20, help="keys sent for the latency test")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if fcntl is None or not os.path.exists("/proc/self/stat"):
+        raise SystemExit("needs Linux: a pseudo-terminal and /proc")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trees = [("working tree", ROOT)]
+        if args.ref:
+            export(args.ref, tmp)
+            trees.insert(0, (args.ref, tmp))
+        print(f"{'game':<8}{'tree':<14}{'idle CPU':>10}{'wakeups/s':>11}{'latency p50':>13}{'p90':>10}")
+        for name in args.games:
+            for label, tree in trees:
+                stats = measure(tree, name, args.idle, args.presses, args.seed)
+                latencies = stats["latencies"] or [float("nan")]
+                p90 = latencies[min(len(latencies) - 1, int(0.9 * len(latencies)))]
+                print(f"{name:<8}{label:<14}{stats['cpu']:>9.1f}%{stats['wakeups']:>11.0f}"
+                      f"{statistics.median(latencies):>10.1f} ms{p90:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Load test for the game server.
+
+Starts a server (or uses --connect HOST:PORT) and connects simulated
+players from this process, spread over rooms: snake players steer at random
+and tic-tac-toe players make a random legal move when it is their turn,
+after a short think. Reports the messages and bytes received per second,
+the tick latency (a snake tick's arrival minus the time it was due on the
+server) and the round trip of a tic-tac-toe move (sent until the server's
+broadcast of it arrives).
+
+    python terminalgames/bench_server.py --players 400 --seconds 20
+
+Tick latency compares monotonic clocks of two processes, which only works
+on one machine; it includes the time this process takes to get round to
+the message, so a busy load tester adds to it.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "ticTacToe")]
+from mnk import MNKBoard
+from terminalgames import protocol
+
+SERVER = os.path.join(ROOT, "terminalgames", "server.py")
+
+
+class Stats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.start = time.monotonic()
+        self.received = self.sent = self.bytes = 0
+        self.ticks = []  # tick latencies in ms
+        self.round_trips = []  # move round trips in ms
+
+
+async def connect(host, port, game, room):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(protocol.join(game, room))
+    kind, body = await protocol.read(reader)
+    if kind != protocol.WELCOME:
+        raise RuntimeError(f"server: {body.decode()}")
+    return reader, writer, protocol.parse_welcome(body)
+
+
+async def snake_player(host, port, room, stats, rng, ready):
+    reader, writer, _ = await connect(host, port, protocol.SNAKE, room)
+    ready.release()
+    while True:
+        kind, body = await protocol.read(reader)
+        stats.received += 1
+        stats.bytes += len(body) + 3
+        if kind == protocol.TICK:
+            _, due, _ = protocol.parse_tick(body)
+            stats.ticks.append((time.monotonic() - due) * 1000)
+            if rng.random() < 0.2:
+                writer.write(protocol.frame(protocol.MOVE, bytes((rng.randrange(4),))))
+                stats.sent += 1
+
+
+async def tictactoe_player(host, port, room, stats, rng, ready, think):
+    reader, writer, (_, seat, snapshot) = await connect(host, port, protocol.TICTACTOE, room)
+    ready.release()
+    size, k, moves = protocol.parse_tictactoe_snapshot(snapshot)
+    board = MNKBoard(size, k=k)
+    for move in moves:
+        board.play(*move)
+    pending = None  # (move, when it was sent)
+    while True:
+        if board.player - 1 == seat and not board.is_over() and pending is None:
+            await asyncio.sleep(rng.uniform(0, 2 * think))
+            move = divmod(rng.choice([i for i, c in enumerate(board.cells) if not c]), size)
+            pending = move, time.monotonic()
+            writer.write(protocol.frame(protocol.MOVE, bytes(move)))
+            stats.sent += 1
+        kind, body = await protocol.read(reader)
+        stats.received += 1
+        stats.bytes += len(body) + 3
+        if kind == protocol.PLACED:
+            move = tuple(body)
+            board.play(*move)
+            if pending and pending[0] == move:
+                stats.round_trips.append((time.monotonic() - pending[1]) * 1000)
+                pending = None
+            if board.is_over() and seat == 0:
+                writer.write(protocol.frame(protocol.RESET))
+                stats.sent += 1
+        elif kind == protocol.CLEARED:
+            board.reset()
+            pending = None
+
+
+def percentiles(values):
+    values = sorted(values) or [float("nan")]
+    pick = lambda p: values[min(len(values) - 1, int(p * len(values)))]
+    return f"p50 {pick(0.5):6.2f} ms  p99 {pick(0.99):6.2f} ms  max {values[-1]:7.2f} ms"
+
+
+async def run(host, port, args):
+    stats = Stats()
+    rng = random.Random(args.seed)
+    ready = asyncio.Semaphore(0)
+    snakes = round(args.players * args.snake_share)
+    tasks = []
+    for i in range(args.players):
+        player_rng = random.Random(rng.getrandbits(32))
+        if i < snakes:
+            room = f"snake-{i // args.snakes_per_room}"
+            tasks.append(asyncio.create_task(snake_player(host, port, room, stats, player_rng, ready)))
+        else:
+            room = f"ttt-{(i - snakes) // 2}"
+            tasks.append(asyncio.create_task(
+                tictactoe_player(host, port, room, stats, player_rng, ready, args.think)))
+    for _ in tasks:
+        await ready.acquire()
+    await asyncio.sleep(1.0)  # warm up
+    stats.reset()
+    await asyncio.sleep(args.seconds)
+    elapsed = time.monotonic() - stats.start
+    failed = [task for task in tasks if task.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    rooms = -(-snakes // args.snakes_per_room) + -(-(args.players - snakes) // 2)
+    print(f"{args.players} players ({snakes} snake, {args.players - snakes} tic-tac-toe) in {rooms} rooms, "
+          f"{elapsed:.1f} s")
+    print(f"received  {stats.received / elapsed:9.0f} msg/s  {stats.bytes / elapsed / 1024:8.1f} KiB/s  "
+          f"{stats.bytes / max(1, stats.received):5.1f} B/msg")
+    print(f"sent      {stats.sent / elapsed:9.0f} msg/s")
+    print(f"tick latency      {percentiles(stats.ticks)}  ({len(stats.ticks)} ticks)")
+    print(f"move round trip   {percentiles(stats.round_trips)}  ({len(stats.round_trips)} moves)")
+    if failed:
+        print(f"{len(failed)} players dropped out early, e.g. {failed[0].exception()!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connect", metavar="HOST:PORT", help="use a running server instead of starting one")
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--snake-share", type=float, default=0.5, help="fraction of players in snake rooms")
+    parser.add_argument("--snakes-per-room", type=int, default=8)
+    parser.add_argument("--think", type=float, default=0.2, help="mean tic-tac-toe think time in seconds")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    if args.connect:
+        host, port = protocol.parse_address(args.connect)
+    else:
+        server = subprocess.Popen([sys.executable, SERVER, "--port", "0"], stdout=subprocess.PIPE, text=True)
+        host, port = protocol.parse_address(server.stdout.readline().split()[-1])
+    try:
+        asyncio.run(run(host, port, args))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
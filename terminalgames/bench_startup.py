@@ -0,0 +1,100 @@
+"""
+Cold-start cost of the launcher, from python -X importtime.
+
+Reports the median time to import the launcher, the modules that cost the
+most while doing it, the wall time of a whole `python -m terminalgames
+--list` next to a bare interpreter, and what loading each game adds when it
+is picked. Fails if the launcher imports a game, PyQt6 or numpy up front.
+
+    python bench_startup.py --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from terminalgames.__main__ import GAMES  # noqa: E402
+
+# modules only a chosen game may bring in
+DEFERRED = ("PyQt6", "numpy", "engine", "mnk", "tetris_core", "mazegen", "snake_env", "entities")
+
+
+def importtime(code):
+    """(module -> (self us, cumulative us), modules loaded) for a fresh interpreter running code."""
+    code += "; import sys; print('\\n'.join(sys.modules))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative))
+    return times, set(proc.stdout.split())
+
+
+def wall_ms(args, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def load_ms(name, runs):
+    """Median ms for the launcher to import one game when it is picked."""
+    _, directory, script, _ = GAMES[name]
+    code = ("import time, terminalgames.__main__ as m; t = time.perf_counter(); "
+            f"m.load({directory!r}, {script!r}); print((time.perf_counter() - t) * 1000)")
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode:
+            return None  # e.g. PyQt6 is not installed
+        samples.append(float(proc.stdout))
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=8, help="slowest imports to list")
+    args = parser.parse_args()
+
+    runs = [importtime("import terminalgames.__main__") for _ in range(args.runs)]
+    total = statistics.median(times["terminalgames.__main__"][1] for times, _ in runs) / 1000
+    print(f"launcher import: {total:.1f} ms (median of {args.runs})")
+    times, loaded = runs[-1]
+    _, bare_modules = importtime("pass")  # interpreter startup, not the launcher
+    slowest = sorted((item for item in times.items() if item[0] not in bare_modules),
+                     key=lambda item: -item[1][0])[:args.top]
+    for name, (self_us, cumulative) in slowest:
+        print(f"  {name:<32}{self_us / 1000:>7.2f} ms self{cumulative / 1000:>8.2f} ms cumulative")
+
+    bare = wall_ms(["-c", "pass"], args.runs)
+    listing = wall_ms(["-m", "terminalgames", "--list"], args.runs)
+    print(f"python -m terminalgames --list: {listing:.1f} ms wall ({bare:.1f} ms for a bare interpreter)")
+
+    print("loaded when picked:")
+    seen = set()
+    for name, (_, directory, script, _) in GAMES.items():
+        if (directory, script) in seen:
+            continue  # same script as an earlier entry
+        seen.add((directory, script))
+        ms = load_ms(name, max(1, args.runs // 2))
+        print(f"  {name:<16}" + (f"{ms:>7.1f} ms" if ms is not None else "    unavailable"))
+
+    early = sorted(module for module in loaded if module.split(".")[0] in DEFERRED)
+    if early:
+        raise SystemExit(f"imported at startup: {', '.join(early)}")
+    print("no game, PyQt6 or numpy imported at startup")
+
+
+if __name__ == "__main__":
+    main()
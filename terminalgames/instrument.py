@@ -0,0 +1,252 @@
+"""
+Per-frame instrumentation for the game loops.
+
+Games time the parts of their loop with spans and mark the end of each
+loop iteration with frame():
+
+    from terminalgames.instrument import profiler
+
+    with profiler.span("input"):
+        key = stdscr.getch()
+
+    @profiler.timed("render")
+    def draw(): ...
+
+    profiler.frame()
+
+count(name) adds to a counter and watch(name, read) samples a running
+total, such as Screen.calls, once a frame; both are shown per frame. All of
+it costs one attribute check while the profiler is off. P in a game shows
+a HUD with p50/p99 and a histogram of each span over the last few seconds;
+--profile-log appends the same p50/p99 and counters to a file once a
+second, --trace writes every span as a Chrome trace (chrome://tracing,
+Perfetto) and --cprofile a cProfile dump (python -m pstats) when the game
+exits.
+"""
+
+import atexit
+import curses
+import functools
+import json
+import os
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from time import perf_counter_ns
+
+HISTOGRAM = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66)  # bucket upper bounds in ms, then 66+
+BARS = " ▁▂▃▄▅▆▇█"
+MAX_EVENTS = 1_000_000  # trace events kept, about 100 MB of JSON
+_OFF = nullcontext()
+
+
+def add_arguments(parser):
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile", action="store_true", help="show the profiling HUD (toggle in game with P)")
+    group.add_argument("--profile-log", metavar="FILE", help="append a line of p50/p99 times to FILE every second")
+    group.add_argument("--trace", metavar="FILE", help="write a Chrome trace of every frame to FILE on exit")
+    group.add_argument("--cprofile", metavar="FILE", help="write a cProfile dump to FILE on exit")
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))]
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, perf_counter_ns())
+
+
+class Profiler:
+    def __init__(self, window=300):
+        self.enabled = False
+        self.hud = False
+        self.window = window  # frames kept for the HUD
+        self.times = defaultdict(lambda: deque(maxlen=self.window))  # span -> recent durations in ms
+        self.counts = defaultdict(int)  # counter -> total this frame
+        self.per_frame = defaultdict(lambda: deque(maxlen=self.window))
+        self.watches = {}  # name -> (read, last value)
+        self.frames = 0
+        self.trace_path = self.cprofile_path = None
+        self.events = []  # spans as (name, start ns, end ns)
+        self.samples = []  # counters as (name, ns, count per frame)
+        self.cprofile = None
+        self.log = None
+        self._logged_at = 0
+        self.lines = []
+        self._frame_start = None
+        self._lines_at = 0
+        self.origin = perf_counter_ns()
+
+    def configure(self, args):
+        """Apply the command-line options from add_arguments; outputs are written at exit."""
+        self.trace_path, self.cprofile_path = args.trace, args.cprofile
+        if args.cprofile:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        if args.profile_log:
+            self.log = open(args.profile_log, "a")
+            self._logged_at = perf_counter_ns()
+        if args.trace or args.cprofile or args.profile_log:
+            atexit.register(self.close)
+        self.hud = args.profile
+        self._update_enabled()
+
+    def _update_enabled(self):
+        enabled = self.hud or self.trace_path is not None or self.log is not None
+        if enabled and not self.enabled:
+            # watched counters kept growing while nothing read them; start from where they are now
+            self.watches = {name: (read, read()) for name, (read, _) in self.watches.items()}
+        self.enabled = enabled
+        self._frame_start = None
+
+    def toggle(self):
+        """Show or hide the HUD."""
+        self.hud = not self.hud
+        self._update_enabled()
+
+    def span(self, name):
+        """Context manager timing its block as name."""
+        if not self.enabled:
+            return _OFF
+        return _Span(self, name)
+
+    def timed(self, name=None):
+        """Decorator timing every call of a function as a span."""
+        def decorate(function):
+            label = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = perf_counter_ns()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.add(label, start, perf_counter_ns())
+            return wrapper
+        return decorate
+
+    def add(self, name, start, end):
+        self.times[name].append((end - start) / 1e6)
+        if self.trace_path and len(self.events) < MAX_EVENTS:
+            self.events.append((name, start, end))
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counts[name] += n
+
+    def watch(self, name, read):
+        """Count the growth of read() each frame, e.g. watch("addstr", lambda: screen.calls)."""
+        self.watches[name] = (read, read())
+
+    def frame(self):
+        """Mark the end of a loop iteration."""
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        if self._frame_start is not None:
+            self.add("frame", self._frame_start, now)
+        self._frame_start = now
+        self.frames += 1
+        for name, (read, last) in self.watches.items():
+            value = read()
+            self.counts[name] += value - last
+            self.watches[name] = (read, value)
+        for name in set(self.counts) | set(self.per_frame):
+            n = self.counts.get(name, 0)
+            self.per_frame[name].append(n)
+            if self.trace_path and len(self.samples) < MAX_EVENTS:
+                self.samples.append((name, now, n))
+        self.counts.clear()
+        if self.log and now - self._logged_at >= 1_000_000_000:
+            self._logged_at = now
+            self.log.write(self.summary() + "\n")
+            self.log.flush()
+
+    def summary(self):
+        """p50/p99 of every span and the mean of every counter per frame, on one line."""
+        parts = []
+        for name in ["frame"] + sorted(n for n in self.times if n != "frame"):
+            values = sorted(self.times.get(name, ()))
+            parts.append(f"{name} p50 {percentile(values, 50):.2f} ms  p99 {percentile(values, 99):.2f} ms")
+        for name in sorted(self.per_frame):
+            values = self.per_frame[name]
+            parts.append(f"{name} {sum(values) / max(1, len(values)):.1f}/frame")
+        return " | ".join(parts)
+
+    def histogram(self, values):
+        buckets = [0] * (len(HISTOGRAM) + 1)
+        for value in values:
+            i = 0
+            while i < len(HISTOGRAM) and value > HISTOGRAM[i]:
+                i += 1
+            buckets[i] += 1
+        peak = max(buckets) or 1
+        return "".join(BARS[-(-count * (len(BARS) - 1) // peak)] for count in buckets)
+
+    def hud_lines(self):
+        """The HUD text, recomputed at most four times a second."""
+        now = perf_counter_ns()
+        if now - self._lines_at < 250_000_000 and self.lines:
+            return self.lines
+        self._lines_at = now
+        lines = [f"{'ms':<8}{'p50':>7}{'p99':>7}  {'0.1':<8}66+"]
+        for name in ["frame"] + sorted(n for n in self.times if n != "frame"):
+            values = sorted(self.times.get(name, ()))
+            lines.append(f"{name[:8]:<8}{percentile(values, 50):>7.2f}{percentile(values, 99):>7.2f}"
+                         f"  {self.histogram(values)}")
+        for name in sorted(self.per_frame):
+            values = self.per_frame[name]
+            lines.append(f"{name[:8]:<8}{sum(values) / max(1, len(values)):>7.1f} per frame")
+        self.lines = lines
+        return lines
+
+    def draw(self, screen):
+        """Overlay the HUD in the top right corner of a Screen frame, if it is shown."""
+        if not self.hud:
+            return
+        lines = self.hud_lines()
+        width = max(len(line) for line in lines) + 2
+        x = max(0, screen.width - width)
+        for row, line in enumerate(lines):
+            screen.put(row, x, f" {line:<{width - 2}} ", curses.A_REVERSE)
+
+    def export_trace(self, path):
+        """Write the spans and counters as Chrome trace events."""
+        pid = os.getpid()
+        events = [{"name": name, "ph": "X", "ts": (start - self.origin) / 1000, "dur": (end - start) / 1000,
+                   "pid": pid, "tid": 0 if name == "frame" else 1}
+                  for name, start, end in self.events]
+        events += [{"name": name, "ph": "C", "ts": (ns - self.origin) / 1000, "pid": pid, "args": {name: n}}
+                   for name, ns, n in self.samples]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def close(self):
+        """Write the requested outputs; called at exit."""
+        if self.cprofile:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.cprofile_path)
+            self.cprofile = None
+        if self.trace_path:
+            self.export_trace(self.trace_path)
+            self.trace_path = None
+        if self.log:
+            self.log.close()
+            self.log = None
+
+
+profiler = Profiler()
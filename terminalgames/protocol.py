@@ -0,0 +1,104 @@
+"""
+Wire format between terminalgames/server.py and its clients.
+
+A message is a 2-byte big-endian length, then the payload, whose first byte
+is the message type. Coordinates and player numbers are single bytes. A
+client joining a room gets one WELCOME with a snapshot of it; after that the
+server only sends what changes: a tic-tac-toe mark, or once per snake tick
+the tick's events as packed by sankeLike/arena.py. read() and the parse_*
+functions raise ValueError on a message that does not hold together.
+
+    client -> server
+    JOIN     game, room name, tic-tac-toe board size and k (0: the default)
+    MOVE     tic-tac-toe: y, x; snake: a direction
+    RESET    start a new tic-tac-toe game
+    server -> client
+    WELCOME  game, your player number (SPECTATOR when the seats are taken), snapshot
+    PLACED   y, x: the player to move put their mark there
+    CLEARED  the tic-tac-toe board was reset
+    TICK     tick number, when it was due on the server's monotonic clock, events
+    ERROR    why the server is hanging up
+"""
+
+import struct
+
+TICTACTOE, SNAKE = 0, 1
+JOIN, MOVE, RESET = 1, 2, 3
+WELCOME, PLACED, CLEARED, TICK, ERROR = 0x81, 0x82, 0x83, 0x84, 0x85
+SPECTATOR = 255
+
+_TICK = struct.Struct(">Id")
+
+
+def frame(kind, body=b""):
+    return struct.pack(">HB", len(body) + 1, kind) + body
+
+
+async def read(reader):
+    """The next message as (type, body); raises asyncio.IncompleteReadError at the end of the stream."""
+    n, = struct.unpack(">H", await reader.readexactly(2))
+    if n == 0:
+        raise ValueError("empty message")
+    payload = await reader.readexactly(n)
+    return payload[0], payload[1:]
+
+
+def parse_address(address, default_port=7777):
+    host, _, port = address.rpartition(":")
+    return host or "localhost", int(port or default_port)
+
+
+def join(game, room, size=3, k=None):
+    name = room.encode()[:255]
+    return frame(JOIN, bytes((game, len(name))) + name + bytes((size, k or 0)))
+
+
+def parse_join(body):
+    """(game, room, size, k); k is None for the default."""
+    n = body[1] if len(body) > 1 else 0
+    if len(body) != 4 + n:
+        raise ValueError("malformed JOIN")
+    size, k = body[2 + n], body[3 + n]
+    return body[0], body[2:2 + n].decode(errors="replace"), size, k or None
+
+
+def welcome(game, player, snapshot):
+    return frame(WELCOME, bytes((game, player)) + snapshot)
+
+
+def parse_welcome(body):
+    """(game, player, snapshot)"""
+    if len(body) < 2:
+        raise ValueError("malformed WELCOME")
+    return body[0], body[1], body[2:]
+
+
+def tictactoe_snapshot(size, k, moves):
+    """A tic-tac-toe board as its size, k and the moves played so far."""
+    return bytes((size, k)) + struct.pack(">H", len(moves)) + bytes(c for move in moves for c in move)
+
+
+def parse_tictactoe_snapshot(data):
+    """(size, k, moves)"""
+    if len(data) < 4:
+        raise ValueError("malformed tic-tac-toe snapshot")
+    n, = struct.unpack_from(">H", data, 2)
+    if len(data) != 4 + 2 * n:
+        raise ValueError("malformed tic-tac-toe snapshot")
+    return data[0], data[1], [(data[i], data[i + 1]) for i in range(4, 4 + 2 * n, 2)]
+
+
+def tick(number, due, events):
+    return frame(TICK, _TICK.pack(number, due) + events)
+
+
+def parse_tick(body):
+    """(number, due, events)"""
+    if len(body) < _TICK.size:
+        raise ValueError("malformed TICK")
+    number, due = _TICK.unpack_from(body)
+    return number, due, body[_TICK.size:]
+
+
+def error(reason):
+    return frame(ERROR, reason.encode())
@@ -0,0 +1,276 @@
+"""
+Double-buffered rendering shared by the curses games.
+
+A game draws each frame into a Screen, an off-screen grid of characters and
+attributes, with put(), fill() and box(), and then calls present(). That
+compares the frame with what the terminal already shows and writes only the
+cells that changed, joined into as few addstr calls as possible.
+
+Parts of a frame that rarely change (borders, maze walls, the board grid)
+go in named layers: a layer is painted once into a cached base image and
+every frame starts as a copy of it, until the layer's key changes or the
+terminal is resized.
+
+Wide characters such as emoji take two cells, as they do on the terminal;
+the second cell holds WIDE so nothing else is drawn under the glyph.
+"""
+
+import curses
+import time
+import unicodedata
+from functools import lru_cache
+
+WIDE = ""  # the right half of a wide character
+_GAP = 4  # unchanged cells bridged to join two changed runs in one addstr
+
+
+@lru_cache(maxsize=4096)
+def char_width(ch):
+    """Terminal columns taken by one character: 0, 1 or 2."""
+    if unicodedata.category(ch) in ("Mn", "Me", "Cf"):
+        return 0  # combining marks, variation selectors, zero-width joiners
+    if unicodedata.east_asian_width(ch) in ("W", "F"):
+        return 2
+    return 1
+
+
+def text_width(text):
+    return sum(char_width(ch) for ch in text)
+
+
+class Canvas:
+    """A height x width grid of characters and curses attributes."""
+
+    def __init__(self, height, width, attr=0):
+        self.height, self.width = height, width
+        self.chars = [[" "] * width for _ in range(height)]
+        self.attrs = [[attr] * width for _ in range(height)]
+
+    def put(self, y, x, text, attr=0):
+        """Write text at (y, x), clipped to the canvas."""
+        if not 0 <= y < self.height:
+            return
+        chars, attrs, width = self.chars[y], self.attrs[y], self.width
+        last = None  # cell of the previous glyph, for combining characters
+        for ch in text:
+            cw = char_width(ch)
+            if cw == 0:
+                if last is not None:
+                    chars[last] += ch
+                continue
+            if x >= width:
+                break
+            if x + cw > 0:
+                if x < 0 or x + cw > width:
+                    # half of a wide character hangs off the edge
+                    for cx in range(max(0, x), min(width, x + cw)):
+                        self._clear_cell(chars, attrs, cx, attr)
+                    last = None
+                else:
+                    if chars[x] == WIDE and x > 0:
+                        chars[x - 1] = " "  # broke the wide char to our left
+                    end = x + cw
+                    if end < width and chars[end] == WIDE:
+                        chars[end] = " "  # broke the wide char to our right
+                    chars[x] = ch
+                    attrs[x] = attr
+                    if cw == 2:
+                        chars[x + 1] = WIDE
+                        attrs[x + 1] = attr
+                    last = x
+            x += cw
+
+    def _clear_cell(self, chars, attrs, x, attr):
+        if chars[x] == WIDE and x > 0:
+            chars[x - 1] = " "
+        if x + 1 < self.width and chars[x + 1] == WIDE:
+            chars[x + 1] = " "
+        chars[x] = " "
+        attrs[x] = attr
+
+    def fill(self, y, x, height, width, ch=" ", attr=0):
+        for row in range(max(0, y), min(self.height, y + height)):
+            self.put(row, x, ch * width, attr)
+
+    def box(self, y, x, height, width, attr=0):
+        """Draw a single-line border around a height x width rectangle."""
+        self.put(y, x, "┌" + "─" * (width - 2) + "┐", attr)
+        for row in range(y + 1, y + height - 1):
+            self.put(row, x, "│", attr)
+            self.put(row, x + width - 1, "│", attr)
+        self.put(y + height - 1, x, "└" + "─" * (width - 2) + "┘", attr)
+
+
+class Screen(Canvas):
+    """
+    Off-screen frame for a curses window. With diff=False every present()
+    erases the window and writes the whole frame again, like the games used
+    to, which is only useful for comparison.
+    """
+
+    diff = True
+
+    def __init__(self, win, diff=None):
+        self.win = win
+        if diff is not None:
+            self.diff = diff
+        self.layers = {}  # name -> (paint, key), painted in insertion order
+        self.base = None
+        self.calls = 0  # addstr calls made by present()
+        self.frames = 0
+        height, width = win.getmaxyx()
+        self._resize(height, width)
+
+    def _resize(self, height, width):
+        Canvas.__init__(self, height, width)
+        self.base = None
+        self.invalidate()
+
+    def invalidate(self):
+        """Erase the window, so the next present() writes every non-blank cell."""
+        self.win.erase()
+        self.front_chars = [[" "] * self.width for _ in range(self.height)]
+        self.front_attrs = [[0] * self.width for _ in range(self.height)]
+
+    def layer(self, name, paint, key=None):
+        """
+        Register a static layer drawn by paint(canvas). It is repainted only
+        when key differs from the last call's key or the terminal is resized.
+        """
+        entry = self.layers.get(name)
+        if entry is None or entry[1] != key:
+            self.layers[name] = (paint, key)
+            self.base = None
+
+    def drop_layer(self, name):
+        if self.layers.pop(name, None) is not None:
+            self.base = None
+
+    def begin(self):
+        """Start a frame: follow terminal resizes and reset to the static layers."""
+        height, width = self.win.getmaxyx()
+        if (height, width) != (self.height, self.width):
+            self._resize(height, width)
+        if self.base is None:
+            self.base = Canvas(self.height, self.width)
+            for paint, _ in self.layers.values():
+                paint(self.base)
+        for row, base in zip(self.chars, self.base.chars):
+            row[:] = base
+        for row, base in zip(self.attrs, self.base.attrs):
+            row[:] = base
+
+    def present(self):
+        """Write the cells that differ from the terminal and refresh. Returns the addstr count."""
+        win = self.win
+        if not self.diff:
+            self.invalidate()
+        calls = 0
+        width = self.width
+        for y in range(self.height):
+            chars, attrs = self.chars[y], self.attrs[y]
+            front_chars, front_attrs = self.front_chars[y], self.front_attrs[y]
+            if chars == front_chars and attrs == front_attrs:
+                continue
+            x = 0
+            while x < width:
+                if chars[x] == front_chars[x] and attrs[x] == front_attrs[x]:
+                    x += 1
+                    continue
+                # a run of one attribute, from this changed cell to the last
+                # changed cell that is at most _GAP unchanged cells further on
+                attr, start, end = attrs[x], x, x + 1
+                x += 1
+                while x < width and attrs[x] == attr and x - end < _GAP:
+                    if chars[x] != front_chars[x] or attrs[x] != front_attrs[x]:
+                        end = x + 1
+                    x += 1
+                try:
+                    win.addstr(y, start, "".join(chars[start:end]), attr)
+                except curses.error:
+                    pass  # curses reports writing the bottom-right cell as an error
+                calls += 1
+                x = end
+            front_chars[:] = chars
+            front_attrs[:] = attrs
+        win.refresh()
+        self.calls += calls
+        self.frames += 1
+        return calls
+
+
+class CallCounter:
+    """
+    Proxy for a curses window that counts output calls and characters.
+    A frame is an explicit refresh, or a getch/getkey after output (curses
+    refreshes the window implicitly then).
+    """
+
+    OUTPUT = ("addch", "addnstr", "border", "bkgd", "box", "clrtobot", "clrtoeol", "hline", "vline")
+
+    def __init__(self, win, parent=None):
+        self._win = win
+        self._parent = parent
+        self.calls = 0
+        self.chars = 0
+        self.refreshes = 0
+        self._dirty = False
+        self.started = time.monotonic()
+
+    def __getattr__(self, name):
+        attr = getattr(self._win, name)
+        if name in self.OUTPUT:
+            def counted(*args):
+                self._count()
+                return attr(*args)
+            return counted
+        return attr
+
+    def _count(self, chars=0):
+        counter = self._parent or self
+        counter.calls += 1
+        counter.chars += chars
+        counter._dirty = True
+
+    def addstr(self, *args):
+        text = args[2] if len(args) > 2 and isinstance(args[0], int) else args[0]
+        self._count(len(text))
+        return self._win.addstr(*args)
+
+    def clear(self):
+        self._count()
+        return self._win.clear()
+
+    def erase(self):
+        self._count()
+        return self._win.erase()
+
+    def refresh(self, *args):
+        counter = self._parent or self
+        counter.calls += 1
+        counter.refreshes += 1
+        counter._dirty = False
+        return self._win.refresh(*args)
+
+    def _read(self, method, *args):
+        counter = self._parent or self
+        if counter._dirty:
+            counter.refreshes += 1
+            counter._dirty = False
+        return method(*args)
+
+    def getch(self, *args):
+        return self._read(self._win.getch, *args)
+
+    def getkey(self, *args):
+        return self._read(self._win.getkey, *args)
+
+    def subwindow(self, win):
+        """Wrap another window so its calls count towards this counter."""
+        return CallCounter(win, self._parent or self)
+
+    def summary(self):
+        elapsed = max(1e-9, time.monotonic() - self.started)
+        per_frame = self.calls / self.refreshes if self.refreshes else 0.0
+        return (f"{self.calls / elapsed:,.0f} curses calls/s, {self.chars / elapsed:,.0f} chars/s, "
+                f"{self.refreshes / elapsed:,.1f} frames/s, {per_frame:,.1f} calls/frame over {elapsed:.1f}s")
@@ -0,0 +1,409 @@
+"""
+Recording and replay of game sessions.
+
+A recording holds everything a run depends on besides the code: the
+command-line arguments, the random seed, the terminal size, the result of
+every input poll and every clock reading the game makes. Replaying feeds
+exactly those back, so the game takes the same path however fast the
+machine is: headlessly at full speed (no terminal needed), or in curses at
+the recorded pace with --realtime. Either way the final state the game
+returns is checked against the recorded one.
+
+    python snake.py --record run.log
+    python snake.py --replay run.log
+    python snake.py --replay run.log --realtime
+
+The log is line-delimited text, gzip-compressed when the file name ends in
+.gz. The first line is a JSON header and the last is "end" and the final
+state as JSON. Each line between is one event, MS being milliseconds into
+the run:
+
+    k MS KEY          getch() returned the key code KEY
+    K MS "KEY"        getkey() returned KEY (as a JSON string)
+    n MS LAST COUNT   COUNT polls in a row found no key, the last at LAST
+    m/w/p DELTA       time.monotonic/time/perf_counter read, in
+                      microseconds after the previous read of that clock
+    s ROWS COLS       the window is now ROWS x COLS
+
+A game opts in by building its arguments with parse_args(), returning its
+final state from main() and starting through run().
+"""
+
+import argparse
+import curses
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+
+FORMAT = 1
+# how a run is recorded or watched, rather than what happens in it
+_OPTIONS = ("record", "replay", "realtime", "profile", "profile_log", "trace", "cprofile")
+
+
+class ReplayError(Exception):
+    """The game asked for something other than what the recording holds next."""
+
+
+class _LogEnd(ReplayError):
+    pass
+
+
+def _open(path, mode):
+    return (gzip.open if path.endswith(".gz") else open)(path, mode, encoding="utf-8")
+
+
+def _describe(exc):
+    return f"{type(exc).__name__}: {exc}"
+
+
+class Clock:
+    """Stands in for the time module inside a game; every reading goes through read(kind, clock)."""
+
+    def __init__(self, read, sleep):
+        self._read = read
+        self.sleep = sleep
+
+    def monotonic(self):
+        return self._read("m", time.monotonic)
+
+    def time(self):
+        return self._read("w", time.time)
+
+    def perf_counter(self):
+        return self._read("p", time.perf_counter)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class Recorder:
+    """Writes the log of a live session."""
+
+    def __init__(self, path, header):
+        self.file = _open(path, "wt")
+        self.file.write(json.dumps(header) + "\n")
+        self.start = time.monotonic()
+        self.clocks = {}  # kind -> last reading, in microseconds
+        self.size = None
+        self.empty = None  # [first ms, last ms, count] of the current run of empty polls
+        self.events = 0
+        self.clock = Clock(self.read, time.sleep)
+
+    def window(self, win):
+        return _RecordingWindow(win, self)
+
+    def _write(self, line):
+        if self.empty:
+            self.file.write("n %d %d %d\n" % tuple(self.empty))
+            self.empty = None
+        self.file.write(line + "\n")
+
+    def poll(self, kind, key):
+        """Log a getch ("k") or getkey ("K") result; None means no key."""
+        ms = int((time.monotonic() - self.start) * 1000)
+        self.events += 1
+        if key is None:
+            if self.empty:
+                self.empty[1] = ms
+                self.empty[2] += 1
+            else:
+                self.empty = [ms, ms, 1]
+        else:
+            self._write(f"{kind} {ms} {json.dumps(key) if kind == 'K' else key}")
+
+    def read(self, kind, clock):
+        # the game gets the reading rounded to the microsecond, exactly as a
+        # replay will reproduce it
+        now = round(clock() * 1e6)
+        self._write(f"{kind} {now - self.clocks.get(kind, 0)}")
+        self.clocks[kind] = now
+        self.events += 1
+        return now / 1e6
+
+    def resize(self, size):
+        self.size = size
+        self._write("s %d %d" % size)
+
+    def close(self, state):
+        self._write("end " + json.dumps(state))
+        self.file.close()
+
+
+class _RecordingWindow:
+    def __init__(self, win, recorder):
+        self._win = win
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._win, name)
+
+    def getmaxyx(self):
+        size = self._win.getmaxyx()
+        if size != self._recorder.size:
+            self._recorder.resize(size)
+        return size
+
+    def getch(self, *args):
+        key = self._win.getch(*args)
+        self._recorder.poll("k", None if key == -1 else key)
+        return key
+
+    def getkey(self, *args):
+        try:
+            key = self._win.getkey(*args)
+        except curses.error:
+            self._recorder.poll("K", None)
+            raise
+        self._recorder.poll("K", key)
+        return key
+
+
+class Replay:
+    """Reads a log back: each poll and clock reading returns what was recorded."""
+
+    def __init__(self, path, realtime=False):
+        with _open(path, "rt") as f:
+            self.header = json.loads(f.readline())
+            self.lines = f.read().splitlines()
+        if self.header.get("format") != FORMAT:
+            raise ReplayError(f"{path}: unknown log format {self.header.get('format')!r}")
+        self.final = None
+        if self.lines and self.lines[-1].startswith("end "):
+            self.final = json.loads(self.lines.pop()[4:])
+        self.realtime = realtime
+        self.pos = 0
+        self.run = None  # [first ms, last ms, count, polls done] of a run of empty polls
+        self.clocks = {}
+        self.size = (24, 80)
+        self.polls = self.keys = self.reads = 0
+        self.start = time.monotonic()
+        self.clock = Clock(self.read, lambda seconds: None)
+
+    @property
+    def finished(self):
+        return self.pos == len(self.lines) and not self.run
+
+    def window(self, win=None):
+        """A window reading input from the log, drawing to win (or nowhere)."""
+        return _ReplayWindow(self, win)
+
+    def _next(self, kinds):
+        if self.run or self.pos == len(self.lines):
+            what = "more empty polls" if self.run else "nothing more"
+            raise (ReplayError if self.run else _LogEnd)(
+                f"replay diverged after {self.polls} polls and {self.reads} clock reads: "
+                f"the game wants a {'/'.join(kinds)} event, the recording has {what}")
+        line = self.lines[self.pos]
+        if line[0] not in kinds:
+            raise ReplayError(f"replay diverged at line {self.pos + 2}: the game wants a "
+                              f"{'/'.join(kinds)} event, the recording has {line!r}")
+        self.pos += 1
+        return line.split(" ", 2)
+
+    def _wait(self, ms):
+        if self.realtime:
+            delay = self.start + ms / 1000 - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def poll(self, kind):
+        """The recorded result of a getch ("k") or getkey ("K") poll; None for no key."""
+        self.polls += 1
+        if not self.run:
+            event, ms, rest = self._next((kind, "n"))
+            if event == kind:
+                self.keys += 1
+                self._wait(int(ms))
+                return json.loads(rest) if kind == "K" else int(rest)
+            last, count = map(int, rest.split())
+            self.run = [int(ms), last, count, 0]
+        first, last, count, done = self.run
+        # pace the polls of a run evenly between its first and last
+        self._wait(first + (last - first) * done // max(1, count - 1))
+        self.run[3] += 1
+        if self.run[3] == count:
+            self.run = None
+        return None
+
+    def read(self, kind, clock):
+        _, delta = self._next((kind,))
+        now = self.clocks.get(kind, 0) + int(delta)
+        self.clocks[kind] = now
+        self.reads += 1
+        return now / 1e6
+
+    def window_size(self):
+        if not self.run and self.pos < len(self.lines) and self.lines[self.pos][0] == "s":
+            _, rows, cols = self.lines[self.pos].split()
+            self.size = (int(rows), int(cols))
+            self.pos += 1
+        return self.size
+
+
+def _ignore(*args):
+    return None
+
+
+class _ReplayWindow:
+    replaying = True  # input is known in advance: nothing should wait for it
+
+    def __init__(self, replay, win):
+        self._replay = replay
+        self._win = win
+
+    def __getattr__(self, name):
+        return _ignore if self._win is None else getattr(self._win, name)
+
+    def getmaxyx(self):
+        return self._replay.window_size()
+
+    def getch(self, *args):
+        key = self._replay.poll("k")
+        return -1 if key is None else key
+
+    def getkey(self, *args):
+        key = self._replay.poll("K")
+        if key is None:
+            raise curses.error("no input")
+        return key
+
+
+# curses functions that need a terminal, and what they do in a headless replay
+_HEADLESS = {
+    "curs_set": lambda visibility: 1,
+    "start_color": _ignore,
+    "use_default_colors": _ignore,
+    "init_pair": _ignore,
+    "has_colors": lambda: True,
+    "color_pair": lambda pair: pair << 8,
+    "beep": _ignore,
+    "flash": _ignore,
+    "napms": lambda ms: 0,
+}
+
+
+@contextmanager
+def _headless_curses():
+    saved = {name: getattr(curses, name) for name in _HEADLESS}
+    for name, function in _HEADLESS.items():
+        setattr(curses, name, function)
+    try:
+        yield
+    finally:
+        for name, function in saved.items():
+            setattr(curses, name, function)
+
+
+@contextmanager
+def _use_clock(module, clock):
+    """Give the game's modules (those next to its script) the clock in place of time."""
+    directory = os.path.dirname(os.path.abspath(module.__file__))
+    modules = [m for m in list(sys.modules.values())
+               if getattr(m, "time", None) is time and getattr(m, "__file__", None)
+               and os.path.dirname(os.path.abspath(m.__file__)) == directory]
+    for m in modules:
+        m.time = clock
+    try:
+        yield
+    finally:
+        for m in modules:
+            m.time = time
+
+
+def add_arguments(parser):
+    group = parser.add_argument_group("recording")
+    group.add_argument("--seed", type=int, help="seed the game's randomness (random by default)")
+    group.add_argument("--record", metavar="FILE", help="record the session to FILE (.gz to compress)")
+    group.add_argument("--replay", metavar="FILE",
+                       help="replay a recording headlessly and check that it ends the same way")
+    group.add_argument("--realtime", action="store_true",
+                       help="with --replay, show the replay in curses at the recorded pace")
+
+
+def parse_args(parser):
+    """
+    Parse a game's command line with the recording options added. A replay
+    takes its arguments and seed from the recording instead.
+    """
+    add_arguments(parser)
+    args = parser.parse_args()
+    if args.replay:
+        with _open(args.replay, "rt") as f:
+            recorded = json.loads(f.readline())["args"]
+        args = argparse.Namespace(**{**vars(args), **recorded})
+    elif args.seed is None:
+        args.seed = random.randrange(2**32)
+    return args
+
+
+def run(main, args, *main_args):
+    """
+    Run curses.wrapper(main, *main_args), or record or replay it as args
+    ask. main returns the game's final state, which must survive a JSON
+    round trip; run returns it.
+    """
+    module = sys.modules[main.__module__]
+    game = os.path.relpath(os.path.abspath(module.__file__),
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+    random.seed(args.seed)
+    if args.replay:
+        return _replay(main, args, module, game, main_args)
+    if not args.record:
+        return curses.wrapper(main, *main_args)
+
+    recorded = {name: value for name, value in vars(args).items() if name not in _OPTIONS}
+    recorder = Recorder(args.record, {"format": FORMAT, "game": game, "args": recorded})
+    state = None
+    try:
+        with _use_clock(module, recorder.clock):
+            state = curses.wrapper(lambda stdscr: main(recorder.window(stdscr), *main_args))
+    except KeyboardInterrupt:
+        state = {"interrupted": True}
+        raise
+    except Exception as exc:
+        state = {"error": _describe(exc)}  # replaying the log reproduces the crash
+        raise
+    finally:
+        recorder.close(state)
+    print(f"recorded {recorder.events} events to {args.record}")
+    return state
+
+
+def _replay(main, args, module, game, main_args):
+    replay = Replay(args.replay, args.realtime)
+    if replay.header["game"] != game:
+        raise SystemExit(f"{args.replay} is a recording of {replay.header['game']}, not {game}")
+    started = time.perf_counter()
+    try:
+        with _use_clock(module, replay.clock):
+            if args.realtime:
+                state = curses.wrapper(lambda stdscr: main(replay.window(stdscr), *main_args))
+            else:
+                with _headless_curses():
+                    state = main(replay.window(), *main_args)
+    except _LogEnd:
+        state = {"interrupted": True}
+    except ReplayError as exc:
+        raise SystemExit(f"{args.replay}: {exc}")
+    except Exception as exc:
+        state = {"error": _describe(exc)}
+    elapsed = time.perf_counter() - started
+    state = json.loads(json.dumps(state))  # tuples become lists, as in the log
+
+    print(f"{game}: replayed {replay.polls} polls ({replay.keys} keys) and "
+          f"{replay.reads} clock reads in {elapsed:.2f}s")
+    if state != replay.final or not replay.finished:
+        print("final state differs from the recording:")
+        final = replay.final or {}
+        for key in sorted(set(state or {}) | set(final)):
+            if (state or {}).get(key) != final.get(key):
+                print(f"  {key}: recorded {final.get(key)!r}, replayed {(state or {}).get(key)!r}")
+        if not replay.finished:
+            print(f"  {len(replay.lines) - replay.pos} recorded events were never used")
+        raise SystemExit(1)
+    print("final state matches the recording")
+    return state
@@ -0,0 +1,76 @@
+"""
+Event-driven input and timing for the curses games.
+
+A game loop is a coroutine that awaits the player's next key or its next
+tick instead of polling for them:
+
+    async def play(rt):
+        while True:
+            key = await rt.key(timeout=0.5)  # a key, or -1 once 0.5 s pass
+            ...
+
+    run(stdscr, play)
+
+Waiting goes through the asyncio event loop, which watches stdin for input
+and keeps the deadline as a timer, so a game with nothing to do uses no CPU
+and wakes the moment a key arrives. Windows that replay a recording
+(terminalgames.replay) are never waited on: their input is already known.
+"""
+
+import asyncio
+import sys
+
+
+def run(win, play, *args):
+    """Run the coroutine play(Runtime(win), *args) to completion and return its result."""
+    return asyncio.run(play(Runtime(win), *args))
+
+
+class Runtime:
+    def __init__(self, win, fd=None):
+        self.win = win
+        self.waits = not getattr(win, "replaying", False)
+        # replays never wait on input, so they run without a stdin (CI, daemons, <&-)
+        self.fd = sys.stdin.fileno() if fd is None and self.waits else fd
+        win.nodelay(True)
+
+    async def key(self, timeout=None):
+        """
+        The next key, or -1 if none arrives within timeout seconds (None
+        waits for ever). -1 can also come early, e.g. for half an escape
+        sequence, so callers should check their own deadlines.
+        """
+        key = self.win.getch()
+        if key != -1 or (timeout is not None and timeout <= 0):
+            return key
+        await self.wait(timeout)
+        return self.win.getch()
+
+    async def wait(self, timeout=None):
+        """Wait until input is ready or timeout seconds pass, without reading it."""
+        if not self.waits:
+            return
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+
+        def wake():
+            if not ready.done():
+                ready.set_result(None)
+
+        try:
+            loop.add_reader(self.fd, wake)
+        except NotImplementedError:
+            # no readiness on this platform's event loop (Windows): poll
+            await asyncio.sleep(0.01 if timeout is None else min(timeout, 0.01))
+            return
+        timer = loop.call_later(timeout, wake) if timeout is not None else None
+        try:
+            await ready
+        finally:
+            loop.remove_reader(self.fd)
+            if timer:
+                timer.cancel()
+
+    async def sleep(self, seconds):
+        if self.waits:
+            await asyncio.sleep(seconds)
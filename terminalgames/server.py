@@ -0,0 +1,212 @@
+"""
+Game server: tic-tac-toe and multiplayer snake rooms over TCP.
+
+    python terminalgames/server.py --port 7777
+    python ticTacToe/terminal.py --connect localhost:7777 --room friends
+    python sankeLike/snake.py --connect localhost:7777 --room pit
+
+Clients join a room by name; it is made on the first join and dropped when
+the last client leaves. The server holds the only real game state, checks
+every move against it and broadcasts what changed (protocol.py), encoded
+once per room, never a full board. All rooms share one asyncio loop: a
+snake room is a task stepping its arena every tick, a tic-tac-toe room
+only does something when a move comes in. A client that stops reading is
+dropped once MAX_BUFFER bytes queue up for it, so it cannot hold up a room.
+"""
+
+import argparse
+import asyncio
+import os
+import struct
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "sankeLike"), os.path.join(ROOT, "ticTacToe")]
+import arena
+from mnk import MNKBoard
+from terminalgames import protocol
+
+MAX_BUFFER = 256 * 1024
+SNAKE_PLAYERS = 16  # per room
+MAX_SIZE = 25  # tic-tac-toe board
+ARENA = (20, 40)
+
+
+class Client:
+    __slots__ = ("writer", "player")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.player = protocol.SPECTATOR
+
+    def send(self, data):
+        if self.writer.is_closing():
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFER:
+            self.writer.close()
+        else:
+            self.writer.write(data)
+
+
+class Room:
+    def __init__(self):
+        self.clients = []
+
+    def broadcast(self, data):
+        for client in self.clients:
+            client.send(data)
+
+    def leave(self, client):
+        self.clients.remove(client)
+
+    def close(self):
+        pass
+
+
+class TicTacToeRoom(Room):
+    game = protocol.TICTACTOE
+
+    def __init__(self, size, k):
+        super().__init__()
+        self.board = MNKBoard(size, k=k)
+        self.seats = [None, None]  # X, O
+
+    def join(self, client):
+        if None in self.seats:
+            client.player = self.seats.index(None)
+            self.seats[client.player] = client
+        self.clients.append(client)
+        board = self.board
+        moves = [divmod(i, board.width) for i in board.history]
+        client.send(protocol.welcome(self.game, client.player,
+                                     protocol.tictactoe_snapshot(board.width, board.k, moves)))
+
+    def leave(self, client):
+        super().leave(client)
+        if client.player != protocol.SPECTATOR:
+            self.seats[client.player] = None
+
+    def handle(self, client, kind, body):
+        board = self.board
+        if kind == protocol.MOVE and len(body) == 2:
+            y, x = body
+            if (client.player == board.player - 1 and not board.is_over()
+                    and y < board.height and x < board.width and not board[y, x]):
+                board.play(y, x)
+                self.broadcast(protocol.frame(protocol.PLACED, body))
+        elif kind == protocol.RESET and client.player != protocol.SPECTATOR:
+            board.reset()
+            self.broadcast(protocol.frame(protocol.CLEARED))
+
+
+class SnakeRoom(Room):
+    game = protocol.SNAKE
+
+    def __init__(self, tick):
+        super().__init__()
+        self.arena = arena.SnakeArena(*ARENA)
+        self.period = tick
+        self.task = asyncio.create_task(self.run())
+
+    def join(self, client):
+        free = set(range(SNAKE_PLAYERS)) - {c.player for c in self.clients}
+        if not free:
+            raise ValueError("room is full")
+        client.player = min(free)
+        self.arena.add(client.player)
+        self.clients.append(client)
+        client.send(protocol.welcome(self.game, client.player, self.arena.snapshot()))
+
+    def leave(self, client):
+        super().leave(client)
+        self.arena.remove(client.player)
+
+    def handle(self, client, kind, body):
+        if kind == protocol.MOVE and len(body) == 1 and body[0] < 4:
+            self.arena.turn(client.player, body[0])
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        due = loop.time() + self.period
+        while True:
+            await asyncio.sleep(due - loop.time())
+            events = self.arena.step()
+            self.broadcast(protocol.tick(self.arena.tick, due, arena.encode(events)))
+            # after a stall, carry on from now rather than catching up in a burst
+            due = max(due + self.period, loop.time())
+
+    def close(self):
+        self.task.cancel()
+
+
+class Server:
+    def __init__(self, tick=0.15):
+        self.tick = tick
+        self.rooms = {}  # (game, name) -> room
+
+    def room(self, game, name, size, k):
+        room = self.rooms.get((game, name))
+        if room is None:
+            if game == protocol.TICTACTOE:
+                if not 3 <= size <= MAX_SIZE:
+                    raise ValueError(f"board size must be 3 to {MAX_SIZE}")
+                room = TicTacToeRoom(size, k)
+            elif game == protocol.SNAKE:
+                room = SnakeRoom(self.tick)
+            else:
+                raise ValueError(f"unknown game {game}")
+            self.rooms[game, name] = room
+        return room
+
+    async def serve(self, reader, writer):
+        client = Client(writer)
+        key = room = None
+        try:
+            kind, body = await protocol.read(reader)
+            if kind != protocol.JOIN:
+                raise ValueError("expected JOIN")
+            game, name, size, k = protocol.parse_join(body)
+            key = game, name
+            room = self.room(game, name, size, k)
+            room.join(client)
+            while True:
+                kind, body = await protocol.read(reader)
+                room.handle(client, kind, body)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (ValueError, IndexError, struct.error) as e:
+            # a malformed message from the client: tell it why and hang up
+            writer.write(protocol.error(str(e)))
+        finally:
+            if room is not None:
+                if client in room.clients:
+                    room.leave(client)
+                if not room.clients:
+                    room.close()
+                    del self.rooms[key]
+            writer.close()
+
+
+async def serve(host, port, tick):
+    server = Server(tick)
+    listener = await asyncio.start_server(server.serve, host, port)
+    host, port = listener.sockets[0].getsockname()[:2]
+    print(f"listening on {host}:{port}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tic-tac-toe and snake game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777, help="0 picks a free port")
+    parser.add_argument("--tick", type=float, default=0.15, help="seconds per snake tick")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.tick))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
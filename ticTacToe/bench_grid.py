@@ -0,0 +1,70 @@
+"""
+Startup time and click latency of the PyQt board on the offscreen platform.
+
+Builds and shows a Board for each size, then clicks random empty cells
+(two humans, so no AI time is included) and times each click until its
+repaint has been processed. Finished games are restarted with reset(),
+which is timed separately.
+
+    python bench_grid.py --sizes 3 9 15 19 --clicks 300
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from grid import Board
+
+
+def bench(app, size, clicks, seed=0):
+    start = time.perf_counter()
+    board = Board(size)
+    board.show()
+    app.processEvents()
+    startup = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    latencies, resets = [], []
+    while len(latencies) < clicks:
+        if board.is_win() or board.is_draw():
+            start = time.perf_counter()
+            board.reset()
+            app.processEvents()
+            resets.append(time.perf_counter() - start)
+        y, x = rng.randrange(size), rng.randrange(size)
+        if board.board_values[y][x]:
+            continue
+        start = time.perf_counter()
+        board.button_grid[y][x].click()
+        app.processEvents()
+        latencies.append(time.perf_counter() - start)
+    board.close()
+    return startup, latencies, resets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PyQt board startup and click latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 9, 15, 19])
+    parser.add_argument("--clicks", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = QApplication([])
+    print(f"{'size':>6}{'startup ms':>12}{'click p50':>11}{'click p99':>11}{'reset ms':>10}")
+    for size in args.sizes:
+        startup, latencies, resets = bench(app, size, args.clicks, args.seed)
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        reset = statistics.fmean(resets) if resets else 0.0
+        print(f"{size:>6}{1000 * startup:>12.1f}{1000 * statistics.median(latencies):>11.2f}"
+              f"{1000 * p99:>11.2f}{1000 * reset:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
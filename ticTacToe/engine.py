@@ -0,0 +1,172 @@
+"""
+Perfect-play tic-tac-toe engine.
+
+The whole game tree is solved once at import with negamax, alpha-beta and a
+transposition table keyed by the canonical form of the board, where the 8
+rotations and reflections of a position share one entry. After that every
+AI move is a table lookup.
+
+Boards are 9-character strings of "X", "O" and " " in row-major order; the
+front ends' 3x3 lists of "X"/"O"/"" are converted with to_key().
+"""
+
+import random
+
+LINES = ((0, 1, 2), (3, 4, 5), (6, 7, 8),
+         (0, 3, 6), (1, 4, 7), (2, 5, 8),
+         (0, 4, 8), (2, 4, 6))
+
+# Index permutations for the 8 symmetries of the square:
+# symmetric[i] == board[perm[i]]
+_ROTATE = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+_MIRROR = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+
+
+def _compose(p, q):
+    return tuple(p[q[i]] for i in range(9))
+
+
+SYMMETRIES = []
+_perm = tuple(range(9))
+for _ in range(4):
+    SYMMETRIES.append(_perm)
+    SYMMETRIES.append(_compose(_perm, _MIRROR))
+    _perm = _compose(_perm, _ROTATE)
+
+EXACT, LOWER, UPPER = 0, 1, 2
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def to_key(board):
+    """Normalise a 3x3 list board or a 9-character string to a key string."""
+    if isinstance(board, str):
+        return board
+    return "".join(cell or " " for row in board for cell in row)
+
+
+def to_move(index):
+    return index // 3, index % 3
+
+
+def winner(key):
+    for a, b, c in LINES:
+        if key[a] != " " and key[a] == key[b] == key[c]:
+            return key[a]
+    return None
+
+
+def to_play(key):
+    return "X" if key.count("X") == key.count("O") else "O"
+
+
+def canonical(key):
+    """(canonical key, permutation) with canonical[i] == key[perm[i]]."""
+    return min((("".join(key[i] for i in perm), perm) for perm in SYMMETRIES))
+
+
+class Solver:
+    """Negamax with alpha-beta over canonical positions."""
+
+    def __init__(self):
+        self.table = {}
+        self.nodes = 0
+
+    def negamax(self, key, alpha=-10, beta=10):
+        """Score for the side to move: 1 + empty cells for a win, the negative for a loss, 0 for a draw."""
+        self.nodes += 1
+        if winner(key):
+            # the previous player just completed a line
+            return -(1 + key.count(" "))
+        if " " not in key:
+            return 0
+
+        canon, _ = canonical(key)
+        entry = self.table.get(canon)
+        if entry is not None:
+            value, flag = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            elif flag == UPPER:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        original_alpha = alpha
+        player = to_play(key)
+        best = -10
+        for i in range(9):
+            if key[i] != " ":
+                continue
+            value = -self.negamax(key[:i] + player + key[i + 1:], -beta, -alpha)
+            if value > best:
+                best = value
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[canon] = (best, flag)
+        return best
+
+    def solve(self):
+        """
+        Build {canonical key: {move index: value}} for every reachable
+        position, with each move valued by a full-window search so the
+        values are exact.
+        """
+        moves = {}
+        stack = [" " * 9]
+        while stack:
+            key = stack.pop()
+            canon, _ = canonical(key)
+            if canon in moves or winner(canon) or " " not in canon:
+                continue
+            player = to_play(canon)
+            values = {}
+            for i in range(9):
+                if canon[i] == " ":
+                    child = canon[:i] + player + canon[i + 1:]
+                    values[i] = -self.negamax(child)
+                    stack.append(child)
+            moves[canon] = values
+        return moves
+
+
+_solver = Solver()
+MOVES = _solver.solve()
+
+
+def move_values(board):
+    """{(y, x): value} for every legal move; higher is better for the side to move."""
+    key = to_key(board)
+    canon, perm = canonical(key)
+    return {to_move(perm[i]): value for i, value in MOVES.get(canon, {}).items()}
+
+
+def best_moves(board):
+    values = move_values(board)
+    if not values:
+        return []
+    top = max(values.values())
+    return [move for move, value in values.items() if value == top]
+
+
+def choose_move(board, difficulty="hard", rng=random):
+    """
+    A move for the side to move, or None if the game is over.
+    easy plays randomly, medium plays perfectly half the time, hard always
+    plays perfectly (choosing randomly between equally good moves).
+    """
+    values = move_values(board)
+    if not values:
+        return None
+    if difficulty == "easy" or (difficulty == "medium" and rng.random() < 0.5):
+        return rng.choice(sorted(values))
+    return rng.choice(sorted(best_moves(board)))
@@ -1,37 +1,92 @@
-from PyQt6.QtWidgets import QWidget, QPushButton, QGridLayout, QVBoxLayout, QLabel
+from PyQt6.QtWidgets import QWidget, QPushButton, QGridLayout, QVBoxLayout, QHBoxLayout, QLabel, QComboBox
 from PyQt6.QtCore import Qt
 from functools import partial
 
+import engine
+from mnk import MNKAI, MNKBoard, choose_move
+
+OPPONENTS = ["Human"] + [level.capitalize() for level in engine.DIFFICULTIES]
+
+# One stylesheet for the whole board, parsed once. Cells are styled through
+# the "cell" and "win" dynamic properties instead of per-button stylesheets.
+STYLE = """
+    QWidget {{
+        background-color: #1e1e1e;
+    }}
+    QLabel {{
+        color: white;
+    }}
+    QLabel#status {{
+        font-size: 20px;
+        font-weight: bold;
+    }}
+    QComboBox, QPushButton {{
+        color: white;
+        background-color: #2e2e2e;
+    }}
+    QPushButton[cell="true"] {{
+        background-color: #2e2e2e;
+        color: #ffffff;
+        border: 2px solid #555;
+        border-radius: {radius}px;
+        font-size: {font}pt;
+    }}
+    QPushButton[cell="true"]:hover {{
+        background-color: #3e3e3e;
+    }}
+    QPushButton[cell="true"]:pressed {{
+        background-color: #5e5e5e;
+    }}
+    QPushButton[win="true"] {{
+        color: #00ff00;
+    }}
+"""
+
 
 class Board(QWidget):
-    def __init__(self):
+    def __init__(self, size=3, k=None, budget_ms=500.0):
         super().__init__()
 
+        self.size = size
+        self.game = MNKBoard(size, k=k)
+        self.engine = MNKAI(budget_ms)
         self.player = "X"
-        self.board_values = [["" for _ in range(3)] for _ in range(3)]
-        self.button_grid = [[None for _ in range(3)] for _ in range(3)]
+        self.winner = None  # "X", "O", "Draw" or None while the game goes on
+        self.board_values = [["" for _ in range(size)] for _ in range(size)]
+        self.button_grid = [[None for _ in range(size)] for _ in range(size)]
 
         # Main layout
         main_layout = QVBoxLayout()
 
         # Status label
         self.status_label = QLabel("Player X's turn")
-        self.status_label.setStyleSheet("font-size: 20px; font-weight: bold; color: white;")
+        self.status_label.setObjectName("status")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         main_layout.addWidget(self.status_label)
 
+        # Opponent picker: the computer plays O
+        opponent_layout = QHBoxLayout()
+        opponent_label = QLabel("Opponent:")
+        self.opponent_box = QComboBox()
+        self.opponent_box.addItems(OPPONENTS)
+        self.opponent_box.currentIndexChanged.connect(self.reset)
+        new_game = QPushButton("New game")
+        new_game.clicked.connect(self.reset)
+        opponent_layout.addWidget(opponent_label)
+        opponent_layout.addWidget(self.opponent_box)
+        opponent_layout.addWidget(new_game)
+        main_layout.addLayout(opponent_layout)
+
         # Grid layout for buttons
         grid_layout = QGridLayout()
         grid_layout.setSpacing(5)
 
-        for i in range(3):
-            for j in range(3):
+        cell = max(28, 300 // size)
+        for i in range(size):
+            for j in range(size):
                 button = QPushButton("")
-                button.setFixedSize(100, 100)
-                button.setStyleSheet(self.button_style())
-                font = button.font()
-                font.setPointSize(24)
-                button.setFont(font)
+                button.setFixedSize(cell, cell)
+                button.setProperty("cell", True)
 
                 button.clicked.connect(partial(self.button_clicked, i, j))
                 grid_layout.addWidget(button, i, j)
@@ -39,81 +94,71 @@ class Board(QWidget):
 
         main_layout.addLayout(grid_layout)
         self.setLayout(main_layout)
-        self.setStyleSheet("background-color: #1e1e1e;")
+        self.setStyleSheet(STYLE.format(radius=min(10, cell // 6), font=max(10, cell // 4)))
+
+    @property
+    def ai(self):
+        """Difficulty of the computer opponent, or None for two humans."""
+        index = self.opponent_box.currentIndex()
+        return engine.DIFFICULTIES[index - 1] if index > 0 else None
+
+    def reset(self):
+        # Only the played cells need clearing; Qt folds their repaints into one pass
+        for y, x in self.game.win_cells:
+            self.set_win(self.button_grid[y][x], False)
+        for i in self.game.history:
+            y, x = divmod(i, self.size)
+            self.button_grid[y][x].setText("")
+            self.board_values[y][x] = ""
+        self.game.reset()
+        self.player = "X"
+        self.winner = None
+        self.status_label.setText("Player X's turn")
 
     def button_clicked(self, y, x):
-        if self.board_values[y][x] != "" or self.is_win():
-            return  # ignore if filled or game already won
-
-        # Update board
+        if self.place(y, x) and self.ai:
+            self.repaint()  # show the move while the AI thinks
+            move = choose_move(self.game, self.engine, self.ai)
+            if move:
+                self.place(*move)
+
+    def place(self, y, x):
+        """Put the current player's mark at (y, x); returns True if the game goes on."""
+        if self.board_values[y][x] != "" or self.winner:
+            return False  # ignore if filled or game already over
+
+        # Update board; play() checks only the lines through this cell
+        won = self.game.play(y, x)
         self.board_values[y][x] = self.player
         self.button_grid[y][x].setText(self.player)
 
-        # Check for win
-        if self.is_win():
+        if won:
+            self.winner = self.player
             self.status_label.setText(f"Player {self.player} wins!")
             self.highlight_win()
-        elif self.is_draw():
+        elif self.game.is_full():
+            self.winner = "Draw"
             self.status_label.setText("It's a draw!")
         else:
             # Switch player
             self.player = "O" if self.player == "X" else "X"
             self.status_label.setText(f"Player {self.player}'s turn")
-
-    def is_win(self) -> bool:
-        b = self.board_values
-
-        # Check rows
-        for row in b:
-            if row[0] != "" and row[0] == row[1] == row[2]:
-                return True
-
-        # Check columns
-        for col in range(3):
-            if b[0][col] != "" and b[0][col] == b[1][col] == b[2][col]:
-                return True
-
-        # Check diagonals
-        if b[0][0] != "" and b[0][0] == b[1][1] == b[2][2]:
             return True
-        if b[0][2] != "" and b[0][2] == b[1][1] == b[2][0]:
-            return True
-
         return False
 
+    def is_win(self) -> bool:
+        return self.winner not in (None, "Draw")
+
     def is_draw(self) -> bool:
-        return all(cell != "" for row in self.board_values for cell in row) and not self.is_win()
-
-    def button_style(self, color="#ffffff"):
-        return f"""
-            QPushButton {{
-                background-color: #2e2e2e;
-                color: {color};
-                border: 2px solid #555;
-                border-radius: 10px;
-            }}
-            QPushButton:hover {{
-                background-color: #3e3e3e;
-            }}
-            QPushButton:pressed {{
-                background-color: #5e5e5e;
-            }}
-        """
+        return self.winner == "Draw"
+
+    def set_win(self, button, win):
+        button.setProperty("win", win)
+        # re-evaluate the shared stylesheet for this button only
+        button.style().unpolish(button)
+        button.style().polish(button)
 
     def highlight_win(self):
         """Optional: visually highlight winning line"""
-        b = self.board_values
-        for i in range(3):
-            if b[i][0] != "" and b[i][0] == b[i][1] == b[i][2]:
-                for j in range(3):
-                    self.button_grid[i][j].setStyleSheet(self.button_style("#00ff00"))
-        for j in range(3):
-            if b[0][j] != "" and b[0][j] == b[1][j] == b[2][j]:
-                for i in range(3):
-                    self.button_grid[i][j].setStyleSheet(self.button_style("#00ff00"))
-        if b[0][0] != "" and b[0][0] == b[1][1] == b[2][2]:
-            for k in range(3):
-                self.button_grid[k][k].setStyleSheet(self.button_style("#00ff00"))
-        if b[0][2] != "" and b[0][2] == b[1][1] == b[2][0]:
-            for k in range(3):
-                self.button_grid[k][2-k].setStyleSheet(self.button_style("#00ff00"))
+        for i, j in self.game.win_cells:
+            self.set_win(self.button_grid[i][j], True)
@@ -1,23 +1,34 @@
+import argparse
+
 from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout
 from grid import Board
 
 
 class TicTacToe(QWidget):
-    def __init__(self):
+    def __init__(self, size=3, k=None, budget_ms=500.0):
         super().__init__()
-        self.setWindowTitle("Tic Tac Toe")
+        self.setWindowTitle("Tic Tac Toe" if size == 3 else f"{size}x{size} Tic Tac Toe")
         self.setGeometry(100, 100, 350, 400)
 
         layout = QVBoxLayout()
 
-        board = Board()          # Create the Board instance
+        board = Board(size, k, budget_ms)  # Create the Board instance
         layout.addWidget(board)  # Add it to main layout
 
         self.setLayout(layout)
 
 
-if __name__ == "__main__":
-    app = QApplication([])
-    window = TicTacToe()
+def main(size=3, k=None, budget_ms=500.0):
+    app = QApplication.instance() or QApplication([])
+    window = TicTacToe(size, k, budget_ms)
     window.show()
     app.exec()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tic Tac Toe")
+    parser.add_argument("--size", type=int, default=3, help="board width and height")
+    parser.add_argument("--k", type=int, default=None, help="marks in a row to win (default: min(size, 5))")
+    parser.add_argument("--ai-budget-ms", type=float, default=500.0, help="hard AI thinking time on big boards")
+    args = parser.parse_args()
+    main(args.size, args.k, args.ai_budget_ms)
@@ -0,0 +1,370 @@
+"""
+m,n,k-game engine: k in a row on a width x height board (tic-tac-toe is
+3,3,3, Gomoku is 15,15,5).
+
+MNKBoard keeps, for every length-k window, how many X and O stones it
+holds. Playing or undoing a stone only touches the windows through that
+cell (at most 4k of them), so win detection, the evaluation and the Zobrist
+hash are all updated in O(k) per move instead of rescanning the board.
+
+MNKAI searches with iterative-deepening alpha-beta, a transposition table
+keyed by the Zobrist hash and move ordering from the window counts. On the
+3x3 board the solved table in engine.py is used instead.
+
+    python mnk.py --size 15 --k 5 --budget-ms 500
+    python mnk.py --size 9 --k 5 --check 100
+"""
+
+import argparse
+import random
+import time
+
+import engine
+
+EMPTY, X, O = 0, 1, 2
+MARKS = ("", "X", "O")
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+WIN = 1_000_000_000
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# How many nodes between time-budget checks during a search
+_CHECK_EVERY = 256
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class MNKBoard:
+    def __init__(self, width=3, height=None, k=None, seed=0):
+        self.width = width
+        self.height = width if height is None else height
+        self.k = min(5, self.width, self.height) if k is None else k
+        if not 1 < self.k <= max(self.width, self.height):
+            raise ValueError(f"k={self.k} does not fit a {self.width}x{self.height} board")
+        self.size = self.width * self.height
+
+        # Every run of k cells in a line, and the runs through each cell
+        self.windows = []
+        self.cell_windows = [[] for _ in range(self.size)]
+        for y in range(self.height):
+            for x in range(self.width):
+                for dy, dx in DIRECTIONS:
+                    ey, ex = y + dy * (self.k - 1), x + dx * (self.k - 1)
+                    if 0 <= ey < self.height and 0 <= ex < self.width:
+                        cells = tuple((y + dy * s) * self.width + x + dx * s for s in range(self.k))
+                        for c in cells:
+                            self.cell_windows[c].append(len(self.windows))
+                        self.windows.append(cells)
+        # A window's value to X: 10**n for n X stones and no O, negated for O
+        self.weights = [0] + [10 ** n for n in range(self.k)]
+        # priority() of a cell that completes a window for the opponent, above all
+        # other windows through a cell together, and of one that wins, above that
+        lines = max(map(len, self.cell_windows))
+        self.block_priority = max(WIN, 2 * lines * self.weights[-1])
+        self.win_priority = (lines + 1) * self.block_priority
+
+        rng = random.Random(seed)
+        self.zobrist = [None, [rng.getrandbits(64) for _ in range(self.size)],
+                        [rng.getrandbits(64) for _ in range(self.size)]]
+        self.reset()
+
+    def reset(self):
+        self.cells = bytearray(self.size)
+        self.counts = [[0] * len(self.windows) for _ in range(3)]  # indexed by X / O
+        self.score = 0  # sum of window values, from X's point of view
+        self.hash = 0
+        self.history = []
+        self.winner = None
+        self.win_cells = []
+
+    def __getitem__(self, pos):
+        return MARKS[self.cells[pos[0] * self.width + pos[1]]]
+
+    @property
+    def player(self):
+        return X if len(self.history) % 2 == 0 else O
+
+    @property
+    def mark(self):
+        """The mark of the player to move."""
+        return MARKS[self.player]
+
+    def is_full(self):
+        return len(self.history) == self.size
+
+    def is_over(self):
+        return self.winner is not None or self.is_full()
+
+    def rows(self):
+        return [[self[y, x] for x in range(self.width)] for y in range(self.height)]
+
+    def key(self):
+        """9-character key for engine.py (3x3 boards only)."""
+        return "".join(MARKS[c] or " " for c in self.cells)
+
+    def _window_value(self, w):
+        xs, os = self.counts[X][w], self.counts[O][w]
+        if os == 0:
+            return self.weights[xs]
+        if xs == 0:
+            return -self.weights[os]
+        return 0
+
+    def play(self, y, x):
+        """Place the current player's mark; returns True if it wins."""
+        if self.winner is not None:
+            raise ValueError("game is over")
+        i = y * self.width + x
+        if self.cells[i]:
+            raise ValueError(f"({y}, {x}) is taken")
+        player = self.player
+        counts = self.counts[player]
+        for w in self.cell_windows[i]:
+            self.score -= self._window_value(w)
+            counts[w] += 1
+            self.score += self._window_value(w)
+            if counts[w] == self.k and self.winner is None:
+                self.winner = MARKS[player]
+                self.win_cells = [divmod(c, self.width) for c in self.windows[w]]
+        self.cells[i] = player
+        self.hash ^= self.zobrist[player][i]
+        self.history.append(i)
+        return self.winner is not None
+
+    def undo(self):
+        i = self.history.pop()
+        player = self.cells[i]
+        counts = self.counts[player]
+        for w in self.cell_windows[i]:
+            self.score -= self._window_value(w)
+            counts[w] -= 1
+            self.score += self._window_value(w)
+        self.cells[i] = EMPTY
+        self.hash ^= self.zobrist[player][i]
+        self.winner = None
+        self.win_cells = []
+
+    def candidates(self, radius=1):
+        """Empty cells within radius of a stone (the centre on an empty board)."""
+        if not self.history:
+            return [(self.height // 2) * self.width + self.width // 2]
+        if self.size <= 16:
+            return [i for i in range(self.size) if not self.cells[i]]
+        width, height = self.width, self.height
+        seen = set()
+        for i in self.history:
+            y, x = divmod(i, width)
+            for ny in range(max(0, y - radius), min(height, y + radius + 1)):
+                for nx in range(max(0, x - radius), min(width, x + radius + 1)):
+                    j = ny * width + nx
+                    if not self.cells[j]:
+                        seen.add(j)
+        return sorted(seen)
+
+    def priority(self, i):
+        """
+        How much a cell matters to either side: the windows it would extend
+        or block. A cell that wins for the player to move comes first, then
+        one the opponent would win on.
+        """
+        xs, os, weights, k = self.counts[X], self.counts[O], self.weights, self.k
+        if self.player == X:
+            mine, theirs = self.win_priority, self.block_priority
+        else:
+            mine, theirs = self.block_priority, self.win_priority
+        total = 0
+        for w in self.cell_windows[i]:
+            if os[w] == 0:
+                total += mine if xs[w] + 1 >= k else weights[xs[w] + 1]
+            if xs[w] == 0:
+                total += theirs if os[w] + 1 >= k else weights[os[w] + 1]
+        return total
+
+
+class MNKAI:
+    """Iterative-deepening alpha-beta with a Zobrist-keyed transposition table."""
+
+    def __init__(self, budget_ms=500.0, max_depth=None, branching=12, table_size=1_000_000):
+        self.budget = budget_ms / 1000
+        self.max_depth = max_depth
+        self.branching = branching
+        self.table = {}
+        self.table_size = table_size
+        self.nodes = 0
+        self.decisions = 0
+        self.total_time = 0.0
+        self.depth_reached = 0
+
+    @property
+    def avg_latency_ms(self):
+        return 1000 * self.total_time / self.decisions if self.decisions else 0.0
+
+    def ordered(self, board, first=None):
+        moves = sorted(board.candidates(), key=board.priority, reverse=True)
+        if len(moves) > self.branching and board.size > 16:
+            moves = moves[:self.branching]
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def search(self, board, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes % _CHECK_EVERY == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        if board.winner is not None:
+            return -(WIN - ply)  # the player who just moved won
+        if board.is_full():
+            return 0
+        if depth == 0:
+            return board.score if board.player == X else -board.score
+
+        entry = self.table.get(board.hash)
+        best_move = None
+        if entry is not None:
+            e_depth, value, flag, best_move = entry
+            if e_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                elif flag == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        original_alpha = alpha
+        best = -WIN - 1
+        width = board.width
+        for i in self.ordered(board, best_move):
+            board.play(*divmod(i, width))
+            value = -self.search(board, depth - 1, -beta, -alpha, ply + 1)
+            board.undo()
+            if value > best:
+                best, best_move = value, i
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        flag = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+        if len(self.table) >= self.table_size:
+            self.table.clear()
+        self.table[board.hash] = (depth, best, flag, best_move)
+        return best
+
+    def choose(self, board):
+        """(y, x) of the best move found within the budget, or None if the game is over."""
+        if board.is_over():
+            return None
+        start = time.perf_counter()
+        self.deadline = start + self.budget
+        depth_limit = board.size - len(board.history)
+        if self.max_depth is not None:
+            depth_limit = min(depth_limit, self.max_depth)
+        moves = self.ordered(board)
+        best = moves[0]
+        root = len(board.history)
+        self.depth_reached = 0
+        try:
+            for depth in range(1, depth_limit + 1):
+                self.search(board, depth, -WIN - 1, WIN + 1, 0)
+                best = self.table[board.hash][3]
+                self.depth_reached = depth
+                if abs(self.table[board.hash][1]) >= WIN - board.size:
+                    break  # forced win or loss found
+        except SearchTimeout:
+            while len(board.history) > root:
+                board.undo()
+        self.decisions += 1
+        self.total_time += time.perf_counter() - start
+        return divmod(best, board.width)
+
+
+def choose_move(board, ai=None, difficulty="hard", rng=random):
+    """
+    A move for the side to move on an MNKBoard. easy plays a random nearby
+    cell, medium searches two plies, hard searches until ai's budget runs out.
+    """
+    if board.is_over():
+        return None
+    if (board.width, board.height, board.k) == (3, 3, 3):
+        return engine.choose_move(board.key(), difficulty, rng)
+    if difficulty == "easy":
+        return divmod(rng.choice(board.candidates()), board.width)
+    ai = ai or MNKAI()
+    if difficulty == "medium":
+        max_depth, ai.max_depth = ai.max_depth, 2
+        try:
+            return ai.choose(board)
+        finally:
+            ai.max_depth = max_depth
+    return ai.choose(board)
+
+
+def check_priority(board, games, seed=0):
+    """
+    Play random games, and in every position check that each cell winning
+    for the player to move outranks every other cell, and each cell the
+    opponent would win on outranks every cell that neither wins nor blocks.
+    Returns the number of positions checked.
+    """
+    rng = random.Random(seed)
+    positions = 0
+    for _ in range(games):
+        board.reset()
+        while not board.is_over():
+            empty = [i for i in range(board.size) if not board.cells[i]]
+            wins, blocks = set(), set()
+            for i in empty:
+                if board.play(*divmod(i, board.width)):
+                    wins.add(i)
+                board.undo()
+            for i in empty:
+                # every other cell of the opponent's line holds its mark, so any other move of ours leaves it open
+                other = next((j for j in empty if j != i and j not in wins), None)
+                if other is not None:
+                    board.play(*divmod(other, board.width))
+                    if board.play(*divmod(i, board.width)):
+                        blocks.add(i)
+                    board.undo()
+                    board.undo()
+            scores = {i: board.priority(i) for i in empty}
+            rest = [scores[i] for i in empty if i not in wins and i not in blocks]
+            if wins and min(scores[i] for i in wins) <= max((scores[i] for i in empty if i not in wins), default=-1):
+                raise SystemExit(f"a winning cell does not come first after {board.history}")
+            if blocks and min(scores[i] for i in blocks) <= max(rest, default=-1):
+                raise SystemExit(f"a blocking cell does not outrank the rest after {board.history}")
+            positions += 1
+            board.play(*divmod(rng.choice(empty), board.width))
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Let the m,n,k AI play itself")
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--k", type=int, default=None)
+    parser.add_argument("--budget-ms", type=float, default=500.0)
+    parser.add_argument("--max-depth", type=int, default=None)
+    parser.add_argument("--check", type=int, metavar="GAMES",
+                        help="instead, play GAMES random games checking that priority() puts wins and blocks first")
+    args = parser.parse_args()
+
+    board = MNKBoard(args.size, k=args.k)
+    if args.check:
+        positions = check_priority(board, args.check)
+        print(f"priority() ranked wins and blocks first in {positions} positions")
+        return
+    ai = MNKAI(args.budget_ms, args.max_depth)
+    while not board.is_over():
+        y, x = ai.choose(board)
+        board.play(y, x)
+        print(f"{MARKS[board.cells[y * board.width + x]]} plays ({y}, {x}) depth {ai.depth_reached}")
+    for row in board.rows():
+        print(" ".join(cell or "." for cell in row))
+    print(f"{board.winner or 'Nobody'} wins after {len(board.history)} moves; "
+          f"{ai.nodes / max(1e-9, ai.total_time):,.0f} nodes/s, avg decision {ai.avg_latency_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
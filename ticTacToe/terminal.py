@@ -6,28 +6,61 @@ Terminal Tic-Tac-Toe using curses.
  - r to restart
  - q to quit
 Smooth rendering with minimal flicker, colors, and win highlight.
+
+    python terminal.py --ai hard --ai-plays O
+    python terminal.py --size 15 --k 5 --ai hard
+    python terminal.py --connect localhost:7777 --room friends
+
+With --connect the game is played on a server (terminalgames/server.py):
+the first two players in a room get X and O, later ones watch, and a mark
+only shows up once the server has accepted it.
 """
 
+import argparse
+import asyncio
 import curses
-from curses import wrapper
+import os
+import sys
+
+import engine
+from mnk import MNKAI, MNKBoard, choose_move
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from terminalgames import protocol, replay, runtime
+from terminalgames.render import Screen
 
 
 class CursesTicTacToe:
-    def __init__(self, stdscr):
+    def __init__(self, stdscr, ai=None, ai_player="O", size=3, k=None, budget_ms=500.0):
         self.stdscr = stdscr
+        self.screen = Screen(stdscr)
+        self.ai = ai  # difficulty, or None for two humans
+        self.ai_player = ai_player
+        self.size = size
+        self.game = MNKBoard(size, k=k)
+        self.engine = MNKAI(budget_ms)
+        self.room = None  # online: the room's name
+        self.seat = None  # online: our mark, None when watching
         self.reset()
 
     def reset(self):
-        self.board = [["" for _ in range(3)] for _ in range(3)]
+        self.game.reset()
+        self.board = [["" for _ in range(self.size)] for _ in range(self.size)]
         self.player = "X"
         self.cursor_y = 0
         self.cursor_x = 0
         self.winner = None
         self.win_cells = []  # list of (y,x) tuples that are winning line
+        self.ai_move()
 
-    def start(self):
+    def ai_move(self):
+        if self.ai and not self.winner and self.player == self.ai_player:
+            move = choose_move(self.game, self.engine, self.ai)
+            if move:
+                self.try_move(*move)
+
+    def setup(self):
         curses.curs_set(0)  # hide real cursor
-        self.stdscr.nodelay(False)  # blocking input
         self.stdscr.keypad(True)  # arrow keys, etc
         if curses.has_colors():
             curses.start_color()
@@ -38,6 +71,24 @@ class CursesTicTacToe:
             curses.init_pair(4, curses.COLOR_BLACK, curses.COLOR_WHITE)  # cursor bg
             curses.init_pair(5, curses.COLOR_GREEN, curses.COLOR_BLACK)  # winning highlight
 
+    def move_cursor(self, key):
+        """Move the cursor for an arrow or hjkl key; False for any other key."""
+        if key in (curses.KEY_UP, ord("k")):
+            self.cursor_y = (self.cursor_y - 1) % self.size
+        elif key in (curses.KEY_DOWN, ord("j")):
+            self.cursor_y = (self.cursor_y + 1) % self.size
+        elif key in (curses.KEY_LEFT, ord("h")):
+            self.cursor_x = (self.cursor_x - 1) % self.size
+        elif key in (curses.KEY_RIGHT, ord("l")):
+            self.cursor_x = (self.cursor_x + 1) % self.size
+        else:
+            return False
+        return True
+
+    def start(self):
+        self.setup()
+        self.stdscr.nodelay(False)  # blocking input
+
         while True:
             self.render()
             key = self.stdscr.getch()
@@ -46,22 +97,71 @@ class CursesTicTacToe:
                 break
             elif key in (ord("r"), ord("R")):
                 self.reset()
-            elif key in (curses.KEY_UP, ord("k")):
-                self.cursor_y = (self.cursor_y - 1) % 3
-            elif key in (curses.KEY_DOWN, ord("j")):
-                self.cursor_y = (self.cursor_y + 1) % 3
-            elif key in (curses.KEY_LEFT, ord("h")):
-                self.cursor_x = (self.cursor_x - 1) % 3
-            elif key in (curses.KEY_RIGHT, ord("l")):
-                self.cursor_x = (self.cursor_x + 1) % 3
+            elif self.move_cursor(key):
+                pass
             elif key in (curses.KEY_ENTER, 10, 13, ord(" ")):
-                self.try_move(self.cursor_y, self.cursor_x)
+                if self.player != self.ai_player or not self.ai:
+                    self.try_move(self.cursor_y, self.cursor_x)
+                    if self.ai and not self.winner:
+                        self.render()  # show the move while the AI thinks
+                        self.ai_move()
+
+    async def play_online(self, rt, host, port, room):
+        """Play in a room on the server: keys go out as requests, the board changes only with its replies."""
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(protocol.join(protocol.TICTACTOE, room, self.size, self.game.k))
+        kind, body = await protocol.read(reader)
+        if kind == protocol.ERROR:
+            raise SystemExit(f"server: {body.decode()}")
+        _, player, snapshot = protocol.parse_welcome(body)
+        self.size, k, moves = protocol.parse_tictactoe_snapshot(snapshot)
+        self.game = MNKBoard(self.size, k=k)
+        self.reset()
+        for y, x in moves:
+            self.try_move(y, x)
+        self.room = room
+        self.seat = None if player == protocol.SPECTATOR else "XO"[player]
+        self.setup()
+
+        async def receive():
+            while True:
+                try:
+                    kind, body = await protocol.read(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return  # the server went away
+                if kind == protocol.PLACED:
+                    self.try_move(*body)
+                elif kind == protocol.CLEARED:
+                    self.reset()
+                self.render()
+
+        async def keys():
+            while True:
+                self.render()
+                key = await rt.key()
+                if key in (ord("q"), ord("Q")):
+                    return
+                elif key in (ord("r"), ord("R")):
+                    writer.write(protocol.frame(protocol.RESET))
+                elif self.move_cursor(key):
+                    pass
+                elif key in (curses.KEY_ENTER, 10, 13, ord(" ")) and self.player == self.seat:
+                    writer.write(protocol.frame(protocol.MOVE, bytes((self.cursor_y, self.cursor_x))))
+
+        tasks = [asyncio.create_task(receive()), asyncio.create_task(keys())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
 
     def try_move(self, y, x):
         if self.winner:
             return  # game over
         if self.board[y][x] != "":
             return  # already taken
+        self.game.play(y, x)
         self.board[y][x] = self.player
         if self.check_win():
             self.winner = self.player
@@ -71,96 +171,72 @@ class CursesTicTacToe:
             self.player = "O" if self.player == "X" else "X"
 
     def check_win(self):
-        b = self.board
-        # rows
-        for i in range(3):
-            if b[i][0] != "" and b[i][0] == b[i][1] == b[i][2]:
-                self.win_cells = [(i, 0), (i, 1), (i, 2)]
-                return True
-        # cols
-        for j in range(3):
-            if b[0][j] != "" and b[0][j] == b[1][j] == b[2][j]:
-                self.win_cells = [(0, j), (1, j), (2, j)]
-                return True
-        # diag
-        if b[0][0] != "" and b[0][0] == b[1][1] == b[2][2]:
-            self.win_cells = [(0, 0), (1, 1), (2, 2)]
-            return True
-        if b[0][2] != "" and b[0][2] == b[1][1] == b[2][0]:
-            self.win_cells = [(0, 2), (1, 1), (2, 0)]
-            return True
-        self.win_cells = []
-        return False
+        # the board checks the lines through the last move as it is played
+        self.win_cells = self.game.win_cells
+        return self.game.winner is not None
 
     def check_draw(self):
-        return all(cell != "" for row in self.board for cell in row)
+        return self.game.is_full()
 
-    def render(self):
-        self.stdscr.erase()
+    def layout(self):
+        """(start_y, start_x, cell_w, cell_h, board_h); cell_w 0 means one character per cell."""
         h, w = self.stdscr.getmaxyx()
+        n = self.size
+        # shrink the cells for big boards
+        for cell_w, cell_h in ((5, 3), (4, 2)):
+            board_w = cell_w * n + 2  # plus vertical lines
+            board_h = cell_h * n + 2  # plus horizontal lines
+            if board_w < w and board_h + 5 < h:
+                break
+        else:
+            cell_w, cell_h = 0, 0
+            board_w, board_h = 2 * n, n + 1
+        start_y = max(4, (h - board_h) // 2)
+        start_x = max(2, (w - board_w) // 2)
+        return start_y, start_x, cell_w, cell_h, board_h
 
-        # Title / help area
+    def paint_static(self, canvas, start_y, start_x, cell_w, cell_h):
+        """Title, help and grid lines: painted once per layout, not every keypress."""
+        attr = curses.color_pair(1)
         title = "Terminal Tic-Tac-Toe"
+        if self.ai:
+            title += f" (vs {self.ai} AI as {self.ai_player})"
+        elif self.room is not None:
+            title += f" (room {self.room}, {f'you are {self.seat}' if self.seat else 'watching'})"
         help_text = "Arrows/hjkl: move • Enter/Space: place • r: restart • q: quit"
-        self.stdscr.attron(curses.color_pair(1))
-        self.stdscr.addstr(1, (w - len(title)) // 2, title)
-        self.stdscr.addstr(2, (w - len(help_text)) // 2, help_text)
-
-        # Determine top-left of board to center it
-        cell_w = 5  # width of one cell text area
-        cell_h = 3  # height of one cell text area
-        board_w = cell_w * 3 + 2  # plus vertical lines
-        board_h = cell_h * 3 + 2  # plus horizontal lines
-        start_y = max(4, (h - board_h) // 2)
-        start_x = max(2, (w - board_w) // 2)
+        canvas.put(1, max(0, (canvas.width - len(title)) // 2), title, attr)
+        canvas.put(2, max(0, (canvas.width - len(help_text)) // 2), help_text, attr)
+        if not cell_w:
+            return
+        n = self.size
+        top, left = start_y - 1, start_x - 1
+        for i in range(n + 1):
+            y = top + i * cell_h
+            l, m, r = ("┌", "┬", "┐") if i == 0 else ("└", "┴", "┘") if i == n else ("├", "┼", "┤")
+            canvas.put(y, left, l + m.join(["─" * (cell_w - 1)] * n) + r, attr)
+            if i < n:
+                for dy in range(1, cell_h):
+                    canvas.put(y + dy, left, "│".join([""] + [" " * (cell_w - 1)] * n + [""]), attr)
 
-        # Draw grid with box-drawing characters
-        # We'll draw cell areas and put mark centered in each cell
-        for i in range(3):
-            for j in range(3):
-                top = start_y + i * (cell_h)
-                left = start_x + j * (cell_w)
-                # draw cell border (simple)
-                for dx in range(cell_w):
-                    # top border
-                    self.stdscr.addch(top - 1, left + dx, curses.ACS_HLINE)
-                    # bottom border
-                    self.stdscr.addch(top + cell_h - 1, left + dx, curses.ACS_HLINE)
-                for dy in range(cell_h):
-                    # left border
-                    self.stdscr.addch(top + dy - 1, left - 1, curses.ACS_VLINE)
-                    # right border
-                    self.stdscr.addch(top + dy - 1, left + cell_w - 1, curses.ACS_VLINE)
-
-        # put intersections (corners)
-        # top-left corner
-        self.stdscr.addch(start_y - 1, start_x - 1, curses.ACS_ULCORNER)
-        self.stdscr.addch(start_y - 1, start_x + board_w - 2, curses.ACS_URCORNER)
-        self.stdscr.addch(start_y + board_h - 2, start_x - 1, curses.ACS_LLCORNER)
-        self.stdscr.addch(start_y + board_h - 2, start_x + board_w - 2, curses.ACS_LRCORNER)
-        # internal intersections: draw vertical and horizontal separators
-        # vertical separators
-        for i in range(3):
-            for sep in (1, 2):
-                y = start_y + i * cell_h - 1
-                x = start_x + sep * cell_w - 1
-                self.stdscr.addch(y, x, curses.ACS_VLINE)
-        # horizontal separators
-        for j in range(3):
-            for sep in (1, 2):
-                y = start_y + sep * cell_h - 1
-                x = start_x + j * cell_w - 1
-                self.stdscr.addch(y, x, curses.ACS_HLINE)
+    def render(self):
+        screen = self.screen
+        start_y, start_x, cell_w, cell_h, board_h = layout = self.layout()
+        screen.layer("static", lambda canvas: self.paint_static(canvas, *layout[:4]), key=layout)
+        screen.begin()
 
         # Render each cell content
-        for i in range(3):
-            for j in range(3):
-                top = start_y + i * (cell_h) - 1
-                left = start_x + j * (cell_w) - 1
-                # position to put the mark centered
-                mark_y = top + cell_h // 2
-                mark_x = left + cell_w // 2
-                ch = self.board[i][j] or " "
+        for i in range(self.size):
+            for j in range(self.size):
+                if cell_w:
+                    top = start_y + i * cell_h
+                    left = start_x + j * cell_w
+                    # position to put the mark centered
+                    mark_y = top + (cell_h - 2) // 2
+                    mark_x = left + (cell_w - 2) // 2
+                    ch = self.board[i][j] or " "
+                else:
+                    mark_y, mark_x = start_y + i, start_x + 2 * j
+                    ch = self.board[i][j] or "."
                 attr = curses.color_pair(1)
                 if ch == "X":
                     attr = curses.color_pair(2) | curses.A_BOLD
@@ -173,43 +249,48 @@ class CursesTicTacToe:
 
                 # highlight cursor background when that cell is selected and game not over
                 if (i, j) == (self.cursor_y, self.cursor_x) and not self.winner:
-                    # invert or use special bg
-                    # We'll draw a small background rectangle for the cell
-                    for ry in range(cell_h - 1):
-                        for rx in range(cell_w - 1):
-                            try:
-                                self.stdscr.addch(top + 1 + ry, left + 1 + rx, " ", curses.color_pair(4))
-                            except curses.error:
-                                pass
-                    # place the mark char over it
-                    try:
-                        self.stdscr.addstr(mark_y, mark_x, ch, curses.color_pair(4) | curses.A_BOLD)
-                    except curses.error:
-                        pass
-                else:
-                    try:
-                        self.stdscr.addstr(mark_y, mark_x, ch, attr)
-                    except curses.error:
-                        pass
+                    attr = curses.color_pair(4) | curses.A_BOLD
+                    if cell_w:
+                        screen.fill(top, left, cell_h - 1, cell_w - 1, " ", curses.color_pair(4))
+                screen.put(mark_y, mark_x, ch, attr)
 
         # Status line
         status = ""
         if self.winner is None:
-            status = f"Player {self.player}'s turn"
+            status = "Your turn" if self.seat and self.player == self.seat else f"Player {self.player}'s turn"
         elif self.winner == "Draw":
             status = "It's a draw! (r to restart)"
         else:
             status = f"Player {self.winner} wins! (r to restart)"
 
-        self.stdscr.addstr(start_y + board_h, max(0, (w - len(status)) // 2), status, curses.color_pair(1) | curses.A_BOLD)
+        screen.put(start_y + board_h, max(0, (screen.width - len(status)) // 2), status,
+                   curses.color_pair(1) | curses.A_BOLD)
+        screen.present()
 
-        self.stdscr.refresh()
+def main(stdscr, ai=None, ai_player="O", size=3, k=None, budget_ms=500.0):
+    game = CursesTicTacToe(stdscr, ai, ai_player, size, k, budget_ms)
+    game.start()
+    return {"board": ["".join(cell or "." for cell in row) for row in game.board], "winner": game.winner}
 
 
-def main(stdscr):
-    game = CursesTicTacToe(stdscr)
-    game.start()
+def main_online(stdscr, address, room, size=3, k=None):
+    game = CursesTicTacToe(stdscr, size=size, k=k)
+    runtime.run(stdscr, game.play_online, *protocol.parse_address(address), room)
 
 
 if __name__ == "__main__":
-    wrapper(main)
+    parser = argparse.ArgumentParser(description="Terminal Tic-Tac-Toe")
+    parser.add_argument("--ai", choices=engine.DIFFICULTIES, help="play against the computer")
+    parser.add_argument("--ai-plays", choices=("X", "O"), default="O", help="which mark the computer plays")
+    parser.add_argument("--ai-budget-ms", type=float, default=500.0, help="hard AI thinking time on big boards")
+    parser.add_argument("--size", type=int, default=3, help="board width and height")
+    parser.add_argument("--k", type=int, default=None, help="marks in a row to win (default: min(size, 5))")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="play on a game server")
+    parser.add_argument("--room", default="lobby", help="room to join on the server")
+    args = replay.parse_args(parser)
+    if args.connect:
+        if args.record or args.replay:
+            parser.error("online games cannot be recorded")
+        curses.wrapper(main_online, args.connect, args.room, args.size, args.k)
+    else:
+        replay.run(main, args, args.ai, args.ai_plays, args.size, args.k, args.ai_budget_ms)
@@ -0,0 +1,313 @@
+"""
+Headless round-robin tournaments between tic-tac-toe strategies.
+
+Every pair of strategies plays the same number of games with each colour
+on an MNKBoard, spread across a process pool. Each game gets its own seed
+derived from --seed, and minimax searches to a fixed --minimax-depth
+while mcts runs a fixed --mcts-iterations playouts, so the same command
+plays the same games on any machine and with any number of workers.
+--budget-ms gives both a thinking time per move instead, which plays to
+their strength on the machine at hand but no longer repeats exactly. The
+summary has the win/draw/loss matrix, Elo ratings fitted to all results,
+and each strategy's moves per second.
+
+    python tournament.py --games 50
+    python tournament.py --size 7 --k 4 --players random heuristic mcts --csv games.csv --json run.json
+    python tournament.py --size 7 --k 4 --budget-ms 20
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+
+from mnk import MARKS, MNKAI, MNKBoard, X
+
+
+class RandomPlayer:
+    def __init__(self, budget_ms):
+        pass
+
+    def choose(self, board, rng):
+        return divmod(rng.choice(board.candidates()), board.width)
+
+
+class HeuristicPlayer(RandomPlayer):
+    """Win if possible, else block, else take the cell that touches the most live lines."""
+
+    def choose(self, board, rng):
+        moves = board.candidates()
+        for i in moves:
+            y, x = divmod(i, board.width)
+            if board.play(y, x):
+                board.undo()
+                return y, x
+            board.undo()
+        # the opponent wins on i if it does after any other move of ours: every
+        # other cell of its line already holds its mark, and none of ours wins
+        for i in moves:
+            other = next((j for j in range(board.size) if j != i and not board.cells[j]), None)
+            if other is None:
+                break
+            board.play(*divmod(other, board.width))
+            wins = board.play(*divmod(i, board.width))
+            board.undo()
+            board.undo()
+            if wins:
+                return divmod(i, board.width)
+        top = max(board.priority(i) for i in moves)
+        return divmod(rng.choice([i for i in moves if board.priority(i) == top]), board.width)
+
+
+class MinimaxPlayer:
+    """Iterative-deepening alpha-beta from mnk.py, to depth plies or until the time budget runs out."""
+
+    def __init__(self, budget_ms, depth=4):
+        if budget_ms is None:
+            self.ai = MNKAI(math.inf, max_depth=depth)
+        else:
+            self.ai = MNKAI(budget_ms)
+
+    def choose(self, board, rng):
+        return self.ai.choose(board)
+
+
+class _Node:
+    __slots__ = ("move", "parent", "children", "untried", "wins", "visits")
+
+    def __init__(self, move, parent, untried):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.wins = 0.0  # for the player who made self.move
+        self.visits = 0
+
+
+class MCTSPlayer:
+    """
+    UCT with random playouts. Stops after a fixed number of iterations, or
+    when the time budget runs out if there is one.
+    """
+
+    exploration = 1.4
+
+    def __init__(self, budget_ms, iterations=1000):
+        self.budget = None if budget_ms is None else budget_ms / 1000
+        self.iterations = iterations
+
+    def choose(self, board, rng):
+        deadline = None if self.budget is None else time.perf_counter() + self.budget
+        root = _Node(None, None, board.candidates())
+        rng.shuffle(root.untried)
+        root_len = len(board.history)
+        while True:
+            node = root
+            # selection
+            while not node.untried and node.children:
+                log_n = math.log(node.visits)
+                node = max(node.children, key=lambda c: c.wins / c.visits
+                           + self.exploration * math.sqrt(log_n / c.visits))
+                board.play(*divmod(node.move, board.width))
+            # expansion
+            if node.untried and not board.is_over():
+                move = node.untried.pop()
+                board.play(*divmod(move, board.width))
+                untried = board.candidates() if not board.is_over() else []
+                rng.shuffle(untried)
+                child = _Node(move, node, untried)
+                node.children.append(child)
+                node = child
+            # playout over the empty cells in random order
+            depth = len(board.history)
+            if not board.is_over():
+                empty = [i for i in range(board.size) if not board.cells[i]]
+                rng.shuffle(empty)
+                for i in empty:
+                    if board.play(*divmod(i, board.width)):
+                        break
+            winner = board.winner
+            while len(board.history) > depth:
+                board.undo()
+            # backpropagation
+            while node is not root:
+                mover = MARKS[board.cells[node.move]]
+                node.visits += 1
+                node.wins += 1.0 if winner == mover else 0.5 if winner is None else 0.0
+                board.undo()
+                node = node.parent
+            root.visits += 1
+            if root.visits >= self.iterations if deadline is None else time.perf_counter() > deadline:
+                break
+        assert len(board.history) == root_len
+        best = max(root.children, key=lambda c: c.visits)
+        return divmod(best.move, board.width)
+
+
+STRATEGIES = {
+    "random": RandomPlayer,
+    "heuristic": HeuristicPlayer,
+    "minimax": MinimaxPlayer,
+    "mcts": MCTSPlayer,
+}
+
+
+def make_player(name, budget_ms=None, mcts_iterations=1000, minimax_depth=4):
+    if name == "mcts":
+        return MCTSPlayer(budget_ms, mcts_iterations)
+    if name == "minimax":
+        return MinimaxPlayer(budget_ms, minimax_depth)
+    return STRATEGIES[name](budget_ms)
+
+
+def play(task):
+    """Play one game; runs in a worker process."""
+    index, x_name, o_name, seed, size, k, budget_ms, mcts_iterations, minimax_depth = task
+    rng = random.Random(seed)
+    board = MNKBoard(size, k=k)
+    players = {X: make_player(x_name, budget_ms, mcts_iterations, minimax_depth),
+               3 - X: make_player(o_name, budget_ms, mcts_iterations, minimax_depth)}
+    think = {X: 0.0, 3 - X: 0.0}
+    moves = {X: 0, 3 - X: 0}
+    while not board.is_over():
+        player = board.player
+        start = time.perf_counter()
+        y, x = players[player].choose(board, rng)
+        think[player] += time.perf_counter() - start
+        moves[player] += 1
+        board.play(y, x)
+    return {
+        "game": index,
+        "seed": seed,
+        "x": x_name,
+        "o": o_name,
+        "winner": board.winner or "draw",
+        "moves": len(board.history),
+        "x_seconds": think[X],
+        "o_seconds": think[3 - X],
+        "x_moves": moves[X],
+        "o_moves": moves[3 - X],
+    }
+
+
+def fit_elo(names, results, iterations=200):
+    """Elo ratings (mean 1500) that best explain the results, draws counting half."""
+    ratings = dict.fromkeys(names, 0.0)
+    games = []
+    for r in results:
+        score = 1.0 if r["winner"] == "X" else 0.0 if r["winner"] == "O" else 0.5
+        games.append((r["x"], r["o"], score))
+    for _ in range(iterations):
+        gradient = dict.fromkeys(names, 0.0)
+        for a, b, score in games:
+            expected = 1 / (1 + 10 ** ((ratings[b] - ratings[a]) / 400))
+            gradient[a] += score - expected
+            gradient[b] -= score - expected
+        for name in names:
+            ratings[name] += 32 * gradient[name] / max(1, len(games) / len(names))
+        mean = sum(ratings.values()) / len(ratings)
+        for name in names:
+            ratings[name] -= mean
+    return {name: 1500 + rating for name, rating in ratings.items()}
+
+
+def tournament(players, games=20, size=3, k=None, seed=0, budget_ms=None, mcts_iterations=1000,
+               minimax_depth=4, workers=None):
+    """Run the round robin and return (per-game results, summary)."""
+    tasks = []
+    for x_name, o_name in permutations(players, 2):
+        for _ in range(games):
+            tasks.append((len(tasks), x_name, o_name, seed * 1_000_003 + len(tasks), size, k,
+                          budget_ms, mcts_iterations, minimax_depth))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(pool.map(play, tasks, chunksize=max(1, len(tasks) // (8 * (workers or os.cpu_count() or 1)))))
+    wall = time.perf_counter() - start
+
+    matrix = {a: {b: [0, 0, 0] for b in players if b != a} for a in players}  # W, D, L of row vs column
+    move_count = dict.fromkeys(players, 0)
+    think = dict.fromkeys(players, 0.0)
+    for r in results:
+        x_name, o_name = r["x"], r["o"]
+        if r["winner"] == "X":
+            matrix[x_name][o_name][0] += 1
+            matrix[o_name][x_name][2] += 1
+        elif r["winner"] == "O":
+            matrix[x_name][o_name][2] += 1
+            matrix[o_name][x_name][0] += 1
+        else:
+            matrix[x_name][o_name][1] += 1
+            matrix[o_name][x_name][1] += 1
+        move_count[x_name] += r["x_moves"]
+        move_count[o_name] += r["o_moves"]
+        think[x_name] += r["x_seconds"]
+        think[o_name] += r["o_seconds"]
+
+    summary = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "players": list(players),
+        "games_per_pairing": games,
+        "size": size,
+        "k": MNKBoard(size, k=k).k,
+        "seed": seed,
+        "budget_ms": budget_ms,
+        "mcts_iterations": mcts_iterations,
+        "minimax_depth": minimax_depth,
+        "wall_seconds": wall,
+        "matrix": matrix,
+        "elo": fit_elo(players, results),
+        "moves_per_s": {p: move_count[p] / think[p] if think[p] else 0.0 for p in players},
+    }
+    return results, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament between tic-tac-toe strategies")
+    parser.add_argument("--players", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--games", type=int, default=20, help="games per pairing and colour")
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--k", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="thinking time per move for minimax and mcts, instead of a fixed depth and playouts "
+                             "(games then depend on the machine and no longer repeat)")
+    parser.add_argument("--mcts-iterations", type=int, default=1000, help="playouts per mcts move")
+    parser.add_argument("--minimax-depth", type=int, default=4, help="plies minimax searches per move")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--csv", metavar="FILE", help="write one row per game")
+    parser.add_argument("--json", metavar="FILE", help="write the summary and per-game results")
+    args = parser.parse_args()
+
+    players = list(dict.fromkeys(args.players))
+    if len(players) < 2:
+        parser.error("need at least two different players")
+    if args.mcts_iterations < 1 or args.minimax_depth < 1:
+        parser.error("--mcts-iterations and --minimax-depth must be at least 1")
+    results, summary = tournament(players, args.games, args.size, args.k, args.seed, args.budget_ms,
+                                  args.mcts_iterations, args.minimax_depth, args.workers)
+
+    print(f"{len(results)} games on {summary['size']}x{summary['size']}, k={summary['k']} "
+          f"in {summary['wall_seconds']:.1f}s (W/D/L of row against column)")
+    width = max(len(p) for p in players) + 2
+    print(" " * width + "".join(f"{p:>14}" for p in players) + f"{'elo':>8}{'moves/s':>12}")
+    for a in players:
+        cells = "".join(f"{'-' if a == b else '/'.join(map(str, summary['matrix'][a][b])):>14}" for b in players)
+        print(f"{a:<{width}}{cells}{summary['elo'][a]:>8.0f}{summary['moves_per_s'][a]:>12,.0f}")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "games": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()